@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Benchmark list rendering throughput of BaseSerializer's compiled mode.
+
+Serializes in-memory model instances with many=True, with and without `compiled=True`:
+    - sample:   SampleSerializer, only character columns
+    - book ref: BookSerializer(ref_serializer=True), with a primary key related field
+
+Usage:
+    python benchmarks/bench_compiled.py [rows] [iterations]
+"""
+import os
+import sys
+import timeit
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_dans_api_toolkit.test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django_dans_api_toolkit.test.serializers.models import (  # noqa: E402
+    Book,
+    BookSerializer,
+    SampleModel,
+    SampleSerializer,
+)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    cases: Dict[str, Tuple[Any, List[Any], Dict[str, Any]]] = {
+        "sample": (
+            SampleSerializer,
+            [
+                SampleModel(id=i, field1="a", field2="b", field3="c", field4="d")
+                for i in range(rows)
+            ],
+            {},
+        ),
+        "book ref": (
+            BookSerializer,
+            [Book(id=i, title=f"Book {i}", publisher_id=1) for i in range(rows)],
+            {"ref_serializer": True},
+        ),
+    }
+
+    print(f"Serializing {rows} rows, {iterations} iterations")
+    for case, (serializer_class, instances, kwargs) in cases.items():
+        assert (
+            serializer_class(instances, many=True, compiled=True, **kwargs).data
+            == serializer_class(instances, many=True, **kwargs).data
+        )
+        for name, compiled in (("compiled", True), ("regular", False)):
+            seconds = min(
+                timeit.repeat(
+                    lambda: serializer_class(
+                        instances, many=True, compiled=compiled, **kwargs
+                    ).data,
+                    number=iterations,
+                    repeat=3,
+                )
+            )
+            print(f"{case:>9} {name:>9}: {rows * iterations / seconds:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark the per-request envelope overhead: building a response with
+ApiResponseHandler and rendering it with ApiResponseRenderer.
+
+Compares the single-pass path (handler envelope recognized by the renderer)
+with the normalizing path used for plain dicts, and a bare 404 error served
+from the pre-rendered static envelope with one built per request.
+
+Usage:
+    python benchmarks/bench_envelope.py [iterations]
+"""
+import os
+import sys
+import timeit
+from typing import Any, Dict, cast
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_dans_api_toolkit.test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django_dans_api_toolkit.api_response_handler import (  # noqa: E402
+    ApiResponseHandler,
+)
+from django_dans_api_toolkit.api_response_renderer import (  # noqa: E402
+    ApiResponseRenderer,
+)
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    handler = ApiResponseHandler()
+    renderer = ApiResponseRenderer()
+    results = {"id": 1, "name": "Item", "active": True}
+
+    def single_pass() -> None:
+        response = handler.response_success(results=results)
+        data = cast(Dict[str, Any], response.data)
+        renderer.render(data, renderer_context={"response": response})
+
+    def normalizing() -> None:
+        response = handler.response_success(results=results)
+        data = dict(cast(Dict[str, Any], response.data))
+        renderer.render(data, renderer_context={"response": response})
+
+    def static_error() -> None:
+        response = handler.response_error(status=404)
+        data = cast(Dict[str, Any], response.data)
+        renderer.render(data, renderer_context={"response": response})
+
+    def built_error() -> None:
+        response = handler.response_error(
+            message=handler.message_error, status=404, print_log=False
+        )
+        data = cast(Dict[str, Any], response.data)
+        renderer.render(data, renderer_context={"response": response})
+
+    print(f"Building and rendering small envelopes, {iterations} iterations")
+    for name, func in (
+        ("single pass", single_pass),
+        ("normalizing", normalizing),
+        ("static 404", static_error),
+        ("built 404", built_error),
+    ):
+        seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+        print(f"{name:>12}: {seconds / iterations * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
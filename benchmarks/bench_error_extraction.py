@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Benchmark finding the error message in a bulk import's validation errors:
+10k nested item errors where only the last item is invalid.
+
+Compares extract_first_error_message with the recursive extractor it replaced,
+which also re-imported ErrorDetail at every step.
+
+Usage:
+    python benchmarks/bench_error_extraction.py [items] [iterations]
+"""
+import os
+import sys
+import timeit
+from typing import Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_dans_api_toolkit.test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.exceptions import ErrorDetail  # noqa: E402
+
+from django_dans_api_toolkit.errors import extract_first_error_message  # noqa: E402
+
+
+def recursive_extract(obj: Any) -> Optional[str]:
+    """Previous implementation, for comparison."""
+    try:
+        from rest_framework.exceptions import ErrorDetail
+
+        if isinstance(obj, ErrorDetail):
+            return str(obj)
+    except ImportError:
+        pass
+    if isinstance(obj, str):
+        return obj
+    if isinstance(obj, list):
+        for item in obj:
+            result = recursive_extract(item)
+            if result:
+                return result
+    if isinstance(obj, dict):
+        for value in obj.values():
+            result = recursive_extract(value)
+            if result:
+                return result
+    return None
+
+
+def make_errors(items: int) -> Any:
+    # shaped like ListSerializer errors: one dict per item, with nested fields
+    errors: Any = [
+        {"email": [], "address": {"street": [], "city": []}} for _ in range(items - 1)
+    ]
+    errors.append(
+        {"email": [ErrorDetail("Enter a valid email address.", code="invalid")]}
+    )
+    return {"items": errors}
+
+
+def main() -> None:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    errors = make_errors(items)
+    assert extract_first_error_message(errors) == recursive_extract(errors)
+
+    print(f"Finding the last of {items} item errors, {iterations} iterations")
+    for name, func in (
+        ("iterative", lambda: extract_first_error_message(errors)),
+        ("recursive", lambda: recursive_extract(errors)),
+    ):
+        seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+        print(f"{name:>10}: {seconds / iterations * 1000:8.2f} ms/extraction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Benchmark per-page latency of PageNumberPagination vs KeysetPagination
+at increasing page depths on a large (in-memory) SQLite table.
+
+PageNumberPagination runs COUNT(*) plus a deep OFFSET scan, so its latency
+grows with depth. KeysetPagination filters on the cursor position instead,
+so its latency stays flat.
+
+Usage:
+    python benchmarks/bench_pagination.py [rows] [iterations]
+"""
+import os
+import sys
+import timeit
+from typing import Callable
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_dans_api_toolkit.test.settings")
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.DATABASES["default"]["NAME"] = ":memory:"
+settings.ALLOWED_HOSTS = ["testserver"]
+django.setup()
+
+from django.db import connection  # noqa: E402
+from rest_framework.pagination import Cursor, PageNumberPagination  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from django_dans_api_toolkit.pagination import KeysetPagination  # noqa: E402
+from django_dans_api_toolkit.test.serializers.models import SampleModel  # noqa: E402
+
+PAGE_SIZE = 50
+
+
+def create_rows(rows: int) -> None:
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(SampleModel)
+    batch = 10_000
+    for start in range(0, rows, batch):
+        SampleModel.objects.bulk_create(
+            SampleModel(field1=f"{i}", field2="b", field3="c" * 200, field4="d")
+            for i in range(start, min(start + batch, rows))
+        )
+
+
+def page_number_page(factory: APIRequestFactory, page: int) -> Callable[[], object]:
+    request = Request(factory.get("/items/", {"page": page + 1}))
+
+    def run() -> object:
+        paginator = PageNumberPagination()
+        paginator.page_size = PAGE_SIZE
+        items = paginator.paginate_queryset(
+            SampleModel.objects.order_by("-pk"), request
+        )
+        return paginator.get_paginated_response(items).data
+
+    return run
+
+
+def keyset_page(factory: APIRequestFactory, page: int) -> Callable[[], object]:
+    query = {}
+    if page:
+        # position = last item of the previous page, found outside the timing
+        position = SampleModel.objects.order_by("-pk").values_list("pk", flat=True)[
+            page * PAGE_SIZE - 1
+        ]
+        encoder = KeysetPagination()
+        encoder.base_url = "http://testserver/items/"
+        link = encoder.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+        query = {"cursor": link.split("cursor=")[1]}
+    request = Request(factory.get(f"/items/?{urlencode(query, safe='%')}"))
+
+    def run() -> object:
+        paginator = KeysetPagination()
+        paginator.page_size = PAGE_SIZE
+        items = paginator.paginate_queryset(SampleModel.objects.all(), request)
+        return paginator.get_paginated_response(items).data
+
+    return run
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    create_rows(rows)
+    factory = APIRequestFactory()
+    last_page = rows // PAGE_SIZE - 1
+    depths = sorted({0, last_page // 100, last_page // 10, last_page // 2, last_page})
+
+    print(f"{rows} rows, page size {PAGE_SIZE}, {iterations} iterations per page")
+    print(f"{'page':>8} {'page number (ms)':>18} {'keyset (ms)':>12}")
+    for page in depths:
+        page_number = timeit.timeit(page_number_page(factory, page), number=iterations)
+        keyset = timeit.timeit(keyset_page(factory, page), number=iterations)
+        print(
+            f"{page + 1:>8} {page_number / iterations * 1000:>18.3f} "
+            f"{keyset / iterations * 1000:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
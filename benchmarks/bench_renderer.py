@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Benchmark ApiResponseRenderer throughput for large `results` lists
+with each available JSON encoder backend.
+
+Usage:
+    python benchmarks/bench_renderer.py [rows] [iterations]
+"""
+import datetime
+import decimal
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_dans_api_toolkit.test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import override_settings  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+
+from django_dans_api_toolkit.api_response_renderer import (  # noqa: E402
+    ApiResponseRenderer,
+)
+from django_dans_api_toolkit.json_backends import orjson  # noqa: E402
+
+
+def build_results(rows: int) -> list[dict[str, object]]:
+    # Decimal/UUID/datetime values go through the DRF encoder's default with both backends
+    return [
+        {
+            "id": i,
+            "uuid": uuid.UUID(int=i),
+            "name": f"Item number {i}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+            "price": decimal.Decimal("19.99"),
+            "created": datetime.datetime(2025, 1, 1, 12, 0, i % 60),
+            "active": i % 2 == 0,
+            "tags": ["alpha", "beta", "gamma"],
+        }
+        for i in range(rows)
+    ]
+
+
+def build_plain_results(rows: int) -> list[dict[str, object]]:
+    # only JSON native types, e.g. rows of `queryset.values()`
+    return [
+        {
+            "id": i,
+            "name": f"Item number {i}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+            "price": i * 0.25,
+            "rating": i / 7,
+            "active": i % 2 == 0,
+            "tags": ["alpha", "beta", "gamma"],
+        }
+        for i in range(rows)
+    ]
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    response = Response(status=200)
+    renderer = ApiResponseRenderer()
+    backends = ["stdlib"] + (["orjson"] if orjson is not None else [])
+
+    for label, results in (
+        ("mixed", build_results(rows)),
+        ("plain", build_plain_results(rows)),
+    ):
+        print(
+            f"Rendering envelopes with {rows} {label} results, {iterations} iterations"
+        )
+        for backend in backends:
+            with override_settings(DANS_API_TOOLKIT={"JSON_ENCODER": backend}):
+                size = len(
+                    renderer.render(
+                        {"message": "ok", "results": results},
+                        renderer_context={"response": response},
+                    )
+                )
+                seconds = timeit.timeit(
+                    lambda: renderer.render(
+                        {"message": "ok", "results": results},
+                        renderer_context={"response": response},
+                    ),
+                    number=iterations,
+                )
+            per_render = seconds / iterations
+            print(
+                f"{backend:>8}: {per_render * 1000:8.2f} ms/render "
+                f"{rows / per_render:12.0f} rows/s {size / per_render / 2**20:8.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
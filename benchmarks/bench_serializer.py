@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmark instantiating and serializing a BaseSerializer (SampleSerializer)
+for its default, reference and `fields` variants.
+
+Compares BaseSerializer's cached field plans with the previous implementation,
+which built every field on each instantiation and then removed the unwanted ones.
+
+Usage:
+    python benchmarks/bench_serializer.py [iterations]
+"""
+import os
+import sys
+import timeit
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_dans_api_toolkit.test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework import serializers  # noqa: E402
+
+from django_dans_api_toolkit.test.serializers.models import (  # noqa: E402
+    SampleModel,
+    SampleSerializer,
+)
+
+
+class PreviousSampleSerializer(serializers.ModelSerializer):
+    """Previous BaseSerializer implementation, for comparison."""
+
+    ref_fields: List[str] = []
+    masked_fields: List[str] = []
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        masked = kwargs.pop("masked", True)
+        ref_serializer = kwargs.pop("ref_serializer", False)
+        fields: Optional[List[str]] = kwargs.pop("fields", None)
+        if fields is not None:
+            for field_name in set(self.fields.keys()) - set(fields):
+                self.fields.pop(field_name)
+        else:
+            if masked:
+                for field in getattr(self.Meta, "masked_fields", self.masked_fields):
+                    self.fields.pop(field, None)
+            if ref_serializer:
+                for field in getattr(self.Meta, "ref_fields", self.ref_fields):
+                    self.fields.pop(field, None)
+        super().__init__(*args, **kwargs)
+
+    class Meta:
+        model = SampleModel
+        fields = "__all__"
+        ref_fields = ["field1", "field2"]
+        masked_fields = ["field3"]
+
+
+VARIANTS: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "ref": {"ref_serializer": True},
+    "fields": {"fields": ["field1"]},
+}
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    instance = SampleModel(
+        id=1, field1="value1", field2="value2", field3="value3", field4="value4"
+    )
+
+    print(f"Instantiating + serializing one instance, {iterations} iterations")
+    for variant, kwargs in VARIANTS.items():
+        assert (
+            SampleSerializer(instance, **kwargs).data
+            == PreviousSampleSerializer(instance, **kwargs).data
+        )
+        for name, serializer_class in (
+            ("cached", SampleSerializer),
+            ("previous", PreviousSampleSerializer),
+        ):
+            seconds = min(
+                timeit.repeat(
+                    lambda: serializer_class(instance, **kwargs).data,
+                    number=iterations,
+                    repeat=3,
+                )
+            )
+            print(
+                f"{variant:>8} {name:>9}: {seconds / iterations * 1e6:8.2f} us/serializer"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, List, Union
+from typing import Optional, AsyncIterable, Dict, Iterable, List, Tuple, Union
 
 """
 ============================================================================================ #
@@ -7,29 +7,92 @@ API RESPONSE ===================================================================
 """
 
 
+class RawJson:
+    """
+    Already encoded JSON to use as ApiResponse results.
+
+    ApiResponseRenderer splices the content directly into the rendered
+    envelope, e.g. JSON bytes from a cache, without decoding and re-encoding it.
+
+    NOTE: the content is NOT validated, it must be a single valid JSON value.
+    """
+
+    __slots__ = ("content",)
+
+    content: bytes
+
+    def __init__(self, content: Union[bytes, str]) -> None:
+        self.content = content.encode() if isinstance(content, str) else content
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RawJson) and self.content == other.content
+
+    def __repr__(self) -> str:
+        return f"RawJson({self.content!r})"
+
+
+class ApiResponseData(Dict[str, Optional[object]]):
+    """
+    Envelope dict built by ApiResponse.dict().
+
+    ApiResponse already guarantees the envelope structure, so ApiResponseRenderer
+    recognizes this type and serializes it directly instead of re-normalizing it.
+    """
+
+
 class ApiResponse:
     """
     Response type to standardize response structure and conversions.
 
     The point of this class is to standardize the response format for all API responses.
     It does so by having properties that model the response structure you'd like.
+
+    NOTE: one of these is created per response, so it uses __slots__ to stay small.
     """
 
+    __slots__ = (
+        "status",
+        "message",
+        "results",
+        "error_fields",
+        "non_field_errors",
+        "extras",
+        "pagination_keys",
+    )
+
     status: int
     message: Optional[str]
-    results: Optional[Union[Dict[str, object], List[object]]]
+    results: Optional[
+        Union[
+            Dict[str, object],
+            List[object],
+            Iterable[object],
+            AsyncIterable[object],
+            RawJson,
+        ]
+    ]
     error_fields: Optional[Dict[str, List[str]]]
     non_field_errors: Optional[List[str]]
     extras: Optional[Dict[str, object]]
+    pagination_keys: Optional[Tuple[str, ...]]
 
     def __init__(
         self,
         status: Optional[int] = None,
         message: Optional[str] = None,
-        results: Optional[Union[Dict[str, object], List[object]]] = None,
+        results: Optional[
+            Union[
+                Dict[str, object],
+                List[object],
+                Iterable[object],
+                AsyncIterable[object],
+                RawJson,
+            ]
+        ] = None,
         error_fields: Optional[Dict[str, List[str]]] = None,
         non_field_errors: Optional[Union[str, List[str]]] = None,
-        **kwargs: object
+        pagination_keys: Optional[Tuple[str, ...]] = None,
+        **kwargs: object,
     ) -> None:
         if not status:
             # if status is not provided, we assume error
@@ -38,6 +101,7 @@ class ApiResponse:
         self.message = message
         self.results = results
         self.error_fields = error_fields
+        self.pagination_keys = pagination_keys
         # Always store non_field_errors as a list if provided
         if isinstance(non_field_errors, str):
             self.non_field_errors = [non_field_errors]
@@ -49,52 +113,60 @@ class ApiResponse:
             kwargs.update(extras)
         self.extras = kwargs
 
-    def dict(self) -> Dict[str, Optional[object]]:
+    def dict(self) -> ApiResponseData:
         """
         Convert ApiResponse to dict. Primarily to use in actual Response object.
 
-        - For paginated DRF responses (dicts with 'results' key and at least one of 'count', 'next', 'previous'),
+        - If `pagination_keys` is set (see pagination.get_pagination_keys) and results is a dict with
+          a 'results' key, exactly those keys and 'results' are merged into the top-level dict
+          (defaulting to None if missing), e.g. no 'count' for cursor pagination.
+        - Otherwise, for paginated DRF responses (dicts with 'results' key and at least one of 'count', 'next', 'previous'),
           merges those keys into the top-level dict alongside custom fields, always including all four keys (defaulting to None if missing).
         - For non-paginated responses, uses the standard structure.
         - error_fields is always a dict (empty if no errors).
         - non_field_errors is always a list (empty if no errors).
 
         :returns: Dict containing ApiResponse object info
-        :rtype: dict
+        :rtype: ApiResponseData
         """
-        res: Dict[str, Optional[object]]
+        # NOTE: this runs for every response, so it is written to avoid
+        # any allocations beyond the envelope itself
+        results = self.results
+        res = ApiResponseData()
+        res["status"] = self.status
+        res["message"] = self.message
+        pagination_keys = self.pagination_keys
+        if pagination_keys is not None:
+            # Paginator known, use its keys as is - no guessing
+            if isinstance(results, dict) and "results" in results:
+                for key in pagination_keys:
+                    res[key] = results.get(key)
+                res["results"] = results["results"]
+            else:
+                res["results"] = results
         # Detect paginated DRF response: must have 'results' key and at least one of 'count', 'next', 'previous'
-        is_paginated = False
-        if isinstance(self.results, dict) and "results" in self.results:
-            pag_keys = ["count", "next", "previous"]
-            if any(k in self.results for k in pag_keys):
-                is_paginated = True
-        if is_paginated and isinstance(self.results, dict):
-            res = {
-                "status": self.status,
-                "message": self.message,
-                "count": self.results.get("count"),
-                "next": self.results.get("next"),
-                "previous": self.results.get("previous"),
-                "results": self.results.get("results"),
-            }
+        elif (
+            isinstance(results, dict)
+            and "results" in results
+            and ("count" in results or "next" in results or "previous" in results)
+        ):
+            res["count"] = results.get("count")
+            res["next"] = results.get("next")
+            res["previous"] = results.get("previous")
+            res["results"] = results.get("results")
         else:
-            res = {
-                "status": self.status,
-                "message": self.message,
-                "results": self.results,
-            }
+            res["results"] = results
         # error_fields: always a dict
-        error_fields = self.error_fields if self.error_fields is not None else {}
-        res["error_fields"] = error_fields
+        error_fields = self.error_fields
+        res["error_fields"] = error_fields if error_fields is not None else {}
         # non_field_errors: always a list
-        if self.non_field_errors is not None:
-            if isinstance(self.non_field_errors, list):
-                res["non_field_errors"] = self.non_field_errors
-            else:
-                res["non_field_errors"] = [self.non_field_errors]
-        else:
+        non_field_errors = self.non_field_errors
+        if non_field_errors is None:
             res["non_field_errors"] = []
+        elif isinstance(non_field_errors, list):
+            res["non_field_errors"] = non_field_errors
+        else:
+            res["non_field_errors"] = [non_field_errors]
         if self.extras:
             res["extras"] = self.extras
         return res
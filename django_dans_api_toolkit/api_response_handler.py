@@ -1,14 +1,61 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.pagination import BasePagination
+import asyncio
 import logging
-
-from .api_response import ApiResponse
+import re
+import sys
+from time import perf_counter
+
+from .api_response import ApiResponse, RawJson
+from .conf import get_toolkit_setting
+from .errors import ErrorFieldsNormalizer, extract_first_error_message
+from .log_sampling import LogSampler, get_log_sampler
+from .metrics import METRICS_HOOKS, emit_metric
+from .pagination import get_pagination_keys
+from .static_responses import get_static_error_data
 
 DEFAULT_LOGGER = logging.getLogger("django_dans_api_toolkit")
+DEFAULT_MESSAGE_ERROR = "Error. Please try again later."
+DEFAULT_MESSAGE_SUCCESS = "Successfully completed request."
+
+# used to turn messages into templates for log sampling signatures, e.g. 'id 12' -> 'id #'
+_DIGITS_RE = re.compile(r"\d+")
+
+# log records being handled in the executor by aresponse_error
+# NOTE: referenced until done, so they aren't garbage collected and their errors are reported
+_LOG_FUTURES: Set["asyncio.Future[None]"] = set()
+
+
+def _log_future_done(future: "asyncio.Future[None]") -> None:
+    _LOG_FUTURES.discard(future)
+    if future.cancelled():
+        return
+    exception = future.exception()
+    if exception is not None:
+        future.get_loop().call_exception_handler(
+            {
+                "message": "Error handling aresponse_error log records",
+                "exception": exception,
+                "future": future,
+            }
+        )
+
 
 """
 ============================================================================================ #
@@ -29,46 +76,74 @@ class ApiResponseHandler:
     look however you choose.
 
     It works very closely with the ApiResponse class.
+
+    :param str message_error:       Default message for error responses.
+    :param str message_success:     Default message for success responses.
+    :param Logger logger:           Logger to use, defaults to DEFAULT_LOGGER.
+                                    With the `LOG_QUEUE` setting DEFAULT_LOGGER is switched to
+                                    queue logging at startup, see log_queue.enable_queue_logging.
+    :param LogSampler log_sampler:  Sampler to rate limit/deduplicate error logs.
+                                    Defaults to the process wide one from the `LOG_SAMPLING`
+                                    setting, if set, see log_sampling.get_log_sampler.
+    :param ErrorFieldsNormalizer error_fields_normalizer:
+                                    Flattens and caps error_fields in error responses.
+                                    Defaults to one built from the `ERROR_FIELDS_NORMALIZATION` setting, if set.
     """
 
     def __init__(
         self,
-        message_error: str = "Error. Please try again later.",
-        message_success: str = "Successfully completed request.",
+        message_error: str = DEFAULT_MESSAGE_ERROR,
+        message_success: str = DEFAULT_MESSAGE_SUCCESS,
         logger: Optional[logging.Logger] = None,
+        log_sampler: Optional[LogSampler] = None,
+        error_fields_normalizer: Optional[ErrorFieldsNormalizer] = None,
     ):
         self.message_error = message_error
         self.message_success = message_success
         self.logger = logger or DEFAULT_LOGGER
+        self.log_sampler = log_sampler or get_log_sampler()
+        self.error_max_depth = get_toolkit_setting("ERROR_MESSAGE_MAX_DEPTH")
+        self.error_max_nodes = get_toolkit_setting("ERROR_MESSAGE_MAX_NODES")
+        if error_fields_normalizer is None:
+            normalization = get_toolkit_setting("ERROR_FIELDS_NORMALIZATION")
+            if normalization:
+                error_fields_normalizer = ErrorFieldsNormalizer(
+                    **{key.lower(): value for key, value in normalization.items()}
+                )
+        self.error_fields_normalizer = error_fields_normalizer
 
     @staticmethod
     def _format_response(
         response: Optional[Response] = None,
-        results: Optional[Union[Dict[str, object], List[object]]] = None,
+        results: Optional[Union[Dict[str, object], List[object], RawJson]] = None,
         message: Optional[str] = None,
         status: Optional[int] = None,
         error_fields: Optional[Dict[str, List[str]]] = None,
         non_field_errors: Optional[List[str]] = None,
+        paginator: Optional[BasePagination] = None,
     ) -> Response:
         """Internal function to format responses.
 
         Args:
             response (Response): Existing DRF response object to use for response.
-            results (dict or list): Results to include in response.
+            results (dict, list or RawJson): Results to include in response. RawJson is spliced into the rendered output as-is.
             message (str): Message to include in response.
             status (int): Status to use in response.
             error_fields (dict, optional): Dictionary of field errors to include - typically provided by Django exceptions. Defaults to None.
             non_field_errors (list, optional): List of non-field errors to include as top-level key.
+            paginator (BasePagination, optional): Paginator that produced results, decides the pagination keys.
 
         Returns:
             Response: DRF response object with desired format - can be used directly in views
         """
+        start = perf_counter() if METRICS_HOOKS else 0.0
         api_response = ApiResponse(
             message=message,
             status=status,
             results=results,
             error_fields=error_fields,
             non_field_errors=non_field_errors,
+            pagination_keys=get_pagination_keys(paginator),
         )
         if response:
             # Only assign extras if response.data is a dict (as expected in our usage)
@@ -79,25 +154,134 @@ class ApiResponseHandler:
                 DEFAULT_LOGGER.warning(
                     f"ApiResponseHandler: response.data was not a dict (got {type(response.data).__name__}), extras set to None. This is unexpected and should be fixed."
                 )
-        return Response(api_response.dict(), status=status)
+        data = api_response.dict()
+        if METRICS_HOOKS:
+            emit_metric(
+                "format", {"status": status, "duration": perf_counter() - start}
+            )
+        return Response(data, status=status)
 
     def _handle_logging(
-        self, msg: str, print_log: bool, exception: Optional[Exception] = None
+        self,
+        msg: str,
+        print_log: bool,
+        exception: Optional[Exception] = None,
+        template: Optional[str] = None,
+        args: Tuple[object, ...] = (),
+        extra: Optional[Dict[str, object]] = None,
+        log_records: Optional[List[logging.LogRecord]] = None,
     ) -> None:
         """Internal function to handle logging for responses handled by this class.
 
+        Formatting is deferred to logging, `msg % args` only happens if a handler
+        actually emits the record, so disabled/filtered logs cost no string work.
+
         Args:
             print_log (boolean): Whether or not to actually print the message.
-            msg (str): Message to print.
+            msg (str): Message to print, %-style format string for `args`.
             exception (Exception, optional): Exception object to log with stack trace. Defaults to None.
+            template (str, optional): Static part of the message, used to group repeated errors for log sampling.
+            args (tuple, optional): Arguments for `msg`, formatted lazily by logging.
+            extra (dict, optional): Structured fields added to the log record.
+            log_records (list, optional): If given, records are created and appended here
+                instead of being handled, for the caller to handle elsewhere (see aresponse_error).
         """
-        if print_log:
-            logger = self.logger or DEFAULT_LOGGER
-            # Let logging handle stack info automatically - more efficient than inspect.stack()
-            if exception is not None:
-                logger.error(msg, exc_info=True, stack_info=True)
-            else:
-                logger.error(msg, stack_info=True)
+        if not print_log:
+            return
+        logger = self.logger or DEFAULT_LOGGER
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+        if self.log_sampler is not None:
+            log_full, suppressed = self.log_sampler.sample(
+                self._get_log_signature(msg, exception, template, args)
+            )
+            if not log_full:
+                if suppressed:
+                    summary = msg + " [repeated %d more times, stack traces suppressed]"
+                    if log_records is not None:
+                        log_records.append(
+                            self._make_log_record(
+                                logger,
+                                summary,
+                                (*args, suppressed),
+                                False,
+                                False,
+                                extra,
+                            )
+                        )
+                    else:
+                        logger.error(summary, *args, suppressed, extra=extra)
+                return
+        if log_records is not None:
+            log_records.append(
+                self._make_log_record(
+                    logger, msg, args, exception is not None, True, extra
+                )
+            )
+        # Let logging handle stack info automatically - more efficient than inspect.stack()
+        elif exception is not None:
+            logger.error(msg, *args, exc_info=True, stack_info=True, extra=extra)
+        else:
+            logger.error(msg, *args, stack_info=True, extra=extra)
+
+    @staticmethod
+    def _make_log_record(
+        logger: logging.Logger,
+        msg: str,
+        args: Tuple[object, ...],
+        exc_info: bool,
+        stack_info: bool,
+        extra: Optional[Dict[str, object]],
+    ) -> logging.LogRecord:
+        """Create the record `logger.error` would, to be handled later/elsewhere."""
+        # caller and stack have to be captured here, not where the record is handled
+        fn, lno, func, sinfo = logger.findCaller(stack_info)
+        return logger.makeRecord(
+            logger.name,
+            logging.ERROR,
+            fn,
+            lno,
+            msg,
+            args,
+            sys.exc_info() if exc_info else None,
+            func,
+            extra,
+            sinfo,
+        )
+
+    def _handle_log_records(self, log_records: List[logging.LogRecord]) -> None:
+        logger = self.logger or DEFAULT_LOGGER
+        for record in log_records:
+            logger.handle(record)
+
+    @staticmethod
+    def _get_log_signature(
+        msg: str,
+        exception: Optional[Exception],
+        template: Optional[str],
+        args: Tuple[object, ...] = (),
+    ) -> Tuple[Optional[str], str, str, int]:
+        """Signature used to group repeated errors: exception type, message template and call site."""
+        if not template:
+            # nothing is formatted: string args (e.g. string errors) are part of the
+            # template with numbers ignored, other args (e.g. exceptions) are only
+            # grouped by their type and call site
+            template = "|".join(
+                [
+                    msg,
+                    *(_DIGITS_RE.sub("#", arg) for arg in args if isinstance(arg, str)),
+                ]
+            )
+        # call site = first frame outside this module, i.e. the view calling response_error
+        frame = sys._getframe(1)
+        while frame.f_back is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        return (
+            type(exception).__qualname__ if exception is not None else None,
+            template,
+            frame.f_code.co_filename,
+            frame.f_lineno,
+        )
 
     def _parse_validation_error_message(
         self,
@@ -112,7 +296,8 @@ class ApiResponseHandler:
         2. DRF ValidationError with non_field_errors
         3. IntegrityError messages
         4. String errors (raw string)
-        5. First string error from error_fields (recursively, including nested structures)
+        5. First string error from error_fields (including nested structures, within the
+           ERROR_MESSAGE_MAX_DEPTH / ERROR_MESSAGE_MAX_NODES budgets)
 
         Args:
             error: The error object (ValidationError, IntegrityError, etc.)
@@ -122,32 +307,6 @@ class ApiResponseHandler:
             Extracted error message string, or None if no suitable message found
         """
 
-        def _extract_first_string_error(obj: Any) -> Optional[str]:
-            """Recursively extract the first string error from nested dicts/lists, including DRF ErrorDetail objects."""
-            # DRF's ErrorDetail objects are not always present (if DRF isn't installed),
-            # so we import ErrorDetail locally and only check for it if available.
-            # This avoids a hard dependency on DRF for users who only use Django.
-            try:
-                from rest_framework.exceptions import ErrorDetail
-
-                if isinstance(obj, ErrorDetail):
-                    return str(obj)
-            except ImportError:
-                pass
-            if isinstance(obj, str):
-                return obj
-            if isinstance(obj, list):
-                for item in obj:
-                    result = _extract_first_string_error(item)
-                    if result:
-                        return result
-            if isinstance(obj, dict):
-                for value in obj.values():
-                    result = _extract_first_string_error(value)
-                    if result:
-                        return result
-            return None
-
         # Handle Django ValidationError
         if (
             isinstance(error, ValidationError)
@@ -171,7 +330,9 @@ class ApiResponseHandler:
                         return str(non_field_errors[0])
                 # Recursively extract from dict or list
                 if isinstance(error.detail, (dict, list)):
-                    return _extract_first_string_error(error.detail)
+                    return extract_first_error_message(
+                        error.detail, self.error_max_depth, self.error_max_nodes
+                    )
                 # Fallback to string representation
                 return str(error.detail)
 
@@ -195,7 +356,9 @@ class ApiResponseHandler:
                 if isinstance(non_field_errors, list) and len(non_field_errors) > 0:
                     return str(non_field_errors[0])
             # Otherwise, get the first string error recursively
-            return _extract_first_string_error(error_fields)
+            return extract_first_error_message(
+                error_fields, self.error_max_depth, self.error_max_nodes
+            )
 
         return None
 
@@ -205,15 +368,19 @@ class ApiResponseHandler:
     def response_success(
         self,
         message: Optional[str] = None,
-        results: Optional[Union[Dict[str, object], List[object]]] = None,
+        results: Optional[Union[Dict[str, object], List[object], RawJson]] = None,
         response: Optional[Response] = None,
         status: Optional[int] = HTTP_200_OK,
+        paginator: Optional[BasePagination] = None,
     ) -> Response:
         """
         :param str message: message to include in response
-        :param dict or list results: results object/list to include in response
+        :param dict, list or RawJson results: results object/list to include in response,
+            RawJson (already encoded JSON) is spliced into the rendered output as-is
         :param Response response: response object to simply edit
         :param int status: HTTP status to use
+        :param BasePagination paginator: paginator that produced results, e.g. `self.paginator`.
+            Its keys are used for the envelope instead of guessing from results
 
         :returns: response of the desired format
         :rtype: Response
@@ -222,13 +389,65 @@ class ApiResponseHandler:
         if not message:
             message = self.message_success
 
-        # Allow both dict and list as valid results
-        results_out: Optional[Union[Dict[str, object], List[object]]] = None
-        if isinstance(results, (dict, list)):
+        # Allow dict, list and pre-encoded JSON as valid results
+        results_out: Optional[Union[Dict[str, object], List[object], RawJson]] = None
+        if isinstance(results, (dict, list, RawJson)):
             results_out = results
 
         return self._format_response(
-            response=response, results=results_out, message=message, status=status
+            response=response,
+            results=results_out,
+            message=message,
+            status=status,
+            paginator=paginator,
+        )
+
+    #
+    # RESPONSE SUCCESS STREAM
+    #
+    def response_success_stream(
+        self,
+        message: Optional[str] = None,
+        results: Optional[Union[Dict[str, object], Iterable[object]]] = None,
+        status: int = HTTP_200_OK,
+        paginator: Optional[BasePagination] = None,
+    ) -> StreamingHttpResponse:
+        """
+        Streaming version of response_success for very large result sets.
+
+        The envelope is identical to response_success but 'results' is encoded
+        incrementally as it is iterated, e.g. from a generator over
+        `queryset.iterator()`, so the full list is never held in memory.
+        For paginated results pass a dict with 'results' and 'count'/'next'/'previous'.
+
+        NOTE: rows must already be serialized (dicts, not model instances) and
+        errors raised mid-stream can no longer change the response status.
+
+        :param str message: message to include in response
+        :param dict or iterable results: results iterable (or paginated dict) to stream
+        :param int status: HTTP status to use
+        :param BasePagination paginator: paginator that produced results, see response_success
+
+        :returns: streaming response of the desired format
+        :rtype: StreamingHttpResponse
+        """
+        # imported here since the renderer depends on this module
+        from .api_response_renderer import ApiResponseRenderer
+
+        if not message:
+            message = self.message_success
+
+        api_response = ApiResponse(
+            message=message,
+            status=status,
+            results=results,
+            pagination_keys=get_pagination_keys(paginator),
+        )
+        renderer = ApiResponseRenderer()
+        return StreamingHttpResponse(
+            renderer.render_stream(api_response.dict()),
+            status=status,
+            content_type=renderer.media_type,
         )
 
     #
@@ -239,7 +458,7 @@ class ApiResponseHandler:
         error: Optional[Union[str, Exception]] = None,
         error_fields: Optional[Dict[str, List[str]]] = None,
         message: Optional[str] = None,
-        results: Optional[Union[Dict[str, object], List[object]]] = None,
+        results: Optional[Union[Dict[str, object], List[object], RawJson]] = None,
         response: Optional[Response] = None,
         status: Optional[int] = HTTP_400_BAD_REQUEST,
         print_log: Optional[bool] = True,
@@ -256,6 +475,50 @@ class ApiResponseHandler:
         :returns: response of the desired format
         :rtype: Response
         """
+        return self._response_error(
+            error, error_fields, message, results, response, status, print_log
+        )
+
+    def _response_error(
+        self,
+        error: Optional[Union[str, Exception]],
+        error_fields: Optional[Dict[str, List[str]]],
+        message: Optional[str],
+        results: Optional[Union[Dict[str, object], List[object], RawJson]],
+        response: Optional[Response],
+        status: Optional[int],
+        print_log: Optional[bool],
+        log_records: Optional[List[logging.LogRecord]] = None,
+    ) -> Response:
+        """response_error, with log records optionally collected in `log_records` instead of handled."""
+        start = perf_counter() if METRICS_HOOKS else 0.0
+        if METRICS_HOOKS:
+            emit_metric(
+                "error",
+                {
+                    "status": status,
+                    "error_type": (
+                        type(error).__qualname__ if error is not None else None
+                    ),
+                },
+            )
+
+        # Nothing but a status, serve the pre-rendered envelope (e.g. bots hitting 404s)
+        if (
+            not error
+            and not error_fields
+            and not message
+            and results is None
+            and response is None
+            and status is not None
+        ):
+            data = get_static_error_data(status, self.message_error)
+            if METRICS_HOOKS:
+                emit_metric(
+                    "format", {"status": status, "duration": perf_counter() - start}
+                )
+            return Response(data, status=status)
+
         # Figure out actual message
 
         # Initialize message_res with default error message
@@ -277,19 +540,48 @@ class ApiResponseHandler:
         # Figure out logging / error
 
         # error PASSED, this means we are potentially logging something
+        # NOTE: nothing is formatted here, logging formats `msg % args` only when emitting
         if error:
             # Only pass exception to logging if it's actually an Exception instance
             exception_for_logging = error if isinstance(error, Exception) else None
+            extra: Dict[str, object] = {
+                "response_message": message,
+                "response_error": error,
+                "response_error_type": (
+                    type(error).__qualname__ if exception_for_logging else None
+                ),
+                "response_status": status,
+            }
 
             if message and message != error:  # message and error different, log both
                 self._handle_logging(
-                    f"{message} - {error}", print_log, exception_for_logging
+                    "%s - %s",
+                    print_log,
+                    exception_for_logging,
+                    template=message,
+                    args=(message, error),
+                    extra=extra,
+                    log_records=log_records,
                 )
             else:  # error and message both exist and are the same
-                self._handle_logging(str(error), print_log, exception_for_logging)
+                self._handle_logging(
+                    "%s",
+                    print_log,
+                    exception_for_logging,
+                    args=(error,),
+                    extra=extra,
+                    log_records=log_records,
+                )
         # if no error, but message exists, log it
         elif message:
-            self._handle_logging(message, print_log)
+            self._handle_logging(
+                "%s",
+                print_log,
+                template=message,
+                args=(message,),
+                extra={"response_message": message, "response_status": status},
+                log_records=log_records,
+            )
 
         # Extract non_field_errors from error_fields if present, without mutating input
         non_field_errors = None
@@ -300,6 +592,10 @@ class ApiResponseHandler:
                 candidate = error_fields_copy.pop("non_field_errors")
                 if candidate:  # Only include if truthy (not None, not empty)
                     non_field_errors = candidate
+            if error_fields_copy and self.error_fields_normalizer is not None:
+                error_fields_copy = self.error_fields_normalizer.normalize(
+                    error_fields_copy
+                )
             if not error_fields_copy:
                 error_fields_copy = None
         else:
@@ -314,3 +610,139 @@ class ApiResponseHandler:
             error_fields=error_fields_copy,
             non_field_errors=non_field_errors,
         )
+
+    #
+    # ASYNC
+    #
+    # For async views under ASGI: nothing here blocks, so no sync_to_async thread hop
+    # is needed, results can be async iterables (e.g. async ORM querysets) and error
+    # logs are handled in a worker thread instead of on the event loop.
+    #
+    async def aresponse_success(
+        self,
+        message: Optional[str] = None,
+        results: Optional[
+            Union[Dict[str, object], List[object], RawJson, AsyncIterable[object]]
+        ] = None,
+        response: Optional[Response] = None,
+        status: Optional[int] = HTTP_200_OK,
+        paginator: Optional[BasePagination] = None,
+    ) -> Response:
+        """
+        Async response_success, see it for the parameters.
+
+        :param dict, list, RawJson or async iterable results: results to include in response,
+            async iterables are collected into a list
+
+        :returns: response of the desired format, renderable outside of DRF views too
+        :rtype: Response
+        """
+        if isinstance(results, AsyncIterable):
+            results = [row async for row in results]
+        return self._set_default_renderer(
+            self.response_success(message, results, response, status, paginator)
+        )
+
+    async def aresponse_error(
+        self,
+        error: Optional[Union[str, Exception]] = None,
+        error_fields: Optional[Dict[str, List[str]]] = None,
+        message: Optional[str] = None,
+        results: Optional[
+            Union[Dict[str, object], List[object], RawJson, AsyncIterable[object]]
+        ] = None,
+        response: Optional[Response] = None,
+        status: Optional[int] = HTTP_400_BAD_REQUEST,
+        print_log: Optional[bool] = True,
+    ) -> Response:
+        """
+        Async response_error, see it for the parameters.
+
+        Log records are created here (so they have the caller's stack) but handled
+        in the event loop's default executor, without waiting for slow log handlers.
+        Errors raised while handling them are reported to the loop's exception handler.
+
+        :param dict, list, RawJson or async iterable results: results to include in response,
+            async iterables are collected into a list
+
+        :returns: response of the desired format, renderable outside of DRF views too
+        :rtype: Response
+        """
+        if isinstance(results, AsyncIterable):
+            results = [row async for row in results]
+        log_records: List[logging.LogRecord] = []
+        api_response = self._response_error(
+            error,
+            error_fields,
+            message,
+            results,
+            response,
+            status,
+            print_log,
+            log_records,
+        )
+        if log_records:
+            future = asyncio.get_running_loop().run_in_executor(
+                None, self._handle_log_records, log_records
+            )
+            _LOG_FUTURES.add(future)
+            future.add_done_callback(_log_future_done)
+        return self._set_default_renderer(api_response)
+
+    def aresponse_success_stream(
+        self,
+        message: Optional[str] = None,
+        results: Optional[
+            Union[Dict[str, object], Iterable[object], AsyncIterable[object]]
+        ] = None,
+        status: int = HTTP_200_OK,
+        paginator: Optional[BasePagination] = None,
+    ) -> StreamingHttpResponse:
+        """
+        Async response_success_stream, for long exports under ASGI.
+
+        'results' can be an async iterable, e.g. an async generator over
+        `queryset.aiterator()`, it is rendered with ApiResponseRenderer.arender_stream
+        as rows arrive, without a worker thread or buffering the whole body.
+
+        NOTE: not a coroutine - it only builds the response, the body is produced
+        when the server iterates it. Same caveats as response_success_stream.
+
+        :param str message: message to include in response
+        :param dict, iterable or async iterable results: results (or paginated dict) to stream
+        :param int status: HTTP status to use
+        :param BasePagination paginator: paginator that produced results, see response_success
+
+        :returns: async streaming response of the desired format
+        :rtype: StreamingHttpResponse
+        """
+        # imported here since the renderer depends on this module
+        from .api_response_renderer import ApiResponseRenderer
+
+        if not message:
+            message = self.message_success
+
+        api_response = ApiResponse(
+            message=message,
+            status=status,
+            results=results,
+            pagination_keys=get_pagination_keys(paginator),
+        )
+        renderer = ApiResponseRenderer()
+        return StreamingHttpResponse(
+            renderer.arender_stream(api_response.dict()),
+            status=status,
+            content_type=renderer.media_type,
+        )
+
+    @staticmethod
+    def _set_default_renderer(response: Response) -> Response:
+        """Make a Response renderable in plain (async) Django views, DRF views override this."""
+        # local import to avoid a circular import, the renderer imports this module
+        from .api_response_renderer import ApiResponseRenderer
+
+        renderer = ApiResponseRenderer()
+        response.accepted_renderer = renderer  # type: ignore[attr-defined]
+        response.accepted_media_type = renderer.media_type  # type: ignore[attr-defined]
+        response.renderer_context = {"response": response}  # type: ignore[attr-defined]
+        return response
@@ -1,7 +1,26 @@
-from typing import Any, Dict, Mapping, Optional
+from itertools import islice
+import json
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 from rest_framework.renderers import JSONRenderer
 
-from .api_response_handler import ApiResponseHandler
+from .api_response import ApiResponseData, RawJson
+from .api_response_handler import DEFAULT_MESSAGE_ERROR, DEFAULT_MESSAGE_SUCCESS
+from .json_backends import get_json_backend
+from .metrics import METRICS_HOOKS, emit_metric
+from .pagination import get_pagination_keys
+from .static_responses import StaticApiResponseData
 
 """
 ============================================================================================ #
@@ -17,29 +36,110 @@ API RESPONSE RENDERER ==========================================================
 # This is designed to work in tandem with the Api Response Handler
 # but can also be used alone. The default response renderer is in the settings.
 #
+# The JSON encoding itself is done by the backend configured via the
+# `JSON_ENCODER` toolkit setting, see json_backends.py
+#
 class ApiResponseRenderer(JSONRenderer):
+    # number of rows encoded per chunk when streaming 'results'
+    stream_batch_size = 500
+
     def render(
         self,
         data: Dict[Any, Any],
         accepted_media_type: Optional[str] = None,
         renderer_context: Optional[Mapping[str, Any]] = None,
     ) -> Any:
+        if not METRICS_HOOKS:
+            return self._render(data, accepted_media_type, renderer_context)
+
+        start = perf_counter()
+        rendered = self._render(data, accepted_media_type, renderer_context)
+        response = renderer_context.get("response") if renderer_context else None
+        emit_metric(
+            "render",
+            {
+                "status": getattr(response, "status_code", None),
+                "duration": perf_counter() - start,
+                "bytes": len(rendered),
+            },
+        )
+        return rendered
+
+    def _render(
+        self,
+        data: Dict[Any, Any],
+        accepted_media_type: Optional[str],
+        renderer_context: Optional[Mapping[str, Any]],
+    ) -> Any:
+        indent = self.get_indent(accepted_media_type or "", renderer_context or {})
+        # pre-rendered static errors are served as-is, if rendered with the same settings
+        if (
+            isinstance(data, StaticApiResponseData)
+            and not indent
+            and data.render_key == self.get_render_key()
+        ):
+            return data.rendered
+
+        # envelopes built by ApiResponse are already normalized,
+        # so only make sure there is a message and the same 'results'
+        if isinstance(data, ApiResponseData):
+            if not data["message"]:
+                self._set_default_message(data, renderer_context)
+            self._normalize_results(data)
+        else:
+            self._normalize(data, renderer_context)
+
+        # pre-encoded results are spliced in as-is, no re-encoding
+        if isinstance(data.get("results"), RawJson):
+            if not indent:
+                return b"".join(self.render_stream(data))
+            # indented output is for humans (browsable API, `?indent=`), decode
+            # pre-encoded values so they're indented like the rest of the document
+            data = {
+                key: json.loads(value.content) if isinstance(value, RawJson) else value
+                for key, value in data.items()
+            }
+
+        return get_json_backend().dumps(
+            data,
+            self.encoder_class,
+            indent=indent,
+            ensure_ascii=self.ensure_ascii,
+            compact=self.compact,
+            strict=self.strict,
+        )
+
+    def get_render_key(self) -> Tuple[Any, ...]:
+        """Settings the rendered JSON depends on besides the data, see StaticApiResponseData."""
+        return (
+            type(get_json_backend()),
+            self.encoder_class,
+            self.ensure_ascii,
+            self.compact,
+            self.strict,
+        )
+
+    def _normalize(
+        self, data: Dict[Any, Any], renderer_context: Optional[Mapping[str, Any]]
+    ) -> None:
+        """Normalize data not built by ApiResponse (e.g. DRF errors) into the envelope structure."""
+        # checked before 'results' is defaulted below
+        pagination_keys = self._get_view_pagination_keys(data, renderer_context)
+
         # if 'detail' exists, copy it to 'message'
         if data.get("detail"):
             data["message"] = data["detail"]
 
         # if 'message' does NOT exist, get one just in case
         if not data.get("message"):
-            if renderer_context is not None:
-                status_code = renderer_context["response"].status_code
-                if 200 <= status_code < 300:
-                    data["message"] = ApiResponseHandler().message_success
-                else:
-                    data["message"] = ApiResponseHandler().message_error
+            self._set_default_message(data, renderer_context)
 
         # if 'results' does NOT exist, get one just in case
-        if not data.get("results") and data.get("results") != []:
-            data["results"] = None
+        self._normalize_results(data)
+
+        # paginated responses from the view always get all of its paginator's keys
+        for key in pagination_keys:
+            data.setdefault(key, None)
 
         # Ensure error_fields is always a dict
         if "error_fields" not in data or data["error_fields"] is None:
@@ -49,6 +149,167 @@ class ApiResponseRenderer(JSONRenderer):
         if "non_field_errors" not in data or data["non_field_errors"] is None:
             data["non_field_errors"] = []
 
-        return super(ApiResponseRenderer, self).render(
-            data, accepted_media_type, renderer_context
+    @staticmethod
+    def _get_view_pagination_keys(
+        data: Dict[Any, Any], renderer_context: Optional[Mapping[str, Any]]
+    ) -> Tuple[str, ...]:
+        """
+        Keys of the view's paginator if data is its paginated response (`get_paginated_response`),
+        i.e. a successful response with 'results' and some of the paginator's keys, e.g. 'next'.
+
+        Errors, unpaginated actions and views without a paginator get no keys.
+        """
+        if renderer_context is None or "results" not in data:
+            return ()
+        response = renderer_context.get("response")
+        if response is None or not 200 <= response.status_code < 300:
+            return ()
+        keys = get_pagination_keys(
+            getattr(renderer_context.get("view"), "paginator", None)
+        )
+        if not keys or not any(key in data for key in keys):
+            return ()
+        return keys
+
+    @staticmethod
+    def _normalize_results(data: Dict[Any, Any]) -> None:
+        """Empty 'results' other than [] (e.g. {} or "") are rendered as null."""
+        results = data.get("results")
+        if results is None:
+            if "results" not in data:
+                data["results"] = None
+        elif not results and results != []:
+            data["results"] = None
+
+    @staticmethod
+    def _set_default_message(
+        data: Dict[Any, Any], renderer_context: Optional[Mapping[str, Any]]
+    ) -> None:
+        if renderer_context is not None:
+            status_code = renderer_context["response"].status_code
+            if 200 <= status_code < 300:
+                data["message"] = DEFAULT_MESSAGE_SUCCESS
+            else:
+                data["message"] = DEFAULT_MESSAGE_ERROR
+
+    def render_stream(self, data: Dict[Any, Any]) -> Iterator[bytes]:
+        """
+        Render an envelope to JSON incrementally, for use with StreamingHttpResponse.
+
+        All keys are encoded as usual except 'results' - if it is an iterable
+        (list, generator, queryset iterator...) it is consumed lazily and
+        encoded `stream_batch_size` rows at a time, so the full list is never
+        held in memory. RawJson values are spliced in without re-encoding.
+        The output is identical to `render` for the same data.
+
+        NOTE: 'data' is expected to already be a full envelope, i.e. ApiResponse.dict().
+
+        Args:
+            data (dict): Envelope to render.
+
+        Yields:
+            bytes: Chunks of the encoded JSON document.
+        """
+        head, rows, tail = self._encode_stream_envelope(data)
+        return self._stream_rows(head, rows, tail)
+
+    def _stream_rows(
+        self, head: bytes, rows: Optional[Iterable[Any]], tail: bytes
+    ) -> Iterator[bytes]:
+        if rows is None:
+            yield head
+            return
+
+        # flush everything up to the results and stream them in batches
+        yield head + b"["
+        rows_iterator = iter(rows)
+        first = True
+        while True:
+            batch = list(islice(rows_iterator, self.stream_batch_size))
+            if not batch:
+                break
+            yield self._encode_stream_batch(batch, first)
+            first = False
+        yield b"]" + tail
+
+    async def arender_stream(self, data: Dict[Any, Any]) -> AsyncIterator[bytes]:
+        """
+        Async render_stream, for async StreamingHttpResponses under ASGI.
+
+        Same output as render_stream, but 'results' can also be an async iterable
+        (async generator, async queryset iteration...), consumed `stream_batch_size`
+        rows at a time without blocking a worker thread.
+
+        Args:
+            data (dict): Envelope to render.
+
+        Yields:
+            bytes: Chunks of the encoded JSON document.
+        """
+        head, rows, tail = self._encode_stream_envelope(data)
+        if not isinstance(rows, AsyncIterable):
+            for chunk in self._stream_rows(head, rows, tail):
+                yield chunk
+            return
+
+        yield head + b"["
+        batch: List[Any] = []
+        first = True
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= self.stream_batch_size:
+                yield self._encode_stream_batch(batch, first)
+                batch = []
+                first = False
+        if batch:
+            yield self._encode_stream_batch(batch, first)
+        yield b"]" + tail
+
+    def _stream_dumps(self, obj: Any) -> bytes:
+        return get_json_backend().dumps(
+            obj,
+            self.encoder_class,
+            ensure_ascii=self.ensure_ascii,
+            compact=self.compact,
+            strict=self.strict,
+        )
+
+    def _encode_stream_batch(self, batch: List[Any], first: bool) -> bytes:
+        # encode the batch as a list and strip the brackets
+        chunk = self._stream_dumps(batch)[1:-1]
+        return chunk if first else (b"," if self.compact else b", ") + chunk
+
+    def _encode_stream_envelope(
+        self, data: Dict[Any, Any]
+    ) -> Tuple[bytes, Optional[Any], bytes]:
+        """
+        Encode everything but streamable 'results'.
+
+        Returns:
+            (head, results, tail) - the document is head + '[' + results rows + ']' + tail.
+            If 'results' isn't streamable it's (whole document, None, b'').
+        """
+        item_separator = b"," if self.compact else b", "
+        key_separator = b":" if self.compact else b": "
+        head = b""
+        rows = None
+        buffer = b"{"
+        for i, (key, value) in enumerate(data.items()):
+            if i:
+                buffer += item_separator
+            buffer += self._stream_dumps(key) + key_separator
+            if isinstance(value, RawJson):
+                buffer += value.content
+            elif key == "results" and self._is_streamable(value):
+                head, rows, buffer = buffer, value, b""
+            else:
+                buffer += self._stream_dumps(value)
+        if rows is None:
+            return buffer + b"}", None, b""
+        return head, rows, buffer + b"}"
+
+    @staticmethod
+    def _is_streamable(value: Any) -> bool:
+        return isinstance(value, (Iterable, AsyncIterable)) and not isinstance(
+            value, (str, bytes, dict)
         )
@@ -1,6 +1,32 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+
+from .conf import get_toolkit_setting
 
 
 class DjangoDansApiToolkit(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_dans_api_toolkit"
+
+    def ready(self) -> None:
+        count_cache_models = get_toolkit_setting("COUNT_CACHE_MODELS")
+        if count_cache_models:
+            from .pagination import connect_count_invalidation
+
+            for label in count_cache_models:
+                connect_count_invalidation(apps.get_model(label))
+
+        log_queue = get_toolkit_setting("LOG_QUEUE")
+        if log_queue:
+            from .api_response_handler import DEFAULT_LOGGER
+            from .log_queue import enable_queue_logging
+
+            # once per process, after logging is configured
+            enable_queue_logging(
+                DEFAULT_LOGGER,
+                **{key.lower(): value for key, value in log_queue.items()},
+            )
+
+        if get_toolkit_setting("METRICS"):
+            from .metrics import add_metrics_hook, default_collector
+
+            add_metrics_hook(default_collector)
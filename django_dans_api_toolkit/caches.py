@@ -0,0 +1,43 @@
+from collections import OrderedDict
+from typing import Hashable, Optional, TypeVar
+import threading
+
+"""
+============================================================================================ #
+CACHES ===================================================================================== #
+============================================================================================ #
+"""
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LruCache(OrderedDict[K, V]):
+    """
+    Process wide cache keeping the `max_size` most recently used entries.
+
+    Use `get()` and `set()`: they mark entries as used and evict the least recently
+    used one when full, so a burst of one-off keys can't keep new ones out for good.
+
+    :param int max_size: Number of entries kept.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:  # type: ignore[override]
+        with self._lock:
+            value = super().get(key)
+            if value is None:
+                return default
+            self.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self[key] = value
+            self.move_to_end(key)
+            if len(self) > self.max_size:
+                self.popitem(last=False)
@@ -0,0 +1,66 @@
+from typing import Any, Dict
+from django.conf import settings
+
+"""
+============================================================================================ #
+TOOLKIT SETTINGS =========================================================================== #
+============================================================================================ #
+"""
+
+#
+# All toolkit settings live under a single `DANS_API_TOOLKIT` dict in the
+# project's settings.py, e.g.
+#
+#   DANS_API_TOOLKIT = {
+#       "JSON_ENCODER": "auto",
+#   }
+#
+SETTINGS_NAME = "DANS_API_TOOLKIT"
+
+DEFAULTS: Dict[str, Any] = {
+    # JSON encoder backend used by ApiResponseRenderer.
+    # One of "stdlib", "orjson", "auto" or a dotted path to a backend class.
+    "JSON_ENCODER": "stdlib",
+    # Cache alias and timeout (seconds) for CachedCountPagination counts.
+    "COUNT_CACHE_ALIAS": "default",
+    "COUNT_CACHE_TIMEOUT": 60,
+    # Models whose cached counts are invalidated on save/delete from startup, in every
+    # process, e.g. ["shop.Product"], see pagination.connect_count_invalidation
+    "COUNT_CACHE_MODELS": [],
+    # Sampling/dedup of ApiResponseHandler error logs, None to log everything.
+    # e.g. {"MAX_FULL": 5, "SUMMARY_INTERVAL": 60}, see log_sampling.LogSampler
+    "LOG_SAMPLING": None,
+    # Non-blocking ApiResponseHandler logging through a bounded queue, None to log inline.
+    # e.g. {"MAX_SIZE": 10000}, see log_queue.enable_queue_logging
+    "LOG_QUEUE": None,
+    # Budgets for finding the error message in nested validation errors,
+    # see errors.extract_first_error_message
+    "ERROR_MESSAGE_MAX_DEPTH": 32,
+    "ERROR_MESSAGE_MAX_NODES": 100_000,
+    # Flatten/cap error_fields in error responses, None to include them as-is.
+    # e.g. {"MAX_FIELDS": 100, "MAX_MESSAGES": 5}, see errors.ErrorFieldsNormalizer
+    "ERROR_FIELDS_NORMALIZATION": None,
+    # Collect response metrics in metrics.default_collector, see metrics.metrics_view
+    "METRICS": False,
+    # Server-Timing header with serialize/envelope/render durations,
+    # see server_timing.ServerTimingMiddleware
+    "SERVER_TIMING": False,
+    # cProfile sampled requests, None to disable.
+    # e.g. {"OUTPUT_DIR": "/tmp/profiles", "SAMPLE_RATE": 0.01},
+    # see profiling.RequestProfiler / profiling.ProfilingMiddleware
+    "PROFILING": None,
+}
+
+
+def get_toolkit_setting(name: str) -> Any:
+    """
+    Get a toolkit setting, falling back to the toolkit default.
+
+    Args:
+        name (str): Name of the setting, e.g. "JSON_ENCODER".
+
+    Returns:
+        The user configured value if present, otherwise the default.
+    """
+    user_settings = getattr(settings, SETTINGS_NAME, None) or {}
+    return user_settings.get(name, DEFAULTS[name])
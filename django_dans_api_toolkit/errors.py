@@ -0,0 +1,185 @@
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import logging
+
+"""
+============================================================================================ #
+ERROR HELPERS ============================================================================== #
+============================================================================================ #
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_children(obj: Any) -> Optional[Iterator[Any]]:
+    if isinstance(obj, dict):
+        return iter(obj.values())
+    if isinstance(obj, list):
+        return iter(obj)
+    return None
+
+
+def extract_first_error_message(
+    errors: Any, max_depth: int = 32, max_nodes: int = 100_000
+) -> Optional[str]:
+    """
+    Find the first non-empty string in nested error dicts/lists, e.g. a DRF `ValidationError.detail`.
+
+    Walks the structure iteratively, depth first and in order, so huge payloads (bulk
+    imports with thousands of item errors) can't hit the recursion limit. DRF's
+    ErrorDetail is a str subclass and is returned as a plain str.
+
+    Args:
+        errors: Error string, dict or list, nested arbitrarily.
+        max_depth (int): Containers nested deeper than this are skipped.
+        max_nodes (int): Maximum number of values visited before giving up.
+
+    Returns:
+        The first error message, or None if there is none within the budgets.
+    """
+    if isinstance(errors, str):
+        return str(errors) or None
+    children = _iter_children(errors)
+    if children is None:
+        return None
+
+    # one iterator per open container, resumed where it left off after a child is done
+    stack: List[Iterator[Any]] = [children]
+    visited = 0
+    while stack:
+        for item in stack[-1]:
+            visited += 1
+            if visited > max_nodes:
+                return None
+            if isinstance(item, str):
+                if item:
+                    return str(item)
+                continue
+            children = _iter_children(item)
+            if children is not None and len(stack) < max_depth:
+                stack.append(children)
+                break
+        else:
+            stack.pop()
+    return None
+
+
+class ErrorFieldsNormalizer:
+    """
+    Flattens nested error_fields into compact, size capped path-keyed entries.
+
+    Nested DRF errors, e.g. from a bulk upload
+        {"items": [{}, {"email": ["Enter a valid email."]}]}
+    become
+        {"items.1.email": ["Enter a valid email."]}
+
+    Messages are only included once in the whole payload, e.g. the same error on
+    every item of a bulk upload is reported for the first item, and at most
+    `max_messages` are kept per field. After `max_fields` fields, the rest are
+    dropped, so the envelope size stays bounded.
+
+    Anything left out (repeated messages, errors nested deeper than `max_depth`,
+    fields over `max_fields`/`max_nodes`) is counted in notes under TRUNCATED_KEY,
+    and logged at debug level.
+
+    :param int max_fields:      Maximum number of fields included.
+    :param int max_messages:    Maximum number of messages per field.
+    :param int max_depth:       Containers nested deeper than this are skipped.
+    :param int max_nodes:       Maximum number of values visited, the rest is truncated.
+    """
+
+    TRUNCATED_KEY = "__truncated__"
+
+    def __init__(
+        self,
+        max_fields: int = 100,
+        max_messages: int = 5,
+        max_depth: int = 32,
+        max_nodes: int = 100_000,
+    ) -> None:
+        self.max_fields = max_fields
+        self.max_messages = max_messages
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+
+    def normalize(self, error_fields: Dict[Any, Any]) -> Dict[str, List[str]]:
+        """
+        Flatten error_fields.
+
+        Args:
+            error_fields (dict): Field errors, nested arbitrarily in dicts/lists.
+
+        Returns:
+            Dict of 'dotted.path' -> list of messages, with TRUNCATED_KEY notes if anything was left out.
+        """
+        normalized: Dict[str, List[str]] = {}
+        # messages included so far, in any field
+        seen: Set[str] = set()
+        repeated = too_deep = 0
+        truncated = False
+        # (path, whether the container is a list, iterator over (key or index, value))
+        stack: List[Tuple[str, bool, Iterator[Tuple[Any, Any]]]] = [
+            ("", False, iter(error_fields.items()))
+        ]
+        visited = 0
+        while stack and not truncated:
+            path, is_list, items = stack[-1]
+            for key, value in items:
+                visited += 1
+                if visited > self.max_nodes:
+                    truncated = True
+                    break
+                child_path = f"{path}.{key}" if path else str(key)
+                if isinstance(value, dict):
+                    children: Iterator[Tuple[Any, Any]] = iter(value.items())
+                elif isinstance(value, list):
+                    children = iter(enumerate(value))
+                else:
+                    if value is None:
+                        continue
+                    message = str(value)
+                    if not message:
+                        continue
+                    if message in seen:
+                        repeated += 1
+                        continue
+                    # messages in a list belong to the list's field, not 'field.0'
+                    if not self._add(
+                        normalized, path if is_list else child_path, message
+                    ):
+                        truncated = True
+                        break
+                    seen.add(message)
+                    continue
+                if len(stack) < self.max_depth:
+                    stack.append((child_path, isinstance(value, list), children))
+                    break
+                too_deep += 1
+            else:
+                stack.pop()
+
+        notes: List[str] = []
+        if truncated:
+            notes.append(
+                f"Error fields truncated, showing the first {len(normalized)}."
+            )
+        if repeated:
+            notes.append(f"{repeated} repeated messages omitted.")
+        if too_deep:
+            notes.append(
+                f"{too_deep} errors nested deeper than {self.max_depth} levels omitted."
+            )
+        if notes:
+            logger.debug("Error fields normalized: %s", " ".join(notes))
+            normalized[self.TRUNCATED_KEY] = notes
+        return normalized
+
+    def _add(self, normalized: Dict[str, List[str]], field: str, message: str) -> bool:
+        """Add a new message to a field, returns False if the field doesn't fit anymore."""
+        messages = normalized.get(field)
+        if messages is None:
+            if len(normalized) >= self.max_fields:
+                return False
+            messages = normalized[field] = []
+        if len(messages) < self.max_messages:
+            messages.append(message)
+        return True
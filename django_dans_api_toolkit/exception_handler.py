@@ -0,0 +1,127 @@
+from time import perf_counter
+from typing import Any, Dict, Optional
+from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError
+from django.http import Http404
+from rest_framework import exceptions
+from rest_framework.fields import get_error_detail
+from rest_framework.response import Response
+from rest_framework.views import set_rollback
+
+from .api_response_handler import ApiResponseHandler
+from .metrics import METRICS_HOOKS, emit_metric
+from .static_responses import get_static_error_data
+
+"""
+============================================================================================ #
+EXCEPTION HANDLER ========================================================================== #
+============================================================================================ #
+"""
+
+DEFAULT_MESSAGE_INTEGRITY_ERROR = "Unable to save, conflicting data."
+
+
+class ApiExceptionHandler:
+    """
+    DRF exception handler that builds error responses with ApiResponseHandler.
+
+    Exceptions escaping views are turned into the standard envelope in one pass,
+    instead of DRF's `{"detail": ...}` being patched up by ApiResponseRenderer:
+        - DRF ValidationError (and Django's): 'error_fields' / 'non_field_errors' from the detail
+        - other APIExceptions (NotFound, Throttled...): 'message' from the detail
+        - IntegrityError: 400 with `integrity_error_message`, the database error is
+          only logged, it can contain table/constraint names and values
+    Anything else returns None, so DRF re-raises it like its own handler does.
+
+    Exceptions with their default detail (e.g. NotFound(), NotAuthenticated()) get
+    pre-rendered envelopes, see static_responses. 5xx errors are logged, 4xx aren't.
+
+    Use it in settings.py:
+        REST_FRAMEWORK = {
+            "EXCEPTION_HANDLER": "django_dans_api_toolkit.exception_handler.exception_handler",
+        }
+
+    :param ApiResponseHandler response_handler: Handler used to build responses,
+                                                defaults to ApiResponseHandler().
+    """
+
+    integrity_error_message = DEFAULT_MESSAGE_INTEGRITY_ERROR
+
+    def __init__(self, response_handler: Optional[ApiResponseHandler] = None) -> None:
+        self._response_handler = response_handler
+
+    @property
+    def response_handler(self) -> ApiResponseHandler:
+        # created lazily so settings are read on first use, not at import
+        if self._response_handler is None:
+            self._response_handler = ApiResponseHandler()
+        return self._response_handler
+
+    def __call__(self, exc: Exception, context: Dict[str, Any]) -> Optional[Response]:
+        # same conversions as DRF's own exception handler
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*exc.args)
+        elif isinstance(exc, DjangoPermissionDenied):
+            exc = exceptions.PermissionDenied(*exc.args)
+        elif isinstance(exc, DjangoValidationError):
+            exc = exceptions.ValidationError(detail=get_error_detail(exc))
+
+        if isinstance(exc, IntegrityError):
+            set_rollback()
+            return self.response_handler.response_error(
+                error=exc, message=self.integrity_error_message
+            )
+        if not isinstance(exc, exceptions.APIException):
+            return None
+
+        if isinstance(exc.detail, (dict, list)):
+            response = self._detail_response(exc)
+        else:
+            response = self._message_response(exc)
+
+        auth_header = getattr(exc, "auth_header", None)
+        if auth_header:
+            response["WWW-Authenticate"] = auth_header
+        wait = getattr(exc, "wait", None)
+        if wait:
+            response["Retry-After"] = "%d" % wait
+
+        set_rollback()
+        return response
+
+    def _detail_response(self, exc: exceptions.APIException) -> Response:
+        """Response for field errors, e.g. ValidationError."""
+        detail = exc.detail
+        error_fields = (
+            detail if isinstance(detail, dict) else {"non_field_errors": detail}
+        )
+        return self.response_handler.response_error(
+            error=exc,
+            error_fields=error_fields,
+            status=exc.status_code,
+            print_log=exc.status_code >= 500,
+        )
+
+    def _message_response(self, exc: exceptions.APIException) -> Response:
+        """Response for a single message, pre-rendered if it's the default one."""
+        status = exc.status_code
+        # 5xx aren't static, they are logged every time
+        if status < 500 and str(exc.detail) == str(exc.default_detail):
+            start = perf_counter() if METRICS_HOOKS else 0.0
+            data = get_static_error_data(status, str(exc.detail))
+            # same events as response_error
+            if METRICS_HOOKS:
+                emit_metric(
+                    "error", {"status": status, "error_type": type(exc).__qualname__}
+                )
+                emit_metric(
+                    "format", {"status": status, "duration": perf_counter() - start}
+                )
+            return Response(data, status=status)
+        return self.response_handler.response_error(
+            error=exc, status=status, print_log=status >= 500
+        )
+
+
+exception_handler = ApiExceptionHandler()
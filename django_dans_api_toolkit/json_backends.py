@@ -0,0 +1,197 @@
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Optional, Type
+import importlib
+import json
+import re
+
+from django.utils.module_loading import import_string
+from rest_framework.compat import INDENT_SEPARATORS, LONG_SEPARATORS, SHORT_SEPARATORS
+
+from .api_response_handler import DEFAULT_LOGGER
+from .conf import get_toolkit_setting
+
+"""
+============================================================================================ #
+JSON BACKENDS ============================================================================== #
+============================================================================================ #
+"""
+
+
+def _import_orjson() -> Optional[ModuleType]:
+    """Import orjson if it is installed - it is an optional dependency."""
+    try:
+        return importlib.import_module("orjson")
+    except ImportError:
+        return None
+
+
+orjson = _import_orjson()
+
+# floats orjson writes differently, e.g. `1e16`/`1e-7` and `0.00001` where the
+# stdlib writes `1e+16`/`1e-07` and `1e-05`, see _may_differ
+_EXPONENT_RE = re.compile(rb"e-?[0-9]+(?:[,\]}]|$)")
+
+
+def _may_differ(rendered: bytes) -> bool:
+    """
+    Whether orjson output may contain floats the stdlib backend writes differently.
+
+    Only the output is searched: exponents ending a value and `0.0000` starting one.
+    Strings looking like those (e.g. "1e5, 2") are false positives, they only cost
+    a fallback to the stdlib backend.
+    """
+    if _EXPONENT_RE.search(rendered) is not None:
+        return True
+    index = rendered.find(b"0.0000")
+    while index != -1:
+        if index == 0 or rendered[index - 1] in b":,[-":
+            return True
+        index = rendered.find(b"0.0000", index + 1)
+    return False
+
+
+class StdlibJsonBackend:
+    """
+    JSON backend using the stdlib `json` module.
+
+    This mirrors DRF's `JSONRenderer.render` exactly and is the reference
+    output every other backend has to match byte for byte.
+    """
+
+    name = "stdlib"
+
+    def dumps(
+        self,
+        data: Any,
+        encoder_class: Type[json.JSONEncoder],
+        indent: Optional[int] = None,
+        ensure_ascii: bool = False,
+        compact: bool = True,
+        strict: bool = True,
+    ) -> bytes:
+        """
+        Encode data to JSON bytes.
+
+        Args:
+            data: Data to encode.
+            encoder_class (JSONEncoder): Encoder used for non-native types, typically DRF's.
+            indent (int, optional): Pretty print indent, None for no indentation.
+            ensure_ascii (bool): Escape all non-ASCII characters.
+            compact (bool): Use compact separators.
+            strict (bool): Disallow NaN/Infinity.
+
+        Returns:
+            bytes: The encoded JSON.
+        """
+        if indent is None:
+            separators = SHORT_SEPARATORS if compact else LONG_SEPARATORS
+        else:
+            separators = INDENT_SEPARATORS
+
+        ret = json.dumps(
+            data,
+            cls=encoder_class,
+            indent=indent,
+            ensure_ascii=ensure_ascii,
+            allow_nan=not strict,
+            separators=separators,
+        )
+
+        # Fully escape \u2028 and \u2029 to ensure we output JSON
+        # that is a strict javascript subset, same as DRF.
+        ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return ret.encode()
+
+
+class OrjsonJsonBackend(StdlibJsonBackend):
+    """
+    JSON backend using the native `orjson` encoder.
+
+    Only the default DRF output style (compact, unicode, no indent) is
+    encoded natively, everything else - and anything orjson refuses, e.g.
+    integers over 64 bits - falls back to the stdlib backend.
+
+    Dates, times and dataclasses are passed through to the DRF encoder so
+    the output is identical to the stdlib backend. Output with floats orjson
+    writes differently (exponents, below 1e-4) is encoded again by the stdlib
+    backend, see _may_differ.
+
+    NOTE: NaN/Infinity are encoded as null instead of raising (or `NaN` with
+    strict=False), and Enum members as their value instead of raising.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed.")
+        # non-str keys aren't enabled, orjson raises and the stdlib backend
+        # encodes them (e.g. float keys) the same way as everything else
+        self.option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(
+        self,
+        data: Any,
+        encoder_class: Type[json.JSONEncoder],
+        indent: Optional[int] = None,
+        ensure_ascii: bool = False,
+        compact: bool = True,
+        strict: bool = True,
+    ) -> bytes:
+        if indent is not None or ensure_ascii or not compact:
+            return super().dumps(
+                data, encoder_class, indent, ensure_ascii, compact, strict
+            )
+
+        assert orjson is not None
+        try:
+            ret: bytes = orjson.dumps(
+                data, default=encoder_class().default, option=self.option
+            )
+        except TypeError:
+            # orjson.JSONEncodeError is a TypeError - let the stdlib
+            # backend either handle it or raise the usual error
+            return super().dumps(
+                data, encoder_class, indent, ensure_ascii, compact, strict
+            )
+        if _may_differ(ret):
+            return super().dumps(
+                data, encoder_class, indent, ensure_ascii, compact, strict
+            )
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+BACKENDS = {
+    StdlibJsonBackend.name: StdlibJsonBackend,
+    OrjsonJsonBackend.name: OrjsonJsonBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def _load_json_backend(name: str) -> StdlibJsonBackend:
+    if name == "auto":
+        name = OrjsonJsonBackend.name if orjson is not None else "stdlib"
+    backend_class = BACKENDS.get(name) or import_string(name)
+    try:
+        backend: StdlibJsonBackend = backend_class()
+    except ImportError:
+        DEFAULT_LOGGER.warning(
+            f"JSON encoder backend '{name}' is not available, falling back to 'stdlib'."
+        )
+        backend = StdlibJsonBackend()
+    return backend
+
+
+def get_json_backend() -> StdlibJsonBackend:
+    """
+    Get the JSON backend configured via the `JSON_ENCODER` toolkit setting.
+
+    Backends are instantiated once per setting value.
+
+    Returns:
+        StdlibJsonBackend: The configured backend (or a subclass of it).
+    """
+    return _load_json_backend(get_toolkit_setting("JSON_ENCODER"))
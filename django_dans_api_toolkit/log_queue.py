@@ -0,0 +1,214 @@
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, List, Optional, Set
+import atexit
+import copy
+import logging
+import queue
+import threading
+
+"""
+============================================================================================ #
+QUEUE LOGGING ============================================================================== #
+============================================================================================ #
+"""
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler with a bounded buffer that never blocks the logging thread.
+
+    When the queue is full the record is dropped and counted instead, the next record
+    that fits is preceded by a warning with the number of records dropped meanwhile.
+
+    Like the base QueueHandler, records are formatted before being queued (message,
+    exception and stack text) so mutable args and tracebacks aren't shared with the
+    listener thread, the sink handlers only apply their own formatting on top.
+
+    :param int max_size:    Maximum number of queued records.
+    """
+
+    listener: Optional["BoundedQueueListener"] = None
+
+    def __init__(self, max_size: int = 10000) -> None:
+        super().__init__(queue.Queue(max_size))
+        # total records dropped, and dropped since the last overflow warning
+        self.dropped = 0
+        self._unreported = 0
+        # logger state replaced by enable_queue_logging, restored by disable_queue_logging
+        self._replaced_handlers: List[logging.Handler] = []
+        self._replaced_propagate = True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # same as QueueHandler.prepare, stack_info is part of the formatted message too
+        msg = self.format(record)
+        record = copy.copy(record)
+        record.message = msg
+        record.msg = msg
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # NOTE: called under the handler lock, see logging.Handler.handle
+        if self._unreported and self._put(self._make_overflow_record(record)):
+            self._unreported = 0
+        if not self._put(record):
+            self.dropped += 1
+            self._unreported += 1
+
+    def _put(self, record: logging.LogRecord) -> bool:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            return False
+        return True
+
+    def _make_overflow_record(self, record: logging.LogRecord) -> logging.LogRecord:
+        return logging.LogRecord(
+            record.name,
+            logging.WARNING,
+            __file__,
+            0,
+            "%d log records dropped, log queue full",
+            (self._unreported,),
+            None,
+        )
+
+
+class BoundedQueueListener(QueueListener):
+    """
+    QueueListener whose stop() waits for room instead of failing on a full queue.
+
+    With `parent`, records are also handled by the handlers of `parent` and its
+    ancestors at the time they're handled, like propagation would, so handlers
+    added after queue logging was enabled (e.g. to the root logger) still get them.
+
+    :param Queue queue:             Queue of a BoundedQueueHandler.
+    :param Handler handlers:        Handlers of the queued logger itself.
+    :param bool respect_handler_level: Whether handlers' levels are checked.
+    :param Logger parent:           Logger records propagate to, None for no propagation.
+    """
+
+    def __init__(
+        self,
+        queue: Any,
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+        parent: Optional[logging.Logger] = None,
+    ) -> None:
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.parent = parent
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+    def handle(self, record: logging.LogRecord) -> None:
+        record = self.prepare(record)
+        handlers = list(self.handlers)
+        if self.parent is not None:
+            handlers.extend(_get_propagated_handlers(self.parent))
+        if not handlers and logging.lastResort is not None:
+            handlers.append(logging.lastResort)
+        for handler in handlers:
+            if not self.respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
+
+
+# loggers with queue logging enabled, flushed at exit
+_QUEUED_LOGGERS: Set[logging.Logger] = set()
+# guards rewiring loggers in enable_queue_logging/disable_queue_logging
+_QUEUE_LOGGING_LOCK = threading.Lock()
+
+
+def _get_queue_handler(logger: logging.Logger) -> Optional[BoundedQueueHandler]:
+    for handler in logger.handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            return handler
+    return None
+
+
+def _get_propagated_handlers(logger: logging.Logger) -> List[logging.Handler]:
+    """Handlers of a logger and, following propagation, its ancestors."""
+    handlers: List[logging.Handler] = []
+    current: Optional[logging.Logger] = logger
+    while current is not None:
+        handlers.extend(current.handlers)
+        if not current.propagate:
+            break
+        current = current.parent
+    return handlers
+
+
+def enable_queue_logging(
+    logger: logging.Logger, max_size: int = 10000
+) -> BoundedQueueHandler:
+    """
+    Move a logger's output off the calling thread.
+
+    The logger's handlers are moved behind a BoundedQueueListener thread and the logger
+    is given a single BoundedQueueHandler instead, with propagation off - the listener
+    propagates records to the ancestors' handlers instead. A slow handler (file, syslog
+    socket...) then no longer delays the caller.
+
+    Meant to be called once at startup, e.g. from an AppConfig.ready() - the LOG_QUEUE
+    setting does it for DEFAULT_LOGGER. Calling it again for the same logger, from any
+    thread, returns the existing handler.
+
+    Args:
+        logger (Logger): Logger to make non-blocking, e.g. DEFAULT_LOGGER.
+        max_size (int): Maximum number of queued records, further records are dropped and counted.
+
+    Returns:
+        The BoundedQueueHandler, see its `dropped` count.
+    """
+    with _QUEUE_LOGGING_LOCK:
+        queue_handler = _get_queue_handler(logger)
+        if queue_handler is not None:
+            return queue_handler
+
+        queue_handler = BoundedQueueHandler(max_size)
+        queue_handler._replaced_handlers = list(logger.handlers)
+        queue_handler._replaced_propagate = logger.propagate
+        listener = BoundedQueueListener(
+            queue_handler.queue,
+            *queue_handler._replaced_handlers,
+            respect_handler_level=True,
+            parent=logger.parent if logger.propagate else None,
+        )
+        queue_handler.listener = listener
+        for handler in queue_handler._replaced_handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+        listener.start()
+        _QUEUED_LOGGERS.add(logger)
+        return queue_handler
+
+
+def disable_queue_logging(logger: logging.Logger) -> None:
+    """
+    Undo enable_queue_logging: flush the queue, stop the listener and restore the logger.
+
+    Args:
+        logger (Logger): Logger previously passed to enable_queue_logging.
+    """
+    with _QUEUE_LOGGING_LOCK:
+        queue_handler = _get_queue_handler(logger)
+        if queue_handler is None:
+            return
+        logger.removeHandler(queue_handler)
+        if queue_handler.listener is not None:
+            queue_handler.listener.stop()
+            queue_handler.listener = None
+        for handler in queue_handler._replaced_handlers:
+            logger.addHandler(handler)
+        logger.propagate = queue_handler._replaced_propagate
+        _QUEUED_LOGGERS.discard(logger)
+
+
+@atexit.register
+def _flush_queued_loggers() -> None:
+    for logger in list(_QUEUED_LOGGERS):
+        disable_queue_logging(logger)
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import threading
+import time
+
+from .conf import get_toolkit_setting
+
+"""
+============================================================================================ #
+LOG SAMPLING =============================================================================== #
+============================================================================================ #
+"""
+
+
+class LogSampler:
+    """
+    Rate limits and deduplicates repeated log messages.
+
+    Every message has a signature, e.g. exception type + message template + call site.
+    The first `max_full` occurrences of a signature are logged in full (with stack traces),
+    after that occurrences are only counted and a summary with the count is logged
+    at most once every `summary_interval` seconds.
+
+    NOTE: summaries are emitted on the next occurrence after the interval, there is no
+    background thread - a burst that stops is summarized by the next matching error.
+
+    :param int max_full:            Number of occurrences per signature logged in full.
+    :param float summary_interval:  Minimum seconds between summaries per signature.
+    :param int max_signatures:      Number of signatures tracked, least recently seen are dropped.
+    """
+
+    def __init__(
+        self,
+        max_full: int = 5,
+        summary_interval: float = 60.0,
+        max_signatures: int = 1024,
+    ) -> None:
+        self.max_full = max_full
+        self.summary_interval = summary_interval
+        self.max_signatures = max_signatures
+        # signature -> [occurrences, suppressed since last summary, last summary time]
+        self._state: "OrderedDict[Hashable, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def sample(self, signature: Hashable) -> Tuple[bool, int]:
+        """
+        Record an occurrence of a signature and decide how to log it.
+
+        Args:
+            signature: Hashable signature of the message.
+
+        Returns:
+            Tuple of (log in full, suppressed count to summarize).
+            (True, 0) means log normally, (False, n) means log a summary
+            of n suppressed occurrences and (False, 0) means drop it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(signature)
+            if state is None:
+                state = [0, 0, now]
+                self._state[signature] = state
+                if len(self._state) > self.max_signatures:
+                    self._state.popitem(last=False)
+            else:
+                self._state.move_to_end(signature)
+
+            state[0] += 1
+            if state[0] <= self.max_full:
+                # reset the window so the first summary covers only suppressed ones
+                state[2] = now
+                return True, 0
+
+            state[1] += 1
+            if now - state[2] < self.summary_interval:
+                return False, 0
+            suppressed = int(state[1])
+            state[1] = 0
+            state[2] = now
+            return False, suppressed
+
+    def reset(self, signature: Optional[Hashable] = None) -> None:
+        """Forget one signature, or all of them if no signature is given."""
+        with self._lock:
+            if signature is None:
+                self._state.clear()
+            else:
+                self._state.pop(signature, None)
+
+
+# LOG_SAMPLING setting -> the process wide sampler, see get_log_sampler
+# NOTE: one per setting value, i.e. normally just one
+_LOG_SAMPLERS: Dict[Tuple[Tuple[str, Any], ...], LogSampler] = {}
+_LOG_SAMPLERS_LOCK = threading.Lock()
+
+
+def get_log_sampler() -> Optional[LogSampler]:
+    """
+    Get the sampler configured via the `LOG_SAMPLING` toolkit setting.
+
+    Handlers are typically created per request, so they all share this one sampler
+    for the counts and summaries to span requests. It is created once per process.
+
+    Returns:
+        LogSampler: The process wide sampler, None if LOG_SAMPLING isn't set.
+    """
+    setting = get_toolkit_setting("LOG_SAMPLING")
+    if not setting:
+        return None
+    key = tuple(sorted(setting.items()))
+    sampler = _LOG_SAMPLERS.get(key)
+    if sampler is None:
+        with _LOG_SAMPLERS_LOCK:
+            sampler = _LOG_SAMPLERS.get(key)
+            if sampler is None:
+                sampler = LogSampler(
+                    **{name.lower(): value for name, value in setting.items()}
+                )
+                _LOG_SAMPLERS[key] = sampler
+    return sampler
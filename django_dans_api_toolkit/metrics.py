@@ -0,0 +1,278 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+from django.http import HttpRequest, HttpResponse
+
+"""
+============================================================================================ #
+METRICS ==================================================================================== #
+============================================================================================ #
+"""
+
+#
+# Hooks are called with an event name and its fields:
+#   "format" - ApiResponseHandler built an envelope:  status, duration (seconds)
+#   "render" - ApiResponseRenderer rendered a body:   status, duration (seconds), bytes
+#   "error"  - ApiResponseHandler.response_error:     status, error_type
+#   "serialize" - BaseSerializer serialized a top level instance: serializer, duration (seconds)
+#
+# Pre-rendered error envelopes (see static_responses) get "error" and "format" too,
+# from response_error(status=...) and from exception_handler.
+#
+# With no hooks registered the handler/renderer/serializers skip timing entirely,
+# the only cost is checking that METRICS_HOOKS is empty.
+#
+MetricsHook = Callable[[str, Dict[str, object]], None]
+
+METRICS_HOOKS: List[MetricsHook] = []
+
+
+def add_metrics_hook(hook: MetricsHook) -> None:
+    """
+    Register a hook called for every metrics event, see the events above.
+
+    NOTE: hooks run inline on the request, keep them fast.
+
+    Args:
+        hook (callable): Called as hook(event, fields).
+    """
+    if hook not in METRICS_HOOKS:
+        METRICS_HOOKS.append(hook)
+
+
+def remove_metrics_hook(hook: MetricsHook) -> None:
+    """Unregister a hook added with add_metrics_hook."""
+    if hook in METRICS_HOOKS:
+        METRICS_HOOKS.remove(hook)
+
+
+def emit_metric(event: str, fields: Dict[str, object]) -> None:
+    """Call all hooks with an event, callers check METRICS_HOOKS first to skip building fields."""
+    for hook in METRICS_HOOKS:
+        hook(event, fields)
+
+
+LabelsKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsCollector:
+    """
+    In-process metrics collector, a hook exposing counters/histograms in Prometheus text format.
+
+    Metrics (all prefixed `dans_api_`):
+        - responses_total{status}:              envelopes built by ApiResponseHandler
+        - response_format_seconds:              time spent building envelopes
+        - render_seconds{status}:               time spent in ApiResponseRenderer.render
+        - render_bytes{status}:                 rendered body size
+        - errors_total{status,error_type}:      error responses by exception type
+
+    NOTE: values are per process, with several workers each one reports its own.
+    """
+
+    duration_buckets: Tuple[float, ...] = (
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+    )
+    size_buckets: Tuple[float, ...] = (
+        256,
+        1024,
+        4096,
+        16384,
+        65536,
+        262144,
+        1048576,
+        4194304,
+    )
+
+    # name -> (type, help)
+    METRICS: Dict[str, Tuple[str, str]] = {
+        "dans_api_responses_total": (
+            "counter",
+            "Envelopes built by ApiResponseHandler.",
+        ),
+        "dans_api_response_format_seconds": (
+            "histogram",
+            "Time spent building response envelopes.",
+        ),
+        "dans_api_render_seconds": (
+            "histogram",
+            "Time spent rendering responses with ApiResponseRenderer.",
+        ),
+        "dans_api_render_bytes": ("histogram", "Size of rendered response bodies."),
+        "dans_api_errors_total": ("counter", "Error responses by error type."),
+    }
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelsKey], float] = {}
+        # (name, labels) -> (buckets, [per bucket counts..., +Inf count, sum])
+        self._histograms: Dict[
+            Tuple[str, LabelsKey], Tuple[Tuple[float, ...], List[float]]
+        ] = {}
+
+    def __call__(self, event: str, fields: Dict[str, object]) -> None:
+        status = str(fields.get("status"))
+        if event == "format":
+            self.inc("dans_api_responses_total", (("status", status),))
+            self.observe(
+                "dans_api_response_format_seconds",
+                float(fields["duration"]),  # type: ignore[arg-type]
+                self.duration_buckets,
+            )
+        elif event == "render":
+            labels = (("status", status),)
+            self.observe(
+                "dans_api_render_seconds",
+                float(fields["duration"]),  # type: ignore[arg-type]
+                self.duration_buckets,
+                labels,
+            )
+            self.observe(
+                "dans_api_render_bytes",
+                float(fields["bytes"]),  # type: ignore[arg-type]
+                self.size_buckets,
+                labels,
+            )
+        elif event == "error":
+            self.inc(
+                "dans_api_errors_total",
+                (("status", status), ("error_type", str(fields.get("error_type")))),
+            )
+
+    def inc(self, name: str, labels: LabelsKey = (), value: float = 1) -> None:
+        """Increment a counter."""
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Tuple[float, ...],
+        labels: LabelsKey = (),
+    ) -> None:
+        """Record a value in a histogram."""
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = (
+                    buckets,
+                    [0.0] * (len(buckets) + 2),
+                )
+            bounds, counts = histogram
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-2] += 1
+            counts[-1] += value
+
+    def reset(self) -> None:
+        """Forget all values."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """
+        Get all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text, e.g. for a /metrics endpoint.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: (bounds, list(counts))
+                for key, (bounds, counts) in self._histograms.items()
+            }
+
+        lines: List[str] = []
+        for name, (metric_type, help_text) in self.METRICS.items():
+            samples: List[str] = []
+            if metric_type == "counter":
+                for (counter_name, labels), value in sorted(counters.items()):
+                    if counter_name == name:
+                        samples.append(
+                            f"{name}{_format_labels(labels)} {_number(value)}"
+                        )
+            else:
+                for (histogram_name, labels), (bounds, counts) in sorted(
+                    histograms.items()
+                ):
+                    if histogram_name != name:
+                        continue
+                    cumulative = 0.0
+                    for bound, count in zip(bounds, counts):
+                        cumulative += count
+                        le = (("le", _number(bound)),)
+                        samples.append(
+                            f"{name}_bucket{_format_labels(labels + le)} {_number(cumulative)}"
+                        )
+                    cumulative += counts[-2]
+                    samples.append(
+                        f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} "
+                        f"{_number(cumulative)}"
+                    )
+                    samples.append(
+                        f"{name}_sum{_format_labels(labels)} {_number(counts[-1])}"
+                    )
+                    samples.append(
+                        f"{name}_count{_format_labels(labels)} {_number(cumulative)}"
+                    )
+            if samples:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(samples)
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels: LabelsKey) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+# collector registered by the METRICS setting and served by metrics_view
+default_collector = MetricsCollector()
+
+
+def metrics_view(
+    request: HttpRequest, collector: Optional[MetricsCollector] = None
+) -> HttpResponse:
+    """
+    Django view serving the collector's metrics in Prometheus text format.
+
+    NOTE: it's not protected in any way, restrict access to it yourself.
+
+    Args:
+        request (HttpRequest): The request.
+        collector (MetricsCollector, optional): Collector to serve, defaults to default_collector.
+
+    Returns:
+        HttpResponse: text/plain Prometheus exposition.
+    """
+    return HttpResponse(
+        (collector or default_collector).render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
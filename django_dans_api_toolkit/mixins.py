@@ -0,0 +1,173 @@
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+from .caches import LruCache
+from .serializers.base import BaseSerializer
+from .serializers.query_plan import QueryPlan, get_query_plan
+
+"""
+============================================================================================ #
+VIEW MIXINS ================================================================================ #
+============================================================================================ #
+"""
+
+# (serializer class, masked, ref_serializer, ?fields= names, ?exclude= names) -> field names
+SparseFieldsetKey = Tuple[
+    type, Any, Any, Optional[FrozenSet[str]], Optional[FrozenSet[str]]
+]
+
+_SPARSE_FIELDSETS: LruCache[SparseFieldsetKey, Tuple[str, ...]] = LruCache(
+    max_size=1024
+)
+# BaseSerializer field plan key -> QueryPlan, see QueryOptimizationMixin.get_query_plan
+_QUERY_PLANS: LruCache[Any, QueryPlan] = LruCache(max_size=1024)
+# same for `fields` variants, e.g. sparse fieldsets chosen by clients, so they can't evict the others
+_FIELDS_QUERY_PLANS: LruCache[Any, QueryPlan] = LruCache(max_size=256)
+
+
+class QueryOptimizationMixin:
+    """
+    GenericAPIView/viewset mixin adding the serializer's select_related/prefetch_related
+    to `get_queryset()`, see serializers.query_plan.get_query_plan.
+
+    The plan follows the serializer returned by `get_serializer()`, so variants set there
+    (e.g. `ref_serializer=True`) only join/prefetch the relations and load the columns
+    they render:
+        class BookViewSet(QueryOptimizationMixin, viewsets.ReadOnlyModelViewSet):
+            queryset = Book.objects.all()
+            serializer_class = BookSerializer
+
+    Plans of BaseSerializers with cached fields are cached per variant (masked,
+    ref_serializer, fields), other serializers are planned on every call.
+
+    Override `get_query_plan()` to plan for another serializer. Set `prune_columns = False`
+    to load all columns, e.g. if the serializer's to_representation reads other ones.
+    Columns are only pruned for `prune_methods`, writes (e.g. `get_object()` for PUT/PATCH)
+    load whole instances since saving, validation and signals may read any column.
+    """
+
+    # only() the columns the serializer needs, see QueryPlan.only
+    prune_columns = True
+    prune_methods = ("GET", "HEAD")
+
+    def get_queryset(self) -> Any:
+        queryset = super().get_queryset()  # type: ignore[misc]
+        request = getattr(self, "request", None)
+        prune_columns = (
+            self.prune_columns
+            and request is not None
+            and request.method in self.prune_methods
+        )
+        return self.get_query_plan().apply(queryset, prune_columns)
+
+    def get_query_plan(self) -> QueryPlan:
+        """Plan of the serializer used by the view."""
+        serializer = self.get_serializer()  # type: ignore[attr-defined]
+        # fields of other serializers may depend on the request
+        if not isinstance(serializer, BaseSerializer) or not serializer.cache_fields:
+            return get_query_plan(serializer)
+        key = serializer._field_plan_key
+        plans = _QUERY_PLANS if key[3] is None else _FIELDS_QUERY_PLANS
+        plan = plans.get(key)
+        if plan is None:
+            plan = get_query_plan(serializer)
+            plans.set(key, plan)
+        return plan
+
+
+class SparseFieldsetMixin(QueryOptimizationMixin):
+    """
+    QueryOptimizationMixin letting clients pick the fields of a BaseSerializer with
+    `?fields=id,title` or leave some out with `?exclude=summary,reviews`.
+
+    The fields are passed to the serializer as `fields=[...]`, so the query plan only
+    joins/prefetches and loads the columns of the requested fields.
+    Unknown fields, including masked/ref fields the view doesn't render, are a 400.
+    Empty parameters (e.g. `?fields=`) are ignored, i.e. all fields are rendered.
+
+    Validated fieldsets and their query plans are cached per serializer variant and
+    set of requested names (e.g. `?fields=title,id` and `?fields=id,title,` are the
+    same), repeated requests don't validate nor plan again.
+
+    NOTE: only applies to safe methods (GET, HEAD, OPTIONS), the `fields` of a
+    serializer are also the ones it validates.
+        class BookViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
+            queryset = Book.objects.all()
+            serializer_class = BookSerializer
+    """
+
+    fields_query_param = "fields"
+    exclude_query_param = "exclude"
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> Any:
+        if "fields" not in kwargs:
+            fields = self.get_sparse_fields(kwargs)
+            if fields is not None:
+                kwargs["fields"] = list(fields)
+        return super().get_serializer(*args, **kwargs)  # type: ignore[misc]
+
+    def get_sparse_fields(
+        self, serializer_kwargs: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[str, ...]]:
+        """
+        Fields requested with the query parameters.
+
+        Args:
+            serializer_kwargs (dict, optional): Kwargs the serializer is created with,
+                                                its `masked`/`ref_serializer` variant.
+
+        Returns:
+            Tuple of field names in the serializer's order, None if not requested.
+        """
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        requested = self._get_sparse_param(request, self.fields_query_param)
+        excluded = self._get_sparse_param(request, self.exclude_query_param)
+        if requested is None and excluded is None:
+            return None
+        serializer_class = self.get_serializer_class()  # type: ignore[attr-defined]
+        if not issubclass(serializer_class, BaseSerializer):
+            return None
+
+        variant = {
+            name: value
+            for name, value in (serializer_kwargs or {}).items()
+            if name in ("masked", "ref_serializer")
+        }
+        key: SparseFieldsetKey = (
+            serializer_class,
+            variant.get("masked"),
+            variant.get("ref_serializer"),
+            None if requested is None else frozenset(requested),
+            None if excluded is None else frozenset(excluded),
+        )
+        fields = _SPARSE_FIELDSETS.get(key)
+        if fields is None:
+            available = list(serializer_class(**variant).fields)
+            fields = tuple(available)
+            if requested is not None:
+                self._check_sparse_names(self.fields_query_param, requested, available)
+                fields = tuple(name for name in fields if name in requested)
+            if excluded is not None:
+                self._check_sparse_names(self.exclude_query_param, excluded, available)
+                fields = tuple(name for name in fields if name not in excluded)
+            _SPARSE_FIELDSETS.set(key, fields)
+        return fields
+
+    @staticmethod
+    def _get_sparse_param(request: Any, param: str) -> Optional[List[str]]:
+        """Comma separated field names of a query parameter, None if missing or empty (e.g. `?fields=`)."""
+        value: Optional[str] = request.query_params.get(param)
+        if value is None:
+            return None
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        return names or None
+
+    @staticmethod
+    def _check_sparse_names(param: str, names: List[str], available: List[str]) -> None:
+        """Raise a ValidationError for unknown field names."""
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({param: [f"Unknown fields: {', '.join(unknown)}."]})
@@ -0,0 +1,265 @@
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
+import hashlib
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Model, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import cached_property
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .conf import get_toolkit_setting
+
+"""
+============================================================================================ #
+PAGINATION ================================================================================= #
+============================================================================================ #
+"""
+
+
+# paginator class -> envelope keys, see get_pagination_keys
+_PAGINATION_KEYS_CACHE: Dict[Type[BasePagination], Optional[Tuple[str, ...]]] = {}
+
+
+def _get_pagination_keys_for_class(
+    paginator_class: Type[BasePagination],
+    paginator: Optional[BasePagination] = None,
+) -> Optional[Tuple[str, ...]]:
+    try:
+        return _PAGINATION_KEYS_CACHE[paginator_class]
+    except KeyError:
+        pass
+    if paginator is None:
+        try:
+            paginator = paginator_class()
+        except Exception:
+            # e.g. a paginator requiring constructor arguments, its keys are
+            # known once an instance is passed
+            return None
+    schema = paginator.get_paginated_response_schema({})
+    properties = schema.get("properties") if isinstance(schema, dict) else None
+    keys: Optional[Tuple[str, ...]] = None
+    if properties and "results" in properties:
+        keys = tuple(key for key in properties if key != "results")
+    _PAGINATION_KEYS_CACHE[paginator_class] = keys
+    return keys
+
+
+def get_pagination_keys(
+    paginator: Optional[Union[BasePagination, Type[BasePagination]]],
+) -> Optional[Tuple[str, ...]]:
+    """
+    Get the top-level envelope keys a paginator produces, besides 'results'.
+
+    The keys come from the paginator's `get_paginated_response_schema`, so this works
+    for DRF's paginators as well as custom ones that document their response, e.g.
+        - PageNumberPagination / LimitOffsetPagination: ('count', 'next', 'previous')
+        - CursorPagination: ('next', 'previous')
+    Keys are computed once per paginator class. Classes are instantiated without
+    arguments for it, if that fails their keys are None until an instance is passed.
+
+    Args:
+        paginator (BasePagination): Paginator instance or class, e.g. `view.paginator`.
+
+    Returns:
+        Tuple of keys, or None if there is no paginator or it doesn't describe its response.
+    """
+    if paginator is None:
+        return None
+    if isinstance(paginator, type):
+        return _get_pagination_keys_for_class(paginator)
+    return _get_pagination_keys_for_class(type(paginator), paginator)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (a.k.a. seek) pagination for large tables.
+
+    Pages are fetched with `WHERE <ordering field> < <cursor position> LIMIT <page size>`
+    rather than `OFFSET`, so every page costs the same no matter how deep it is - as long
+    as the ordering field is indexed. Built on DRF's CursorPagination.
+
+    The response matches the standard envelope, 'next' / 'previous' are opaque cursor
+    links and 'count' is only included if `include_count` is True since it costs a
+    `COUNT(*)` per request - exactly what this class is meant to avoid.
+
+    :param str ordering:        Field(s) to order by, the first must be unique and indexed.
+                                Defaults to '-pk'.
+    :param bool include_count:  Whether to include 'count' in the response.
+                                NOTE: set this on the class, the envelope keys are per class.
+    """
+
+    ordering = "-pk"
+    include_count = False
+    count: Optional[int] = None
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet[Any],
+        request: Request,
+        view: Optional[APIView] = None,
+    ) -> Optional[List[Any]]:
+        # count the full queryset, before the cursor filters it
+        self.count = queryset.count() if self.include_count else None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        response_data: Dict[str, Any] = {}
+        if self.include_count:
+            response_data["count"] = self.count
+        response_data["next"] = self.get_next_link()
+        response_data["previous"] = self.get_previous_link()
+        response_data["results"] = data
+        return Response(response_data)
+
+    def get_paginated_response_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        response_schema: Dict[str, Any] = super().get_paginated_response_schema(schema)
+        if self.include_count:
+            response_schema["properties"] = {
+                "count": {"type": "integer", "example": 123},
+                **response_schema["properties"],
+            }
+        return response_schema
+
+
+#
+# CACHED COUNTS
+#
+# Counts are cached per queryset SQL (i.e. per model + filters) together with
+# the model's "count version". Saving/deleting an instance bumps the version,
+# which makes every cached count for that model stale at once.
+#
+_COUNT_CACHE_PREFIX = "dans_api_toolkit:count"
+
+# models whose save/delete signals are connected to invalidate_cached_counts
+_INVALIDATION_CONNECTED: Set[Type[Model]] = set()
+
+
+def _get_count_version_key(model: Type[Model]) -> str:
+    return f"{_COUNT_CACHE_PREFIX}:version:{model._meta.label_lower}"
+
+
+def _get_count_key(queryset: QuerySet[Any]) -> Optional[str]:
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    digest = hashlib.md5(
+        f"{queryset.db}:{sql}:{params!r}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"{_COUNT_CACHE_PREFIX}:{queryset.model._meta.label_lower}:{digest}"
+
+
+def invalidate_cached_counts(model: Type[Model]) -> None:
+    """
+    Invalidate all cached counts for a model.
+
+    Called automatically on save/delete for paginators with `invalidate_on_save`,
+    call it yourself after bulk operations (bulk_create, update...) that don't send signals.
+
+    Args:
+        model (Model): Model class to invalidate counts for.
+    """
+    cache = caches[get_toolkit_setting("COUNT_CACHE_ALIAS")]
+    key = _get_count_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # version doesn't exist yet
+        cache.set(key, 1, None)
+
+
+def _invalidate_cached_counts_receiver(sender: Type[Model], **kwargs: Any) -> None:
+    invalidate_cached_counts(sender)
+
+
+def connect_count_invalidation(model: Type[Model]) -> None:
+    """
+    Invalidate a model's cached counts whenever one of its instances is saved/deleted.
+
+    Paginators connect their model on first use, which only covers writes made
+    afterwards in the same process. Connect models at startup for writes from any
+    process (other workers, management commands, task queues...), either with the
+    COUNT_CACHE_MODELS setting or by calling this from an AppConfig.ready().
+
+    Args:
+        model (Model): Model class whose counts are cached.
+    """
+    if model in _INVALIDATION_CONNECTED:
+        return
+    dispatch_uid = f"{_COUNT_CACHE_PREFIX}:{model._meta.label_lower}"
+    post_save.connect(
+        _invalidate_cached_counts_receiver,
+        sender=model,
+        weak=False,
+        dispatch_uid=dispatch_uid,
+    )
+    post_delete.connect(
+        _invalidate_cached_counts_receiver,
+        sender=model,
+        weak=False,
+        dispatch_uid=dispatch_uid,
+    )
+    _INVALIDATION_CONNECTED.add(model)
+
+
+class CachedCountPaginator(DjangoPaginator):  # type: ignore[type-arg]
+    """
+    Django Paginator that caches `count` in the Django cache framework.
+
+    Counts are cached per queryset SQL, so different filters get different counts,
+    for `COUNT_CACHE_TIMEOUT` seconds in the `COUNT_CACHE_ALIAS` cache.
+
+    :param bool invalidate_on_save: If True, saving/deleting an instance of the
+                                    queryset's model invalidates its cached counts.
+                                    NOTE: only the queryset's own model is tracked, and
+                                    only from first use unless connected at startup,
+                                    see connect_count_invalidation.
+    """
+
+    invalidate_on_save = True
+
+    @cached_property
+    def count(self) -> int:
+        object_list = self.object_list
+        if not isinstance(object_list, QuerySet):
+            return super().count
+        count_key = _get_count_key(object_list)
+        if count_key is None:
+            return super().count
+
+        model = object_list.model
+        if self.invalidate_on_save:
+            connect_count_invalidation(model)
+
+        cache = caches[get_toolkit_setting("COUNT_CACHE_ALIAS")]
+        version_key = _get_count_version_key(model)
+        cached = cache.get_many([count_key, version_key])
+        version = cached.get(version_key, 0)
+        entry = cached.get(count_key)
+        if entry is not None and entry[0] == version:
+            return int(entry[1])
+
+        count = object_list.count()
+        cache.set(
+            count_key, (version, count), get_toolkit_setting("COUNT_CACHE_TIMEOUT")
+        )
+        return count
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    PageNumberPagination that caches the `COUNT(*)` behind 'count'.
+
+    Use it for endpoints where clients need 'count' but counting is what dominates latency.
+    See CachedCountPaginator for how counts are cached and invalidated.
+    """
+
+    django_paginator_class = CachedCountPaginator
@@ -0,0 +1,229 @@
+from typing import Callable, Dict, Optional, Tuple
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponseBase
+
+from .conf import get_toolkit_setting
+
+"""
+============================================================================================ #
+PROFILING ================================================================================== #
+============================================================================================ #
+"""
+
+# layer -> path fragments of the modules it's made of
+PROFILE_LAYERS: Dict[str, Tuple[str, ...]] = {
+    "handler": (
+        "/django_dans_api_toolkit/api_response_handler.py",
+        "/django_dans_api_toolkit/api_response.py",
+        "/django_dans_api_toolkit/errors.py",
+        "/django_dans_api_toolkit/static_responses.py",
+    ),
+    "renderer": (
+        "/django_dans_api_toolkit/api_response_renderer.py",
+        "/django_dans_api_toolkit/json_backends.py",
+    ),
+    "serializer": (
+        "/django_dans_api_toolkit/serializers/",
+        "/rest_framework/serializers.py",
+        "/rest_framework/fields.py",
+        "/rest_framework/relations.py",
+    ),
+}
+
+PROFILE_FORMATS = ("pstats", "report")
+
+
+def _get_layer(filename: str) -> Optional[str]:
+    filename = filename.replace("\\", "/")
+    for layer, fragments in PROFILE_LAYERS.items():
+        if any(fragment in filename for fragment in fragments):
+            return layer
+    return None
+
+
+def get_layer_times(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Attribute profiled time to the toolkit layers, see PROFILE_LAYERS.
+
+    A layer's time is the cumulative time of calls into it from outside of it,
+    so nested serializers or helpers calling each other aren't counted twice.
+    Calls re-entering a layer through other code (e.g. a cached_property) are
+    counted again though, treat the times as upper bounds.
+
+    Args:
+        stats (pstats.Stats): Stats of a profiled request.
+
+    Returns:
+        Dict of layer -> seconds, for the layers that were called.
+    """
+    layer_times: Dict[str, float] = {}
+    # (filename, line, function) -> (calls, primitive calls, own time, cumulative time, callers)
+    entries = stats.stats  # type: ignore[attr-defined]
+    for (filename, _, _), (_, _, _, _, callers) in entries.items():
+        layer = _get_layer(filename)
+        if layer is None:
+            continue
+        for (caller_filename, _, _), caller_stats in callers.items():
+            if _get_layer(caller_filename) != layer:
+                # caller -> (calls, primitive calls, own time, cumulative time)
+                layer_times[layer] = layer_times.get(layer, 0.0) + caller_stats[3]
+    return layer_times
+
+
+class RequestProfiler:
+    """
+    Decides which requests are profiled and writes their profiles.
+
+    Each profiled request is written to `output_dir` as:
+        - "pstats": a `.pstats` file, for `python -m pstats` / snakeviz etc.
+        - "report": a `.txt` flat report - time per toolkit layer (handler, renderer,
+                    serializer) then the `top` functions by cumulative time
+
+    :param str output_dir:      Directory the profiles are written to, created if needed.
+    :param float sample_rate:   Fraction of requests profiled, e.g. 0.01 for 1%.
+    :param str header:          Request header that forces a profile, e.g. "X-Profile".
+                                None to only sample.
+    :param str header_value:    Value the header must have, None to accept any.
+                                NOTE: without one, any client can trigger profiles.
+    :param str output_format:   "pstats" or "report".
+    :param int top:             Number of functions listed in reports.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        sample_rate: float = 0.0,
+        header: Optional[str] = None,
+        header_value: Optional[str] = None,
+        output_format: str = "report",
+        top: int = 40,
+    ) -> None:
+        if output_format not in PROFILE_FORMATS:
+            raise ValueError(
+                f"Unknown profile output format '{output_format}', use one of {PROFILE_FORMATS}"
+            )
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.header = header
+        self.header_value = header_value
+        self.output_format = output_format
+        self.top = top
+
+    def should_profile(self, request: HttpRequest) -> bool:
+        """Whether a request is profiled, by header or sampling."""
+        if self.header is not None:
+            value = request.headers.get(self.header)
+            if value is not None and (
+                self.header_value is None or value == self.header_value
+            ):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def dump(
+        self,
+        profile: cProfile.Profile,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        duration: float,
+    ) -> str:
+        """
+        Write a request's profile to output_dir.
+
+        Args:
+            profile (cProfile.Profile): Profile of the request.
+            request (HttpRequest): The profiled request.
+            response (HttpResponseBase): Its response.
+            duration (float): Wall time of the request, in seconds.
+
+        Returns:
+            str: Path of the written file.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        slug = re.sub(r"[^\w]+", "_", request.path).strip("_")[:80] or "root"
+        name = "{}-{}-{}-{}".format(
+            time.strftime("%Y%m%d%H%M%S"),
+            request.method,
+            slug,
+            uuid.uuid4().hex[:8],
+        )
+
+        if self.output_format == "pstats":
+            path = os.path.join(self.output_dir, f"{name}.pstats")
+            profile.dump_stats(path)
+            return path
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stream.write(
+            f"{request.method} {request.path} {response.status_code} "
+            f"{duration * 1000:.3f}ms\n\nlayers (cumulative ms):\n"
+        )
+        for layer, seconds in sorted(
+            get_layer_times(stats).items(), key=lambda item: -item[1]
+        ):
+            stream.write(f"    {layer:<12}{seconds * 1000:10.3f}\n")
+        stream.write("\n")
+        stats.sort_stats("cumulative").print_stats(self.top)
+
+        path = os.path.join(self.output_dir, f"{name}.txt")
+        with open(path, "w") as file:
+            file.write(stream.getvalue())
+        return path
+
+
+class ProfilingMiddleware:
+    """
+    Profiles sampled requests end to end with cProfile, see RequestProfiler.
+
+    Enabled by the PROFILING setting, otherwise Django drops the middleware:
+        MIDDLEWARE = [
+            "django_dans_api_toolkit.profiling.ProfilingMiddleware",
+            ...
+        ]
+        DANS_API_TOOLKIT = {
+            "PROFILING": {"OUTPUT_DIR": "/tmp/profiles", "SAMPLE_RATE": 0.01},
+        }
+
+    Requests that aren't sampled only pay for a random number. Profiled requests are
+    several times slower and write their profile before returning, it's meant for
+    staging/load tests rather than all production traffic.
+
+    NOTE: sync only, cProfile follows a single thread so async views aren't supported.
+
+    :param callable get_response: Next middleware or view.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        setting = get_toolkit_setting("PROFILING")
+        if not setting:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.profiler = RequestProfiler(
+            **{key.lower(): value for key, value in setting.items()}
+        )
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if not self.profiler.should_profile(request):
+            return self.get_response(request)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is already active in this thread
+            return self.get_response(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.disable()
+        self.profiler.dump(profile, request, response, time.perf_counter() - start)
+        return response
@@ -1,12 +1,48 @@
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+import copy
+from django.db import models
 from rest_framework import serializers
 
+from ..caches import LruCache
+from ..metrics import METRICS_HOOKS, emit_metric
+from .compiled import RowFunction, compile_to_representation
+from .query_plan import get_query_plan
+
 """
 # ===================================================================================
 # BASE SERIALIZER ===================================================================
 # ===================================================================================
 """
 
+# (serializer class, masked, ref_serializer, fields) - masked/ref_serializer are None with fields
+FieldPlanKey = Tuple[type, Optional[bool], Optional[bool], Optional[FrozenSet[str]]]
+
+# field plan -> unbound prototype fields, deep copied by each serializer instance
+_FIELD_PLANS: LruCache[FieldPlanKey, Dict[str, serializers.Field]] = LruCache(  # type: ignore[type-arg]
+    max_size=1024
+)
+# same for `fields` variants, e.g. sparse fieldsets chosen by clients, so they can't evict the others
+_FIELDS_FIELD_PLANS: LruCache[FieldPlanKey, Dict[str, serializers.Field]] = LruCache(  # type: ignore[type-arg]
+    max_size=256
+)
+
+# ModelSerializer.get_fields hooks, overrides may depend on the instance/context
+FIELD_HOOKS = (
+    "get_field_names",
+    "get_extra_kwargs",
+    "include_extra_kwargs",
+    "get_uniqueness_extra_kwargs",
+    "build_field",
+    "build_standard_field",
+    "build_relational_field",
+    "build_nested_field",
+    "build_property_field",
+    "build_url_field",
+    "build_unknown_field",
+)
+
 
 class BaseSerializer(serializers.ModelSerializer):
     """
@@ -22,12 +58,23 @@ class BaseSerializer(serializers.ModelSerializer):
                                     all fields will be returned.
     :param List[str] fields:        Additional kwargs 'field' that controls which fields to include.
                                     NOTE: This overrides both `masked` and `ref_serializer` logic.
+    :param bool compiled:           If True, model instances are serialized with a generated function,
+                                    see compiled.compile_to_representation. Also settable in Meta.
+
+    Set `cache_fields` in Meta to True/False to force building each variant's fields once or not,
+    by default they are cached unless the class overrides one of FIELD_HOOKS, see get_fields.
+
+    Set `required_columns` in Meta to the model columns read by SerializerMethodFields/properties,
+    so get_model_columns doesn't have to assume they need all of them.
     """
 
     ref_fields: List[str] = []
     masked_fields: List[str] = []
+    required_columns: Optional[List[str]] = None
     masked: bool = True
     ref_serializer: bool = False
+    compiled: bool = False
+    cache_fields: Optional[bool] = None
     fields: Dict[str, serializers.Field]  # type: ignore[type-arg]
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -37,32 +84,115 @@ class BaseSerializer(serializers.ModelSerializer):
         self.kwargs = kwargs
         self.masked = kwargs.pop("masked", self.masked)
         self.ref_serializer = kwargs.pop("ref_serializer", self.ref_serializer)
+        self.compiled = kwargs.pop(
+            "compiled", getattr(self.Meta, "compiled", self.compiled)
+        )
+        self._compiled_to_representation: Optional[RowFunction] = None
+        cache_fields = getattr(self.Meta, "cache_fields", self.cache_fields)
+        self.cache_fields = (
+            not _overrides_field_hooks(type(self))
+            if cache_fields is None
+            else cache_fields
+        )
 
-        # handle 'fields' keyword argument first since
-        # it overrides the other logic
+        # 'fields' keyword argument overrides the other logic
         fields: Optional[List[str]] = kwargs.pop("fields", None)
+        self._field_plan_key: FieldPlanKey = (
+            (type(self), None, None, frozenset(fields))
+            if fields is not None
+            else (type(self), self.masked, self.ref_serializer, None)
+        )
 
-        if fields is not None:
-            # Drop any fields that are not specified in the `fields` argument
-            allowed = set(fields)
-            existing = set(self.fields.keys())
-            for field_name in existing - allowed:
-                self.fields.pop(field_name)
-        else:
-            # if masked serializer, remove masked fields
-            masked_fields = getattr(self.Meta, "masked_fields", self.masked_fields)
-            if self.masked:
-                for field in masked_fields:
-                    self.fields.pop(field, None)
-
-            # if ref serializer, remove ref fields
-            ref_fields = getattr(self.Meta, "ref_fields", self.ref_fields)
-            if self.ref_serializer:
-                for field in ref_fields:
-                    self.fields.pop(field, None)
-
-        # Instantiate the superclass normally
-        # NOTE: the placement of this is important
-        # since we want to remove fields before
-        # the superclass is instantiated
+        # NOTE: fields are only built on first use, see get_fields
         super().__init__(*args, **kwargs)
+
+    def get_field_names(self, declared_fields: Any, info: Any) -> List[str]:
+        # only the fields of the plan are built
+        return self._filter_field_names(super().get_field_names(declared_fields, info))
+
+    def get_fields(self) -> Dict[str, serializers.Field]:  # type: ignore[type-arg]
+        """
+        Fields of this serializer variant, i.e. without masked/ref fields or only `fields`.
+
+        With `cache_fields`, they are built once per (class, masked, ref_serializer, fields)
+        and deep copied from then on, like DRF does with declared fields, instead of
+        building every model field and removing the unwanted ones each time.
+
+        NOTE: cached fields are built for the first instance, i.e. its `instance`/`context`.
+        Classes overriding FIELD_HOOKS (e.g. read-only fields on update in get_extra_kwargs)
+        aren't cached unless `Meta.cache_fields = True`.
+        """
+        if not self.cache_fields:
+            return self._build_fields()
+        plans = _FIELD_PLANS if self._field_plan_key[3] is None else _FIELDS_FIELD_PLANS
+        prototypes = plans.get(self._field_plan_key)
+        if prototypes is None:
+            prototypes = self._build_fields()
+            plans.set(self._field_plan_key, prototypes)
+        return copy.deepcopy(prototypes)
+
+    def _build_fields(self) -> Dict[str, serializers.Field]:  # type: ignore[type-arg]
+        fields = super().get_fields()
+        # hidden fields (e.g. unique_together) aren't part of get_field_names
+        return {name: fields[name] for name in self._filter_field_names(list(fields))}
+
+    def _filter_field_names(self, field_names: List[str]) -> List[str]:
+        """Field names of the plan, in the serializer's order."""
+        _, masked, ref_serializer, allowed = self._field_plan_key
+        if allowed is not None:
+            return [name for name in field_names if name in allowed]
+
+        excluded: Set[str] = set()
+        # if masked serializer, remove masked fields
+        if masked:
+            excluded.update(getattr(self.Meta, "masked_fields", self.masked_fields))
+        # if ref serializer, remove ref fields
+        if ref_serializer:
+            excluded.update(getattr(self.Meta, "ref_fields", self.ref_fields))
+        return [name for name in field_names if name not in excluded]
+
+    def get_model_columns(self) -> List[str]:
+        """
+        Model columns needed to serialize an instance, for `queryset.only()`.
+
+        Returns:
+            List[str]: Field names, including those of joined models, e.g. ["id", "author__name"].
+        """
+        return get_query_plan(self).only or []
+
+    def to_representation(self, instance: Any) -> Any:
+        if not METRICS_HOOKS:
+            return self._to_representation(instance)
+
+        # only top level instances are timed, i.e. not nested serializers,
+        # with many=True each item is reported on its own
+        parent = self.parent
+        if parent is not None and not (
+            isinstance(parent, serializers.ListSerializer) and parent.parent is None
+        ):
+            return self._to_representation(instance)
+
+        start = perf_counter()
+        representation = self._to_representation(instance)
+        emit_metric(
+            "serialize",
+            {"serializer": type(self).__name__, "duration": perf_counter() - start},
+        )
+        return representation
+
+    def _to_representation(self, instance: Any) -> Any:
+        # compiled functions read model attributes, other instances (e.g. dicts) can't use them
+        if self.compiled and isinstance(instance, models.Model):
+            if self._compiled_to_representation is None:
+                self._compiled_to_representation = compile_to_representation(self)
+            return self._compiled_to_representation(instance)
+        return super().to_representation(instance)
+
+
+@lru_cache(maxsize=None)
+def _overrides_field_hooks(serializer_class: type) -> bool:
+    """Whether a BaseSerializer subclass overrides one of FIELD_HOOKS."""
+    return any(
+        getattr(serializer_class, name) is not getattr(BaseSerializer, name)
+        for name in FIELD_HOOKS
+    )
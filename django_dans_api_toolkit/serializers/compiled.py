@@ -0,0 +1,159 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from django.db import models
+from rest_framework import serializers
+from rest_framework.fields import Field, SkipField
+from rest_framework.relations import PKOnlyObject, PrimaryKeyRelatedField
+
+from ..caches import LruCache
+from .query_plan import _get_columns, _get_relations
+
+"""
+# ===================================================================================
+# COMPILED SERIALIZERS ==============================================================
+# ===================================================================================
+"""
+
+RowFunction = Callable[[Any], Dict[str, Any]]
+
+# field types whose to_representation is a plain conversion, inlined in compiled functions
+INLINED_CONVERSIONS: Dict[type, str] = {
+    serializers.CharField: "str",
+    serializers.EmailField: "str",
+    serializers.SlugField: "str",
+    serializers.URLField: "str",
+    serializers.IntegerField: "int",
+    serializers.FloatField: "float",
+    serializers.ReadOnlyField: "",
+}
+
+# generated source -> factory binding a serializer's fields, see compile_to_representation
+_COMPILED: LruCache[str, Callable[[List[Field]], RowFunction]] = LruCache(  # type: ignore[type-arg]
+    max_size=1024
+)
+
+
+def compile_to_representation(
+    serializer: serializers.ModelSerializer,
+) -> RowFunction:
+    """
+    Generate a model instance -> dict function equivalent to the serializer's to_representation.
+
+    Fields reading a model column with a plain conversion (CharField, IntegerField,
+    FloatField, ReadOnlyField) and primary key related fields on a foreign key are
+    inlined, e.g. for SampleSerializer:
+        ret["id"] = instance.id
+        value = instance.field1
+        ret["field1"] = None if value is None else str(value)
+    Other fields reading a model column skip get_attribute and call their own
+    to_representation, anything else (nested serializers, method fields, dotted
+    sources...) goes through the regular get_attribute/to_representation.
+
+    Functions are generated once per field layout and bound to the serializer's fields.
+
+    Args:
+        serializer (ModelSerializer): Serializer with its fields, i.e. its variant, set.
+
+    Returns:
+        Function serializing an instance of the serializer's model.
+    """
+    fields: List[Field] = list(serializer._readable_fields)  # type: ignore[type-arg]
+    source = _build_source(fields, serializer.Meta.model)
+    make = _COMPILED.get(source)
+    if make is None:
+        # the source only contains field indexes, repr() of field names and
+        # model attribute names checked to be identifiers
+        namespace: Dict[str, Any] = {
+            "SkipField": SkipField,
+            "PKOnlyObject": PKOnlyObject,
+        }
+        exec(compile(source, "<compiled to_representation>", "exec"), namespace)
+        make = namespace["make"]
+        _COMPILED.set(source, make)
+    return make(fields)
+
+
+def _get_column_attribute(
+    field: Field, model: Type[models.Model]  # type: ignore[type-arg]
+) -> Tuple[Optional[str], Optional[str]]:
+    """How a field can be compiled: (conversion or "raw"/"field", model attribute) or (None, None)."""
+    attrs = field.source_attrs
+    if len(attrs) != 1 or not attrs[0].isidentifier():
+        return None, None
+    attr = attrs[0]
+
+    relation = _get_relations(model).get(attr)
+    if relation is not None:
+        # only the pk of a foreign key, i.e. its `_id` column
+        if (
+            type(field) is PrimaryKeyRelatedField
+            and field.pk_field is None
+            and relation.concrete
+            and (relation.many_to_one or relation.one_to_one)
+        ):
+            return "raw", relation.attname
+        return None, None
+
+    if attr not in _get_columns(model) or type(field).get_attribute is not (
+        Field.get_attribute
+    ):
+        return None, None
+    conversion = INLINED_CONVERSIONS.get(type(field))
+    if conversion is None:
+        return "field", attr
+    return conversion or "raw", attr
+
+
+def _build_source(
+    fields: List[Field], model: Type[models.Model]  # type: ignore[type-arg]
+) -> str:
+    bindings: List[str] = []
+    body: List[str] = []
+    for index, field in enumerate(fields):
+        key = repr(field.field_name)
+        kind, attr = _get_column_attribute(field, model)
+        if kind == "raw":
+            body.append(f"        ret[{key}] = instance.{attr}")
+        elif kind is not None:
+            if kind == "field":
+                bindings.append(
+                    f"    to_representation_{index} = fields[{index}].to_representation"
+                )
+                kind = f"to_representation_{index}"
+            body.append(f"        value = instance.{attr}")
+            body.append(
+                f"        ret[{key}] = None if value is None else {kind}(value)"
+            )
+        else:
+            # same as Serializer.to_representation
+            bindings.append(
+                f"    get_attribute_{index} = fields[{index}].get_attribute"
+            )
+            bindings.append(
+                f"    to_representation_{index} = fields[{index}].to_representation"
+            )
+            body.extend(
+                [
+                    "        try:",
+                    f"            attribute = get_attribute_{index}(instance)",
+                    "        except SkipField:",
+                    "            pass",
+                    "        else:",
+                    "            check_for_none = (",
+                    "                attribute.pk if isinstance(attribute, PKOnlyObject) else attribute",
+                    "            )",
+                    f"            ret[{key}] = (",
+                    f"                None if check_for_none is None else to_representation_{index}(attribute)",
+                    "            )",
+                ]
+            )
+    return "\n".join(
+        [
+            "def make(fields):",
+            *bindings,
+            "    def to_representation(instance):",
+            "        ret = {}",
+            *body,
+            "        return ret",
+            "    return to_representation",
+        ]
+    )
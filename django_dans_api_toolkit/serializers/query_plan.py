@@ -0,0 +1,288 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, cast
+from django.db import models
+from django.db.models import Prefetch, QuerySet
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+"""
+# ===================================================================================
+# QUERY PLAN ========================================================================
+# ===================================================================================
+"""
+
+
+# lookup prefix -> (model, columns needed or None for all), see get_query_plan
+Columns = Dict[str, Tuple[Type[models.Model], Optional[List[str]]]]
+
+
+class QueryPlan:
+    """
+    select_related/prefetch_related/only lookups a serializer needs, see get_query_plan.
+
+    :param list select_related:     Lookups joined in the query, e.g. ["author", "author__company"].
+    :param list prefetch_related:   (lookup, related model, QueryPlan of the related objects)
+                                    for to-many relations, e.g. ("tags", Tag, QueryPlan()).
+    :param list only:               Columns loaded, including joined ones, e.g. ["id", "author__name"].
+                                    None to load all columns.
+    """
+
+    __slots__ = ("select_related", "prefetch_related", "only")
+
+    def __init__(
+        self,
+        select_related: Optional[List[str]] = None,
+        prefetch_related: Optional[List[Tuple[str, Any, "QueryPlan"]]] = None,
+        only: Optional[List[str]] = None,
+    ) -> None:
+        self.select_related = select_related or []
+        self.prefetch_related = prefetch_related or []
+        self.only = only
+
+    def __bool__(self) -> bool:
+        return bool(self.select_related or self.prefetch_related or self.only)
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryPlan(select_related={self.select_related}, "
+            f"prefetch_related={self.prefetch_related}, only={self.only})"
+        )
+
+    def apply(
+        self,
+        queryset: QuerySet,  # type: ignore[type-arg]
+        prune_columns: bool = True,
+    ) -> QuerySet:  # type: ignore[type-arg]
+        """
+        Apply the plan to a queryset.
+
+        Prefetched relations get their own plan applied, e.g. a nested serializer's
+        foreign keys are joined in the prefetch query rather than fetched per object.
+        Relations the queryset already prefetches (e.g. `.prefetch_related("tags")`
+        in a view's queryset) are left as they are.
+
+        Args:
+            queryset (QuerySet): Queryset of the serialized model.
+            prune_columns (bool): Whether to apply `only`, i.e. only load the needed columns.
+
+        Returns:
+            QuerySet: The queryset with select_related/prefetch_related/only applied.
+        """
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            # prefetching a lookup again with another queryset raises a ValueError
+            prefetched = [
+                lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+                for lookup in queryset._prefetch_related_lookups  # type: ignore[attr-defined]
+            ]
+            queryset = queryset.prefetch_related(
+                *(
+                    Prefetch(
+                        lookup,
+                        queryset=plan.apply(
+                            model._default_manager.all(), prune_columns
+                        ),
+                    )
+                    for lookup, model, plan in self.prefetch_related
+                    if not any(
+                        existing == lookup or existing.startswith(lookup + "__")
+                        for existing in prefetched
+                    )
+                )
+            )
+        if prune_columns and self.only is not None:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+def get_query_plan(
+    serializer: serializers.BaseSerializer,
+    model: Optional[Type[models.Model]] = None,
+) -> QueryPlan:
+    """
+    Get the minimal select_related/prefetch_related/only to serialize a queryset
+    without N+1 queries nor loading unused columns.
+
+    Follows the serializer's active fields, so fields removed by `masked`,
+    `ref_serializer` or `fields` don't add joins, prefetches or columns:
+        - nested serializers and dotted sources ("author.name") through foreign
+          keys/one-to-ones are joined with select_related
+        - many=True nested serializers and to-many related fields are prefetched,
+          with the nested serializer's own plan applied to the prefetch, e.g.
+          PrimaryKeyRelatedField(many=True) or ReviewSerializer(many=True)
+        - primary key related fields on a foreign key only need the `_id` column
+        - only the model columns of the fields are loaded, e.g. a big text column
+          isn't for a reference serializer without it
+
+    Fields that don't map to a column (SerializerMethodField, properties, `source="*"`)
+    and related fields rendering the whole object (e.g. StringRelatedField) may read
+    anything, so all of that model's columns are loaded. For serializer methods/properties,
+    declare the columns they read in `Meta.required_columns` instead, e.g.
+        class Meta:
+            required_columns = ["first_name", "last_name"]
+
+    Args:
+        serializer (BaseSerializer): Serializer (or many=True ListSerializer) of the queryset.
+        model (Model, optional): Serialized model, defaults to the serializer's Meta.model.
+
+    Returns:
+        QueryPlan: The lookups, apply them with `plan.apply(queryset)`.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = cast(serializers.BaseSerializer, serializer.child)
+    if model is None:
+        model = serializer.Meta.model  # type: ignore[attr-defined]
+    plan = QueryPlan()
+    columns: Columns = {}
+    _collect_lookups(serializer, model, "", plan, columns)
+    # lookups reached through several fields are only needed once,
+    # prefetching the same lookup twice is an error
+    plan.select_related = list(dict.fromkeys(plan.select_related))
+    prefetch_related: Dict[str, Tuple[str, Any, QueryPlan]] = {}
+    for prefetch in plan.prefetch_related:
+        prefetch_related.setdefault(prefetch[0], prefetch)
+    plan.prefetch_related = list(prefetch_related.values())
+
+    plan.only = []
+    for prefix, (level_model, names) in columns.items():
+        if names is None:
+            names = [field.name for field in level_model._meta.concrete_fields]  # type: ignore[attr-defined]
+        else:
+            names = [level_model._meta.pk.name, *names]  # type: ignore[union-attr]
+        plan.only.extend(prefix + name for name in dict.fromkeys(names))
+    return plan
+
+
+@lru_cache(maxsize=None)
+def _get_relations(model: Type[models.Model]) -> Dict[str, Any]:
+    """Attribute name -> relation field of a model, forward and reverse."""
+    relations: Dict[str, Any] = {}
+    for field in model._meta.get_fields():
+        if not field.is_relation:
+            continue
+        if field.auto_created and not field.concrete:
+            # reverse relation, accessed through e.g. `book_set` or its related_name
+            relations[field.get_accessor_name()] = field  # type: ignore[index, union-attr]
+        else:
+            relations[field.name] = field
+    return relations
+
+
+@lru_cache(maxsize=None)
+def _get_columns(model: Type[models.Model]) -> Dict[str, str]:
+    """Attribute name (e.g. 'author_id') -> field name of a model's concrete fields."""
+    columns: Dict[str, str] = {}
+    for field in model._meta.concrete_fields:  # type: ignore[attr-defined]
+        columns[field.name] = field.name
+        columns[field.attname] = field.name
+    return columns
+
+
+def _add_columns(
+    columns: Columns,
+    prefix: str,
+    model: Type[models.Model],
+    names: Optional[List[str]],
+) -> None:
+    """Add columns needed at a lookup prefix, None for all of them."""
+    current = columns.get(prefix)
+    if current is None or names is None:
+        if current is None or current[1] is not None:
+            columns[prefix] = (model, None if names is None else list(names))
+        return
+    if current[1] is not None:
+        current[1].extend(names)
+
+
+def _collect_lookups(
+    serializer: serializers.BaseSerializer,
+    model: Type[models.Model],
+    prefix: str,
+    plan: QueryPlan,
+    columns: Columns,
+) -> None:
+    _add_columns(columns, prefix, model, [])
+    required_columns: Optional[List[str]] = getattr(
+        getattr(serializer, "Meta", None),
+        "required_columns",
+        getattr(serializer, "required_columns", None),
+    )
+    if required_columns is not None:
+        _add_columns(columns, prefix, model, required_columns)
+
+    for field in serializer.fields.values():  # type: ignore[attr-defined]
+        if field.write_only:
+            continue
+        if field.source == "*":
+            # nested serializer of the same instance
+            if isinstance(field, serializers.Serializer):
+                _collect_lookups(field, model, prefix, plan, columns)
+            elif required_columns is None:
+                # e.g. SerializerMethodField, may read any column
+                _add_columns(columns, prefix, model, None)
+            continue
+
+        current_model, path = model, prefix
+        attrs: List[str] = field.source_attrs
+        for index, attr in enumerate(attrs):
+            relation = _get_relations(current_model).get(attr)
+            if relation is None:
+                column = _get_columns(current_model).get(attr)
+                if column is not None:
+                    _add_columns(columns, path, current_model, [column])
+                elif path != prefix or required_columns is None:
+                    # property/method, may read any column
+                    _add_columns(columns, path, current_model, None)
+                break
+            lookup = path + attr
+            is_last = index == len(attrs) - 1
+            related_model = relation.related_model
+
+            if relation.one_to_many or relation.many_to_many:
+                if is_last and isinstance(field, serializers.ListSerializer):
+                    nested = get_query_plan(
+                        cast(serializers.BaseSerializer, field.child), related_model
+                    )
+                elif (
+                    is_last
+                    and isinstance(field, ManyRelatedField)
+                    and field.child_relation.use_pk_only_optimization()
+                ):
+                    nested = QueryPlan(only=[related_model._meta.pk.name])
+                else:
+                    nested = QueryPlan()
+                if relation.one_to_many and nested.only is not None:
+                    # the foreign key back to the prefetched objects
+                    nested.only.append(relation.field.name)
+                plan.prefetch_related.append((lookup, related_model, nested))
+                break
+            if related_model is None:
+                # e.g. a GenericForeignKey, can't be joined nor planned
+                _add_columns(columns, path, current_model, None)
+                break
+
+            # forward relations need their `_id` column, reverse ones the related
+            # object's foreign key back
+            if relation.concrete:
+                _add_columns(columns, path, current_model, [attr])
+            related_columns = [] if relation.concrete else [relation.field.name]
+
+            if is_last:
+                if isinstance(field, serializers.Serializer):
+                    plan.select_related.append(lookup)
+                    _add_columns(columns, lookup + "__", related_model, related_columns)
+                    _collect_lookups(field, related_model, lookup + "__", plan, columns)
+                # related fields that only need the pk read the `_id` column,
+                # others (e.g. StringRelatedField) need the related object
+                elif not (
+                    isinstance(field, RelatedField)
+                    and field.use_pk_only_optimization()
+                    and relation.concrete
+                ):
+                    plan.select_related.append(lookup)
+                    _add_columns(columns, lookup + "__", related_model, None)
+                break
+            plan.select_related.append(lookup)
+            _add_columns(columns, lookup + "__", related_model, related_columns)
+            current_model, path = related_model, lookup + "__"
@@ -0,0 +1,124 @@
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Optional, Union
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponseBase
+
+from .conf import get_toolkit_setting
+from .metrics import add_metrics_hook
+
+"""
+============================================================================================ #
+SERVER TIMING ============================================================================== #
+============================================================================================ #
+"""
+
+# metrics event -> Server-Timing metric name
+SERVER_TIMING_STAGES: Dict[str, str] = {
+    "serialize": "serialize",
+    "format": "envelope",
+    "render": "render",
+}
+
+# stage -> total seconds of the current request, None outside ServerTimingMiddleware
+_SERVER_TIMINGS: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "dans_api_server_timings", default=None
+)
+
+
+def server_timing_hook(event: str, fields: Dict[str, object]) -> None:
+    """Metrics hook adding stage durations to the current request's timings."""
+    timings = _SERVER_TIMINGS.get()
+    if timings is None:
+        return
+    stage = SERVER_TIMING_STAGES.get(event)
+    if stage is not None:
+        duration = float(fields["duration"])  # type: ignore[arg-type]
+        timings[stage] = timings.get(stage, 0.0) + duration
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """
+    Format stage durations as a `Server-Timing` header value.
+
+    Args:
+        timings (dict): Stage name -> duration in seconds.
+
+    Returns:
+        str: e.g. "serialize;dur=1.234, envelope;dur=0.012, render;dur=0.321" (milliseconds).
+    """
+    return ", ".join(
+        f"{stage};dur={duration * 1000:.3f}" for stage, duration in timings.items()
+    )
+
+
+GetResponse = Callable[
+    [HttpRequest], Union[HttpResponseBase, Awaitable[HttpResponseBase]]
+]
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a `Server-Timing` header with the time spent in each toolkit stage:
+        - serialize: BaseSerializer.to_representation (top level instances)
+        - envelope:  building the envelope in ApiResponseHandler (ApiResponse.dict)
+        - render:    ApiResponseRenderer.render
+    Stages that didn't run, e.g. no BaseSerializer used, are left out.
+
+    Enabled by the SERVER_TIMING setting, otherwise Django drops the middleware:
+        MIDDLEWARE = [
+            "django_dans_api_toolkit.server_timing.ServerTimingMiddleware",
+            ...
+        ]
+        DANS_API_TOOLKIT = {"SERVER_TIMING": True}
+
+    NOTE: timings are visible to clients, only enable it where that's acceptable.
+    Streamed bodies are rendered after the headers are sent and aren't included.
+
+    :param callable get_response: Next middleware or view, sync or async.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: GetResponse) -> None:
+        if not get_toolkit_setting("SERVER_TIMING"):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        add_metrics_hook(server_timing_hook)
+
+    def __call__(
+        self, request: HttpRequest
+    ) -> Union[HttpResponseBase, Awaitable[HttpResponseBase]]:
+        if self.async_mode:
+            return self.__acall__(request)
+        # the dict is shared, so stages timed in copied contexts are recorded too
+        timings: Dict[str, float] = {}
+        token = _SERVER_TIMINGS.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _SERVER_TIMINGS.reset(token)
+        self._add_header(response, timings)  # type: ignore[arg-type]
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        timings: Dict[str, float] = {}
+        token = _SERVER_TIMINGS.set(timings)
+        try:
+            response: HttpResponseBase = await self.get_response(request)  # type: ignore[misc]
+        finally:
+            _SERVER_TIMINGS.reset(token)
+        self._add_header(response, timings)
+        return response
+
+    @staticmethod
+    def _add_header(response: HttpResponseBase, timings: Dict[str, float]) -> None:
+        if not timings:
+            return
+        value = format_server_timing(timings)
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {value}" if existing else value
@@ -0,0 +1,93 @@
+from typing import Any, Dict, NoReturn, Optional, Tuple
+
+from .api_response import ApiResponse, ApiResponseData
+from .caches import LruCache
+
+"""
+============================================================================================ #
+STATIC RESPONSES =========================================================================== #
+============================================================================================ #
+"""
+
+
+class StaticApiResponseData(ApiResponseData):
+    """
+    Immutable envelope with its JSON already rendered.
+
+    Shared between responses, so it can't be modified - ApiResponseRenderer
+    serves `rendered` directly instead of encoding the envelope again.
+
+    Renderers with other JSON settings (e.g. `ensure_ascii`) than the ones `rendered`
+    was rendered with render the envelope as usual, see ApiResponseRenderer.get_render_key.
+
+    :param dict data:           Envelope, i.e. ApiResponse.dict().
+    :param bytes rendered:      Compact JSON of the envelope.
+    :param tuple render_key:    Renderer settings `rendered` was rendered with.
+    """
+
+    __slots__ = ("rendered", "render_key")
+
+    def __init__(
+        self,
+        data: Dict[str, Optional[object]],
+        rendered: bytes,
+        render_key: Optional[Tuple[Any, ...]] = None,
+    ) -> None:
+        super().__init__(data)
+        self.rendered = rendered
+        self.render_key = render_key
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(f"{type(self).__name__} is immutable")
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable  # type: ignore[assignment]
+    clear = _immutable
+    pop = _immutable  # type: ignore[assignment]
+    popitem = _immutable
+    setdefault = _immutable  # type: ignore[assignment]
+    update = _immutable  # type: ignore[assignment]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # the default dict pickling sets items one by one
+        return type(self), (dict(self), self.rendered, self.render_key)
+
+
+# (status, message, JSON backend) -> pre-rendered error envelope, see get_static_error_data
+_STATIC_ERRORS: LruCache[Tuple[int, str, type], StaticApiResponseData] = LruCache(
+    max_size=256
+)
+
+
+def get_static_error_data(status: int, message: str) -> StaticApiResponseData:
+    """
+    Get the pre-rendered envelope of an error response with only a status and message.
+
+    i.e. what `ApiResponseHandler.response_error(status=status)` returns for a handler
+    with `message_error=message`. Built and rendered once per (status, message) and
+    configured JSON backend, with the default ApiResponseRenderer settings.
+
+    Args:
+        status (int): HTTP status of the response.
+        message (str): Message of the response.
+
+    Returns:
+        StaticApiResponseData: Shared, immutable envelope - use it as `Response.data` as-is.
+    """
+    # local imports to avoid circular imports, both import the handler
+    from .api_response_renderer import ApiResponseRenderer
+    from .json_backends import get_json_backend
+
+    key = (status, message, type(get_json_backend()))
+    data = _STATIC_ERRORS.get(key)
+    if data is None:
+
+        renderer = ApiResponseRenderer()
+        envelope = ApiResponse(message=message, status=status).dict()
+        # rendered outside of a response, without the renderer's metrics event
+        data = StaticApiResponseData(
+            envelope, renderer._render(envelope, None, None), renderer.get_render_key()
+        )
+        _STATIC_ERRORS.set(key, data)
+    return data
@@ -1,4 +1,5 @@
 from django.db import models
+from rest_framework import serializers
 
 from ...serializers.base import BaseSerializer
 
@@ -16,3 +17,74 @@ class SampleSerializer(BaseSerializer):
         fields = "__all__"
         ref_fields = ["field1", "field2"]
         masked_fields = ["field3"]
+
+
+class Publisher(models.Model):
+    name = models.CharField(max_length=100)  # type: ignore[var-annotated]
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=100)  # type: ignore[var-annotated]
+    publisher = models.ForeignKey(  # type: ignore[var-annotated]
+        Publisher, null=True, on_delete=models.SET_NULL
+    )
+
+    def __str__(self) -> str:
+        return str(self.name)
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=100)  # type: ignore[var-annotated]
+
+    def __str__(self) -> str:
+        return str(self.name)
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=100)  # type: ignore[var-annotated]
+    summary = models.TextField(default="")  # type: ignore[var-annotated]
+    author = models.ForeignKey(  # type: ignore[var-annotated]
+        Author, related_name="books", on_delete=models.CASCADE
+    )
+    publisher = models.ForeignKey(  # type: ignore[var-annotated]
+        Publisher, null=True, on_delete=models.SET_NULL
+    )
+    tags = models.ManyToManyField(Tag)  # type: ignore[var-annotated]
+
+
+class Review(models.Model):
+    book = models.ForeignKey(  # type: ignore[var-annotated]
+        Book, related_name="reviews", on_delete=models.CASCADE
+    )
+    reviewer = models.ForeignKey(  # type: ignore[var-annotated]
+        Author, on_delete=models.CASCADE
+    )
+    text = models.TextField()  # type: ignore[var-annotated]
+
+
+class AuthorSerializer(BaseSerializer):
+    publisher_name = serializers.CharField(source="publisher.name", default=None)
+
+    class Meta:
+        model = Author
+        fields = ["id", "name", "publisher_name"]
+
+
+class ReviewSerializer(BaseSerializer):
+    reviewer = serializers.StringRelatedField()
+
+    class Meta:
+        model = Review
+        fields = ["id", "text", "reviewer"]
+
+
+class BookSerializer(BaseSerializer):
+    author = AuthorSerializer()
+    tags = serializers.StringRelatedField(many=True)
+    reviews = ReviewSerializer(many=True)
+
+    class Meta:
+        model = Book
+        fields = ["id", "title", "summary", "author", "publisher", "tags", "reviews"]
+        ref_fields = ["summary", "author", "tags", "reviews"]
+        masked_fields = ["reviews"]
@@ -1,7 +1,18 @@
+from typing import Any, Dict
 from django.test import TestCase
+
+from ...serializers.base import _FIELD_PLANS, _FIELDS_FIELD_PLANS
 from .models import SampleModel, SampleSerializer
 
 
+class UpdateReadOnlySerializer(SampleSerializer):
+    def get_extra_kwargs(self) -> Dict[str, Any]:
+        extra_kwargs = super().get_extra_kwargs()
+        if self.instance is not None:
+            extra_kwargs["field1"] = {"read_only": True}
+        return extra_kwargs
+
+
 class BaseSerializerTestCase(TestCase):
 
     def setUp(self) -> None:
@@ -132,3 +143,71 @@ class BaseSerializerTestCase(TestCase):
         self.assertNotIn("field1", data)
         self.assertNotIn("field2", data)
         self.assertNotIn("field4", data)
+
+    def test_field_plans_are_cached_per_variant(self) -> None:
+        _FIELD_PLANS.clear()
+        _FIELDS_FIELD_PLANS.clear()
+        SampleSerializer(self.instance).fields
+        SampleSerializer(self.instance).fields
+        SampleSerializer(self.instance, ref_serializer=True).fields
+        SampleSerializer(self.instance, fields=["field1", "field3"]).fields
+        SampleSerializer(self.instance, fields=["field3", "field1"]).fields
+        self.assertEqual(
+            {
+                (masked, ref_serializer, fields)
+                for (_, masked, ref_serializer, fields) in _FIELD_PLANS
+            },
+            {(True, False, None), (True, True, None)},
+        )
+        # `fields` variants are cached apart
+        self.assertEqual(
+            list(_FIELDS_FIELD_PLANS),
+            [(SampleSerializer, None, None, frozenset(["field1", "field3"]))],
+        )
+        self.assertEqual(
+            list(_FIELD_PLANS[(SampleSerializer, True, True, None)]), ["id", "field4"]
+        )
+
+    def test_cached_fields_are_not_shared(self) -> None:
+        first = SampleSerializer(self.instance)
+        second = SampleSerializer(self.instance)
+        self.assertIsNot(first.fields["field1"], second.fields["field1"])
+        self.assertIs(first.fields["field1"].parent, first)
+
+        first.fields.pop("field1")
+        self.assertIn("field1", second.fields)
+        self.assertIn("field1", SampleSerializer(self.instance).data)
+
+    def test_fields_order_is_kept(self) -> None:
+        serializer = SampleSerializer(self.instance, fields=["field4", "id"])
+        self.assertEqual(list(serializer.data), ["id", "field4"])
+
+    def test_field_hooks_overrides_not_cached(self) -> None:
+        _FIELD_PLANS.clear()
+        for _ in range(2):
+            self.assertFalse(UpdateReadOnlySerializer().fields["field1"].read_only)
+            self.assertTrue(
+                UpdateReadOnlySerializer(self.instance).fields["field1"].read_only
+            )
+        self.assertEqual(len(_FIELD_PLANS), 0)
+        self.assertTrue(SampleSerializer().cache_fields)
+        self.assertFalse(UpdateReadOnlySerializer().cache_fields)
+
+    def test_cache_fields_meta(self) -> None:
+        class CachedSerializer(UpdateReadOnlySerializer):
+            class Meta(SampleSerializer.Meta):
+                cache_fields = True
+
+        class UncachedSerializer(SampleSerializer):
+            class Meta(SampleSerializer.Meta):
+                cache_fields = False
+
+        _FIELD_PLANS.clear()
+        self.assertTrue(CachedSerializer(self.instance).fields["field1"].read_only)
+        # built for the first instance
+        self.assertTrue(CachedSerializer().fields["field1"].read_only)
+        UncachedSerializer(self.instance).fields
+        self.assertEqual(
+            [serializer_class for (serializer_class, *_) in _FIELD_PLANS],
+            [CachedSerializer],
+        )
@@ -0,0 +1,118 @@
+from typing import Any, Dict, List
+from django.test import TestCase
+
+from ...serializers.compiled import _COMPILED, compile_to_representation
+from ..utils import ModelTableTestCase
+from .models import (
+    Author,
+    Book,
+    BookSerializer,
+    Publisher,
+    Review,
+    SampleModel,
+    SampleSerializer,
+    Tag,
+)
+
+
+class CompiledSampleSerializer(SampleSerializer):
+    class Meta(SampleSerializer.Meta):
+        compiled = True
+
+
+class CompiledSerializerTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.instance = SampleModel(
+            id=1, field1="value1", field2="value2", field3="value3", field4=None
+        )
+
+    def assertParity(self, **kwargs: Any) -> Any:
+        expected = SampleSerializer(self.instance, **kwargs).data
+        compiled = SampleSerializer(self.instance, compiled=True, **kwargs).data
+        self.assertEqual(compiled, expected)
+        self.assertEqual(list(compiled), list(expected))
+        return compiled
+
+    def test_variants_parity(self) -> None:
+        self.assertEqual(
+            self.assertParity(),
+            {"id": 1, "field1": "value1", "field2": "value2", "field4": None},
+        )
+        self.assertParity(masked=False)
+        self.assertParity(ref_serializer=True)
+        self.assertParity(fields=["field3", "field1"])
+        self.assertParity(fields=[])
+
+    def test_meta_option(self) -> None:
+        serializer = CompiledSampleSerializer(self.instance)
+        self.assertTrue(serializer.compiled)
+        self.assertEqual(serializer.data, SampleSerializer(self.instance).data)
+        self.assertFalse(CompiledSampleSerializer(compiled=False).compiled)
+
+    def test_many(self) -> None:
+        instances = [
+            SampleModel(id=i, field1="a", field2="b", field3="c", field4="d")
+            for i in range(3)
+        ]
+        self.assertEqual(
+            CompiledSampleSerializer(instances, many=True).data,
+            SampleSerializer(instances, many=True).data,
+        )
+
+    def test_simple_fields_are_inlined(self) -> None:
+        _COMPILED.clear()
+        compile_to_representation(SampleSerializer(masked=False))
+        compile_to_representation(SampleSerializer(masked=False))
+        (source,) = _COMPILED
+        self.assertIn("ret['id'] = None if value is None else int(value)\n", source)
+        self.assertIn("ret['field1'] = None if value is None else str(value)\n", source)
+        self.assertNotIn("get_attribute", source)
+
+    def test_non_model_instances_are_not_compiled(self) -> None:
+        data = {"id": 1, "field1": "a", "field2": "b", "field3": "c", "field4": "d"}
+        self.assertEqual(
+            CompiledSampleSerializer(data).data, SampleSerializer(data).data
+        )
+
+
+class CompiledRelationsTestCase(ModelTableTestCase):
+    models = [Publisher, Author, Tag, Book, Review]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        publisher = Publisher.objects.create(name="Publisher")
+        author = Author.objects.create(name="Author", publisher=publisher)
+        tag = Tag.objects.create(name="Tag")
+        for i in range(3):
+            book = Book.objects.create(
+                title=f"Book {i}",
+                author=author,
+                # None for the pk only field
+                publisher=publisher if i else None,
+            )
+            book.tags.set([tag])
+            Review.objects.create(book=book, reviewer=author, text="Review.")
+
+    def test_relations_parity(self) -> None:
+        variants: List[Dict[str, bool]] = [
+            {},
+            {"masked": False},
+            {"ref_serializer": True},
+        ]
+        for kwargs in variants:
+            books = list(Book.objects.order_by("id"))
+            with self.subTest(**kwargs):
+                self.assertEqual(
+                    BookSerializer(books, many=True, compiled=True, **kwargs).data,
+                    BookSerializer(books, many=True, **kwargs).data,
+                )
+
+    def test_fallback_fields(self) -> None:
+        serializer = BookSerializer(masked=False, compiled=True)
+        bound = compile_to_representation(serializer).__code__.co_freevars
+        # nested serializers and StringRelatedField use get_attribute, 'publisher' is inlined
+        self.assertEqual(
+            sorted(name for name in bound if name.startswith("get_attribute")),
+            ["get_attribute_3", "get_attribute_5", "get_attribute_6"],
+        )
@@ -0,0 +1,113 @@
+from typing import Any, List, Tuple
+from django.db.models import Prefetch
+from django.test import TestCase
+from rest_framework import serializers
+
+from ...serializers.query_plan import QueryPlan, get_query_plan
+from .models import Book, BookSerializer, Review, Tag
+
+
+class QueryPlanTestCase(TestCase):
+
+    def test_default_plan(self) -> None:
+        plan = get_query_plan(BookSerializer())
+        self.assertEqual(plan.select_related, ["author", "author__publisher"])
+        # reviews are masked
+        self.assertEqual(
+            [(lookup, model) for lookup, model, _ in plan.prefetch_related],
+            [("tags", Tag)],
+        )
+
+    def test_nested_many_plan(self) -> None:
+        plan = get_query_plan(BookSerializer(masked=False))
+        lookup, model, nested = plan.prefetch_related[1]
+        self.assertEqual((lookup, model), ("reviews", Review))
+        self.assertEqual(nested.select_related, ["reviewer"])
+        self.assertEqual(nested.prefetch_related, [])
+
+    def test_many_serializer(self) -> None:
+        plan = get_query_plan(BookSerializer([], many=True))
+        self.assertEqual(plan.select_related, ["author", "author__publisher"])
+
+    def test_pk_only_fields_are_not_joined(self) -> None:
+        # 'publisher' is a PrimaryKeyRelatedField, reading 'publisher_id' is enough
+        plan = get_query_plan(BookSerializer(ref_serializer=True))
+        self.assertEqual((plan.select_related, plan.prefetch_related), ([], []))
+        self.assertEqual(plan.only, ["id", "title", "publisher"])
+        plan = get_query_plan(BookSerializer(fields=["id", "publisher"]))
+        self.assertEqual((plan.select_related, plan.prefetch_related), ([], []))
+
+    def test_only_columns(self) -> None:
+        plan = get_query_plan(BookSerializer(masked=False))
+        self.assertEqual(
+            plan.only,
+            [
+                "id",
+                "title",
+                "summary",
+                "author",
+                "publisher",
+                "author__id",
+                "author__name",
+                "author__publisher",
+                "author__publisher__id",
+                "author__publisher__name",
+            ],
+        )
+        # tags are rendered with str(), reviews need their foreign key to the book
+        self.assertIsNone(plan.prefetch_related[0][2].only)
+        reviews = plan.prefetch_related[1][2]
+        self.assertEqual(
+            reviews.only,
+            ["id", "text", "reviewer", "reviewer__id", "reviewer__name"]
+            + ["reviewer__publisher", "book"],
+        )
+
+    def test_unknown_columns_load_everything(self) -> None:
+        class TitleSerializer(BookSerializer):
+            upper_title = serializers.SerializerMethodField()
+
+            class Meta(BookSerializer.Meta):
+                fields = ["id", "upper_title"]
+
+            def get_upper_title(self, book: Book) -> str:
+                return str(book.title).upper()
+
+        self.assertEqual(
+            get_query_plan(TitleSerializer()).only,
+            ["id", "title", "summary", "author", "publisher"],
+        )
+
+        class RequiredColumnsSerializer(TitleSerializer):
+            class Meta(TitleSerializer.Meta):
+                required_columns = ["title"]
+
+        self.assertEqual(
+            get_query_plan(RequiredColumnsSerializer()).only, ["id", "title"]
+        )
+        self.assertEqual(
+            RequiredColumnsSerializer().get_model_columns(), ["id", "title"]
+        )
+
+    def test_empty_plan_apply(self) -> None:
+        queryset = Tag.objects.all()
+        self.assertIs(QueryPlan().apply(queryset), queryset)
+
+    def test_apply_keeps_existing_prefetches(self) -> None:
+        plan = get_query_plan(BookSerializer(masked=False))
+        tags = Prefetch("tags", queryset=Tag.objects.order_by("-name"))
+        cases: List[Tuple[List[Any], List[Any]]] = [
+            (["tags"], ["tags", "reviews"]),
+            ([tags], [tags, "reviews"]),
+            (["reviews__reviewer"], ["reviews__reviewer", "tags"]),
+        ]
+        for lookups, expected in cases:
+            queryset = plan.apply(Book.objects.prefetch_related(*lookups))
+            # lookups added by the plan are Prefetch objects
+            self.assertEqual(
+                [
+                    lookup.prefetch_to if lookup not in lookups else lookup
+                    for lookup in queryset._prefetch_related_lookups  # type: ignore[attr-defined]
+                ],
+                expected,
+            )
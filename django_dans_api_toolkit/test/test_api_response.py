@@ -1,5 +1,6 @@
+import tracemalloc
 from django.test import TestCase
-from ..api_response import ApiResponse
+from ..api_response import ApiResponse, ApiResponseData, RawJson
 from typing import Any
 
 
@@ -104,3 +105,84 @@ class ApiResponseTestCase(TestCase):
         }
 
         self.assertEqual(response_dict, expected_dict)
+
+    def test_dict_method_with_raw_json_results(self) -> None:
+        results = RawJson(b'[{"id":1}]')
+        response = ApiResponse(status=200, results=results)
+        response_dict = response.dict()
+        self.assertIs(response_dict["results"], results)
+        self.assertNotIn("count", response_dict)
+
+    def test_raw_json_from_str(self) -> None:
+        self.assertEqual(RawJson('{"id":1}').content, b'{"id":1}')
+        self.assertEqual(RawJson('{"id":1}'), RawJson(b'{"id":1}'))
+
+    def test_dict_method_returns_api_response_data(self) -> None:
+        response_dict = ApiResponse(status=200).dict()
+        self.assertIsInstance(response_dict, ApiResponseData)
+        self.assertIsInstance(response_dict, dict)
+
+    def test_uses_slots(self) -> None:
+        response = ApiResponse(status=200)
+        self.assertFalse(hasattr(response, "__dict__"))
+        with self.assertRaises(AttributeError):
+            response.unknown = "value"  # type: ignore[attr-defined]
+
+    def test_bounded_allocations_per_envelope(self) -> None:
+        # the ApiResponse, its kwargs dict, the envelope dict (+ its keys table)
+        # and the default error_fields / non_field_errors
+        max_blocks_per_envelope = 6
+        count = 1000
+        results: dict[str, Any] = {"key": "value"}
+        responses: list[Any] = [None] * count
+        envelopes: list[Any] = [None] * count
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            for i in range(count):
+                response = ApiResponse(status=200, message="Success", results=results)
+                responses[i] = response
+                envelopes[i] = response.dict()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+        self.assertLessEqual(blocks / count, max_blocks_per_envelope)
+
+    def test_dict_method_with_paginated_results(self) -> None:
+        results: dict[str, Any] = {"count": 1, "next": None, "results": [1]}
+        response_dict = ApiResponse(status=200, results=results).dict()
+        self.assertEqual(
+            list(response_dict.keys()),
+            [
+                "status",
+                "message",
+                "count",
+                "next",
+                "previous",
+                "results",
+                "error_fields",
+                "non_field_errors",
+            ],
+        )
+        self.assertIsNone(response_dict["previous"])
+        self.assertEqual(response_dict["results"], [1])
+
+    def test_dict_method_with_pagination_keys(self) -> None:
+        results: dict[str, Any] = {"next": "cursor", "previous": None, "results": [1]}
+        response_dict = ApiResponse(
+            status=200, results=results, pagination_keys=("next", "previous")
+        ).dict()
+        self.assertNotIn("count", response_dict)
+        self.assertEqual(response_dict["next"], "cursor")
+        self.assertEqual(response_dict["results"], [1])
+
+    def test_dict_method_with_pagination_keys_and_unpaginated_results(self) -> None:
+        results: dict[str, Any] = {"count": 3, "next": "x"}
+        response_dict = ApiResponse(
+            status=200, results=results, pagination_keys=("count", "next", "previous")
+        ).dict()
+        self.assertEqual(response_dict["results"], results)
+        self.assertNotIn("count", response_dict)
@@ -2,13 +2,26 @@
 # This file uses # type: ignore due to DRF's Response.data not being typed as a dict,
 # which causes mypy errors under strict settings. All accesses to response.data are safe in these tests.
 # Remove this ignore if/when DRF types Response.data as a dict or a suitable stub is used.
-from django.test import TestCase
+from typing import Any, AsyncIterator, Dict, List
+import asyncio
+import json
+import logging
+import threading
+from django.http import HttpRequest, StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from unittest.mock import MagicMock
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from .. import api_response_handler
+from ..api_response import RawJson
 from ..api_response_handler import ApiResponseHandler
+from ..api_response_renderer import ApiResponseRenderer
+from ..log_sampling import LogSampler
 
 
 class ApiResponseHandlerTestCase(TestCase):
@@ -132,7 +145,10 @@ class ApiResponseHandlerTestCase(TestCase):
             call_args[1].get("exc_info"),
             "exc_info should be True when logging exceptions",
         )
-        self.assertIn("An error occurred - Test exception message", call_args[0][0])
+        self.assertIn(
+            "An error occurred - Test exception message",
+            call_args[0][0] % call_args[0][1:],
+        )
 
     def test_response_error_logging_with_string_error_no_stack_trace(self) -> None:
         """Test that string errors don't get logged with exc_info=True."""
@@ -149,7 +165,10 @@ class ApiResponseHandlerTestCase(TestCase):
         self.assertIsNone(
             call_args[1].get("exc_info"), "exc_info should not be set for string errors"
         )
-        self.assertIn("An error occurred - String error message", call_args[0][0])
+        self.assertIn(
+            "An error occurred - String error message",
+            call_args[0][0] % call_args[0][1:],
+        )
 
     def test_response_error_logging_exception_only_with_stack_trace(self) -> None:
         """Test that when only an exception is passed (no custom message), it gets logged with stack trace."""
@@ -167,7 +186,7 @@ class ApiResponseHandlerTestCase(TestCase):
             call_args[1].get("exc_info"),
             "exc_info should be True when logging exceptions",
         )
-        self.assertIn("Runtime error occurred", call_args[0][0])
+        self.assertIn("Runtime error occurred", call_args[0][0] % call_args[0][1:])
 
     def test_response_error_logging_disabled_no_calls(self) -> None:
         """Test that when print_log is False, no logging occurs."""
@@ -181,6 +200,43 @@ class ApiResponseHandlerTestCase(TestCase):
         # Verify that logger.error was not called
         mock_logger.error.assert_not_called()
 
+    def test_response_error_logging_is_lazy(self) -> None:
+        """Test that the error is never stringified when logging is disabled or filtered."""
+
+        class CountingError:
+            str_calls = 0
+
+            def __str__(self) -> str:
+                CountingError.str_calls += 1
+                return "counted"
+
+        logger = logging.getLogger("django_dans_api_toolkit.test.lazy")
+        logger.setLevel(logging.CRITICAL)
+        handler = ApiResponseHandler(logger=logger)
+
+        handler.response_error(error=CountingError(), message="An error occurred")
+        handler.response_error(error=CountingError())
+        handler.response_error(error=CountingError(), print_log=False)
+        self.assertEqual(CountingError.str_calls, 0)
+
+        logger.setLevel(logging.ERROR)
+        with self.assertLogs(logger, level="ERROR") as cm:
+            handler.response_error(error=CountingError(), message="An error occurred")
+        self.assertEqual(CountingError.str_calls, 1)
+        self.assertIn("An error occurred - counted", cm.output[0])
+
+    def test_response_error_logging_extra_fields(self) -> None:
+        handler = ApiResponseHandler()
+        error = ValueError("Bad value")
+        with self.assertLogs("django_dans_api_toolkit", level="ERROR") as cm:
+            handler.response_error(error=error, message="Error updating.", status=409)
+        record = cm.records[0]
+        self.assertEqual(record.getMessage(), "Error updating. - Bad value")
+        self.assertEqual(record.response_message, "Error updating.")
+        self.assertIs(record.response_error, error)
+        self.assertEqual(record.response_error_type, "ValueError")
+        self.assertEqual(record.response_status, 409)
+
     def test_custom_message_priority_over_field_errors(self) -> None:
         """Test that custom message takes priority over error_fields when both are provided."""
         custom_message = "Custom error message for user"
@@ -512,3 +568,289 @@ class ApiResponseHandlerTestCase(TestCase):
         response = self.api_response_handler.response_error()
         self.assertEqual(response.data["error_fields"], {})
         self.assertEqual(response.data["non_field_errors"], [])
+
+    def test_response_success_stream(self) -> None:
+        rows = ({"id": i} for i in range(3))
+        response = self.api_response_handler.response_success_stream(results=rows)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content)),
+            {
+                "status": 200,
+                "message": self.api_response_handler.message_success,
+                "results": [{"id": 0}, {"id": 1}, {"id": 2}],
+                "error_fields": {},
+                "non_field_errors": [],
+            },
+        )
+
+    def test_response_success_stream_paginated(self) -> None:
+        results = {
+            "count": 2,
+            "next": "http://testserver/?page=2",
+            "previous": None,
+            "results": iter([{"id": 1}, {"id": 2}]),
+        }
+        response = self.api_response_handler.response_success_stream(
+            message="Exported.", results=results
+        )
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["message"], "Exported.")
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(data["next"], "http://testserver/?page=2")
+        self.assertEqual(data["results"], [{"id": 1}, {"id": 2}])
+
+    def test_response_success_with_raw_json_results(self) -> None:
+        results = RawJson(b'[{"id":1}]')
+        response = self.api_response_handler.response_success(results=results)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertIs(response.data["results"], results)
+        rendered = ApiResponseRenderer().render(
+            response.data, renderer_context={"response": response}
+        )
+        self.assertIn(b'"results":[{"id":1}]', rendered)
+
+    def test_response_success_with_cursor_paginator(self) -> None:
+        results = {
+            "next": "http://testserver/?cursor=abc",
+            "previous": None,
+            "results": [1],
+        }
+        response = self.api_response_handler.response_success(
+            results=results, paginator=CursorPagination()
+        )
+        self.assertNotIn("count", response.data)
+        self.assertEqual(response.data["next"], "http://testserver/?cursor=abc")
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual(response.data["results"], [1])
+
+    def test_response_success_with_page_number_paginator(self) -> None:
+        results = {"count": 1, "results": [1]}
+        response = self.api_response_handler.response_success(
+            results=results, paginator=PageNumberPagination()
+        )
+        self.assertEqual(response.data["count"], 1)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_response_error_log_sampling(self) -> None:
+        mock_logger = MagicMock()
+        handler = ApiResponseHandler(
+            logger=mock_logger,
+            log_sampler=LogSampler(max_full=2, summary_interval=0),
+        )
+        for i in range(4):
+            handler.response_error(
+                error=ValueError(f"Bad value {i}"), message="Error updating."
+            )
+        calls = mock_logger.error.call_args_list
+        self.assertEqual(len(calls), 4)
+        # first two in full, then summaries without stack traces
+        self.assertTrue(calls[0][1].get("exc_info"))
+        self.assertTrue(calls[1][1].get("exc_info"))
+        self.assertIn("repeated 1 more times", calls[2][0][0] % calls[2][0][1:])
+        self.assertIsNone(calls[2][1].get("exc_info"))
+        self.assertIsNone(calls[3][1].get("stack_info"))
+
+    def test_response_error_log_sampling_per_call_site(self) -> None:
+        mock_logger = MagicMock()
+        handler = ApiResponseHandler(
+            logger=mock_logger,
+            log_sampler=LogSampler(max_full=1, summary_interval=60),
+        )
+        handler.response_error(error=ValueError("Bad value"), message="Error.")
+        handler.response_error(error=ValueError("Bad value"), message="Error.")
+        handler.response_error(error=KeyError("key"), message="Error.")
+        self.assertEqual(mock_logger.error.call_count, 3)
+
+    def test_log_sampling_signature_is_not_formatted(self) -> None:
+        formatted = []
+
+        class Error(Exception):
+            def __str__(self) -> str:
+                formatted.append(self)
+                return "Formatted."
+
+        mock_logger = MagicMock()
+        handler = ApiResponseHandler(
+            logger=mock_logger,
+            log_sampler=LogSampler(max_full=1, summary_interval=60),
+        )
+        for _ in range(3):
+            error = Error()
+            handler._handle_logging("%s", True, error, args=(error,))
+        self.assertEqual(formatted, [])
+        self.assertEqual(mock_logger.error.call_count, 1)
+
+        # mismatched args are left to logging's own error handling
+        handler._handle_logging("%s - %s", True, args=("one",))
+        self.assertEqual(mock_logger.error.call_count, 2)
+
+        # string errors are grouped by their text, numbers ignored
+        for i in range(3):
+            handler.response_error(error=f"Item {i} is invalid.")
+        handler.response_error(error="Other error.")
+        self.assertEqual(mock_logger.error.call_count, 4)
+
+    @override_settings(DANS_API_TOOLKIT={"LOG_SAMPLING": {"MAX_FULL": 3}})
+    def test_log_sampling_setting(self) -> None:
+        handler = ApiResponseHandler()
+        self.assertIsInstance(handler.log_sampler, LogSampler)
+        self.assertEqual(handler.log_sampler.max_full, 3)
+
+    @override_settings(
+        DANS_API_TOOLKIT={"LOG_SAMPLING": {"MAX_FULL": 1, "SUMMARY_INTERVAL": 60}}
+    )
+    def test_log_sampling_setting_spans_handlers(self) -> None:
+        # views and the exception handler create a handler per request
+        mock_logger = MagicMock()
+        handlers = [ApiResponseHandler(logger=mock_logger) for _ in range(2)]
+        self.assertIs(handlers[0].log_sampler, handlers[1].log_sampler)
+        self.addCleanup(handlers[0].log_sampler.reset)
+        for handler in handlers:
+            handler.response_error(error=ValueError("Bad value"), message="Error.")
+        self.assertEqual(mock_logger.error.call_count, 1)
+
+    def test_log_sampling_disabled_by_default(self) -> None:
+        self.assertIsNone(ApiResponseHandler().log_sampler)
+
+
+#
+# ASYNC VIEWS, for the in-process ASGI client (AsyncClient)
+#
+class RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+        self.threads: List[int] = []
+        self.done = threading.Event()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+        self.threads.append(threading.get_ident())
+        self.done.set()
+
+
+async_logger = logging.getLogger("django_dans_api_toolkit.test.async")
+async_logger.propagate = False
+async_handler = ApiResponseHandler(logger=async_logger)
+view_threads: List[int] = []
+
+
+async def rows() -> AsyncIterator[object]:
+    for i in range(3):
+        yield {"id": i}
+
+
+async def async_success_view(request: HttpRequest) -> Response:
+    return await async_handler.aresponse_success(results=rows())
+
+
+async def async_error_view(request: HttpRequest) -> Response:
+    view_threads.append(threading.get_ident())
+    return await async_handler.aresponse_error(
+        error=ValueError("Bad value"), message="Error updating.", status=409
+    )
+
+
+def async_stream_view(request: HttpRequest) -> StreamingHttpResponse:
+    return async_handler.aresponse_success_stream(results=rows())
+
+
+urlpatterns = [
+    path("async/success/", async_success_view),
+    path("async/error/", async_error_view),
+    path("async/stream/", async_stream_view),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncApiResponseHandlerTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.log_handler = RecordingHandler()
+        async_logger.addHandler(self.log_handler)
+
+    def tearDown(self) -> None:
+        async_logger.removeHandler(self.log_handler)
+
+    async def test_aresponse_success_async_iterable(self) -> None:
+        response = await self.async_client.get("/async/success/")
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "status": HTTP_200_OK,
+                "message": async_handler.message_success,
+                "results": [{"id": 0}, {"id": 1}, {"id": 2}],
+                "error_fields": {},
+                "non_field_errors": [],
+            },
+        )
+
+    async def test_aresponse_success_stream(self) -> None:
+        response = await self.async_client.get("/async/stream/")
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(
+            json.loads(content)["results"], [{"id": 0}, {"id": 1}, {"id": 2}]
+        )
+
+    async def test_aresponse_error_logs_off_event_loop(self) -> None:
+        response = await self.async_client.get("/async/error/")
+        self.assertEqual(response.status_code, 409)
+        data = json.loads(response.content)
+        self.assertEqual(data["message"], "Error updating.")
+
+        self.assertTrue(self.log_handler.done.wait(5))
+        record = self.log_handler.records[0]
+        self.assertEqual(record.getMessage(), "Error updating. - Bad value")
+        self.assertEqual(record.response_status, 409)
+        # stack is captured in the view, the record is handled in a worker thread
+        self.assertIn("async_error_view", record.stack_info or "")
+        self.assertNotEqual(self.log_handler.threads[0], view_threads[-1])
+
+    async def test_aresponse_error_log_errors_reported(self) -> None:
+        logger = logging.getLogger("test_aresponse_error_log_errors")
+        logger.handle = MagicMock(side_effect=RuntimeError("Handler failed"))
+        handler = ApiResponseHandler(logger=logger)
+        loop = asyncio.get_running_loop()
+        reported: "asyncio.Future[Dict[str, Any]]" = loop.create_future()
+        loop.set_exception_handler(lambda loop, context: reported.set_result(context))
+        try:
+            await handler.aresponse_error(error=ValueError("Bad"), message="Error.")
+            context = await asyncio.wait_for(reported, 5)
+        finally:
+            loop.set_exception_handler(None)
+        self.assertIsInstance(context["exception"], RuntimeError)
+        self.assertNotIn(context["future"], api_response_handler._LOG_FUTURES)
+
+    async def test_aresponse_error_print_log_false(self) -> None:
+        response = await async_handler.aresponse_error(
+            error="Not logged.", print_log=False
+        )
+        self.assertEqual(response.data["message"], "Not logged.")
+        self.assertEqual(self.log_handler.records, [])
+
+    async def test_aresponse_error_log_sampling(self) -> None:
+        handler = ApiResponseHandler(
+            logger=async_logger,
+            log_sampler=LogSampler(max_full=1, summary_interval=0),
+        )
+        for _ in range(2):
+            await handler.aresponse_error(error=ValueError("Bad"), message="Error.")
+        for _ in range(50):
+            if len(self.log_handler.records) == 2:
+                break
+            await asyncio.sleep(0.01)
+        messages = [record.getMessage() for record in self.log_handler.records]
+        # each call hands its records to the executor separately, in any order
+        self.assertCountEqual(
+            messages,
+            [
+                "Error. - Bad",
+                "Error. - Bad [repeated 1 more times, stack traces suppressed]",
+            ],
+        )
@@ -1,9 +1,15 @@
-from typing import Any
+from typing import Any, AsyncIterator, Dict, List
+from unittest.mock import patch
 from django.test import TestCase, RequestFactory
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import CursorPagination
 from rest_framework.views import APIView
 from rest_framework import status
 
+from ..api_response import ApiResponse, ApiResponseData, RawJson
+from ..api_response_handler import ApiResponseHandler
 from ..api_response_renderer import ApiResponseRenderer
 
 
@@ -165,3 +171,304 @@ class ApiResponseRendererTestCase(TestCase):
         self.assertIn(b'"results":null', rendered_content)
         self.assertIn(b'"error_fields":{"field":"error"}', rendered_content)
         self.assertIn(b'"non_field_errors":[]', rendered_content)
+
+
+class ApiResponseRendererStreamTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.renderer = ApiResponseRenderer()
+        self.renderer.stream_batch_size = 3
+        self.response = Response(status=status.HTTP_200_OK)
+
+    def _render(self, data: dict[str, Any]) -> bytes:
+        return bytes(
+            self.renderer.render(
+                dict(data), renderer_context={"response": self.response}
+            )
+        )
+
+    def test_stream_matches_render_for_list(self) -> None:
+        rows = [{"id": i, "name": f"row {i}"} for i in range(10)]
+        data = ApiResponse(status=200, message="ok", results=rows).dict()
+        streamed = b"".join(self.renderer.render_stream(data))
+        self.assertEqual(streamed, self._render(data))
+
+    def test_stream_matches_render_for_generator(self) -> None:
+        rows = [{"id": i} for i in range(7)]
+        data = ApiResponse(status=200, message="ok", results=rows).dict()
+        generator_data = ApiResponse(
+            status=200, message="ok", results=(row for row in rows)
+        ).dict()
+        streamed = b"".join(self.renderer.render_stream(generator_data))
+        self.assertEqual(streamed, self._render(data))
+
+    def test_stream_matches_render_for_paginated(self) -> None:
+        rows = [{"id": i} for i in range(4)]
+        results = {"count": 4, "next": None, "previous": None, "results": rows}
+        data = ApiResponse(status=200, message="ok", results=results).dict()
+        streamed = b"".join(self.renderer.render_stream(data))
+        self.assertEqual(streamed, self._render(data))
+        self.assertIn(b'"count":4', streamed)
+
+    def test_stream_empty_results(self) -> None:
+        data = ApiResponse(status=200, message="ok", results=iter([])).dict()
+        streamed = b"".join(self.renderer.render_stream(data))
+        self.assertIn(b'"results":[]', streamed)
+
+    def test_stream_non_iterable_results(self) -> None:
+        data = ApiResponse(status=200, message="ok", results={"key": "value"}).dict()
+        streamed = b"".join(self.renderer.render_stream(data))
+        self.assertEqual(streamed, self._render(data))
+
+    def test_stream_is_lazy(self) -> None:
+        consumed = []
+
+        def rows() -> Any:
+            for i in range(10):
+                consumed.append(i)
+                yield {"id": i}
+
+        data = ApiResponse(status=200, message="ok", results=rows()).dict()
+        chunks = self.renderer.render_stream(data)
+        head = next(chunks)
+        self.assertTrue(head.endswith(b'"results":['))
+        self.assertEqual(consumed, [])
+        next(chunks)
+        self.assertEqual(consumed, [0, 1, 2])
+
+
+class ApiResponseRendererAsyncStreamTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.renderer = ApiResponseRenderer()
+        self.renderer.stream_batch_size = 3
+        self.response = Response(status=status.HTTP_200_OK)
+
+    async def _join(self, data: dict[str, Any]) -> bytes:
+        return b"".join([chunk async for chunk in self.renderer.arender_stream(data)])
+
+    async def test_async_stream_matches_render(self) -> None:
+        rows = [{"id": i} for i in range(7)]
+
+        async def arows() -> AsyncIterator[object]:
+            for row in rows:
+                yield row
+
+        expected = self.renderer.render(
+            ApiResponse(status=200, message="ok", results=rows).dict(),
+            renderer_context={"response": self.response},
+        )
+        data = ApiResponse(status=200, message="ok", results=arows()).dict()
+        self.assertEqual(await self._join(data), expected)
+        # sync iterables work too
+        data = ApiResponse(status=200, message="ok", results=rows).dict()
+        self.assertEqual(await self._join(data), expected)
+
+    async def test_async_stream_non_iterable_results(self) -> None:
+        data = ApiResponse(status=200, message="ok", results={"key": "value"}).dict()
+        self.assertEqual(
+            await self._join(data),
+            self.renderer.render(data, renderer_context={"response": self.response}),
+        )
+
+    async def test_async_stream_paginated(self) -> None:
+        async def arows() -> AsyncIterator[object]:
+            for i in range(4):
+                yield {"id": i}
+
+        results = {"count": 4, "next": None, "previous": None, "results": arows()}
+        data = ApiResponse(status=200, message="ok", results=results).dict()
+        streamed = await self._join(data)
+        self.assertIn(b'"count":4', streamed)
+        self.assertIn(b'"results":[{"id":0},{"id":1},{"id":2},{"id":3}]', streamed)
+
+    async def test_async_stream_empty(self) -> None:
+        async def arows() -> AsyncIterator[object]:
+            return
+            yield
+
+        data = ApiResponse(status=200, message="ok", results=arows()).dict()
+        self.assertIn(b'"results":[]', await self._join(data))
+
+    async def test_async_stream_is_lazy(self) -> None:
+        consumed = []
+
+        async def arows() -> AsyncIterator[object]:
+            for i in range(10):
+                consumed.append(i)
+                yield {"id": i}
+
+        data = ApiResponse(status=200, message="ok", results=arows()).dict()
+        chunks = self.renderer.arender_stream(data)
+        head = await chunks.__anext__()
+        self.assertTrue(head.endswith(b'"results":['))
+        self.assertEqual(consumed, [])
+        await chunks.__anext__()
+        self.assertEqual(consumed, [0, 1, 2])
+
+
+class ApiResponseRendererRawJsonTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.renderer = ApiResponseRenderer()
+        self.response = Response(status=status.HTTP_200_OK)
+
+    def test_raw_json_results_are_spliced(self) -> None:
+        rows = [{"id": 1, "name": "café"}, {"id": 2, "name": None}]
+        expected = self.renderer.render(
+            ApiResponse(status=200, message="ok", results=rows).dict(),
+            renderer_context={"response": self.response},
+        )
+        cached = JSONRenderer().render(rows)
+        rendered = self.renderer.render(
+            ApiResponse(status=200, message="ok", results=RawJson(cached)).dict(),
+            renderer_context={"response": self.response},
+        )
+        self.assertEqual(rendered, expected)
+
+    def test_raw_json_paginated_results(self) -> None:
+        results = {
+            "count": 1,
+            "next": None,
+            "previous": None,
+            "results": RawJson("[1]"),
+        }
+        rendered = self.renderer.render(
+            ApiResponse(status=200, message="ok", results=results).dict(),
+            renderer_context={"response": self.response},
+        )
+        self.assertIn(b'"count":1', rendered)
+        self.assertIn(b'"results":[1],', rendered)
+
+    def test_raw_json_is_not_decoded(self) -> None:
+        rendered = self.renderer.render(
+            {"results": RawJson(b'{"b":1,  "a":2}')},
+            renderer_context={"response": self.response},
+        )
+        self.assertIn(b'"results":{"b":1,  "a":2}', rendered)
+
+    def test_raw_json_is_indented(self) -> None:
+        rows = [{"id": 1, "name": "café"}]
+        context = {"response": self.response}
+        expected = self.renderer.render(
+            ApiResponse(status=200, message="ok", results=rows).dict(),
+            "application/json; indent=2",
+            context,
+        )
+        rendered = self.renderer.render(
+            ApiResponse(
+                status=200, message="ok", results=RawJson(JSONRenderer().render(rows))
+            ).dict(),
+            "application/json; indent=2",
+            context,
+        )
+        self.assertEqual(rendered, expected)
+        self.assertIn(b'\n  "results": [\n    {\n      "id": 1,', rendered)
+
+
+class ApiResponseRendererSinglePassTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.renderer = ApiResponseRenderer()
+
+    def test_handler_envelope_is_not_renormalized(self) -> None:
+        response = ApiResponseHandler().response_success(results={"key": "value"})
+        data: ApiResponseData = response.data  # type: ignore[assignment]
+        with patch.object(ApiResponseRenderer, "_normalize") as normalize:
+            rendered = self.renderer.render(
+                data, renderer_context={"response": response}
+            )
+        normalize.assert_not_called()
+        self.assertEqual(
+            rendered,
+            b'{"status":200,"message":"Successfully completed request.",'
+            b'"results":{"key":"value"},"error_fields":{},"non_field_errors":[]}',
+        )
+
+    def test_envelope_without_message_gets_default(self) -> None:
+        response = Response(status=status.HTTP_404_NOT_FOUND)
+        rendered = self.renderer.render(
+            ApiResponse(status=404).dict(), renderer_context={"response": response}
+        )
+        self.assertIn(b'"message":"Error. Please try again later."', rendered)
+
+    def test_empty_results_are_null(self) -> None:
+        response = Response(status=status.HTTP_200_OK)
+        context = {"response": response}
+        for results, expected in (({}, b"null"), ("", b"null"), ([], b"[]")):
+            data = ApiResponse(status=200, message="ok", results=results).dict()
+            rendered = self.renderer.render(data, renderer_context=context)
+            self.assertIn(b'"results":' + expected + b",", rendered)
+            self.assertEqual(
+                rendered, self.renderer.render(dict(data), renderer_context=context)
+            )
+
+    def test_single_pass_matches_normalized_output(self) -> None:
+        response = ApiResponseHandler().response_error(
+            error_fields={"non_field_errors": ["Bad."], "field": ["Required."]}
+        )
+        data: ApiResponseData = response.data  # type: ignore[assignment]
+        context = {"response": response}
+        expected = self.renderer.render(dict(data), renderer_context=context)
+        rendered = self.renderer.render(data, renderer_context=context)
+        self.assertEqual(rendered, expected)
+
+
+class ApiResponseRendererPaginationTestCase(TestCase):
+
+    def test_view_paginator_keys_are_added(self) -> None:
+        view = GenericAPIView()
+        view.pagination_class = CursorPagination
+        view.paginator  # DRF instantiates the paginator on first access
+        response = Response(status=status.HTTP_200_OK)
+        rendered = ApiResponseRenderer().render(
+            {"next": "http://testserver/?cursor=abc", "results": []},
+            renderer_context={"response": response, "view": view},
+        )
+        self.assertIn(b'"previous":null', rendered)
+        self.assertNotIn(b'"count"', rendered)
+
+    def test_unused_view_paginator_is_ignored(self) -> None:
+        view = GenericAPIView()
+        view.pagination_class = CursorPagination
+        response = Response(status=status.HTTP_200_OK)
+        rendered = ApiResponseRenderer().render(
+            {"results": {"key": "value"}},
+            renderer_context={"response": response, "view": view},
+        )
+        self.assertNotIn(b'"previous"', rendered)
+
+    def test_error_response_gets_no_paginator_keys(self) -> None:
+        view = GenericAPIView()
+        view.pagination_class = CursorPagination
+        view.paginator
+        response = Response(status=status.HTTP_400_BAD_REQUEST)
+        cases: List[Dict[str, Any]] = [
+            {"detail": "Invalid cursor"},
+            {"detail": "Invalid cursor", "next": None, "results": None},
+        ]
+        for data in cases:
+            rendered = ApiResponseRenderer().render(
+                data, renderer_context={"response": response, "view": view}
+            )
+            self.assertIn(b'"message":"Invalid cursor"', rendered)
+            self.assertNotIn(b'"previous"', rendered)
+
+    def test_paginator_requiring_arguments(self) -> None:
+        class ArgumentPagination(CursorPagination):
+            def __init__(self, page_size: int) -> None:
+                self.page_size = page_size
+
+        class ArgumentView(GenericAPIView):
+            pagination_class = None
+
+            @property
+            def paginator(self) -> Any:
+                return ArgumentPagination(page_size=10)
+
+        response = Response(status=status.HTTP_200_OK)
+        rendered = ApiResponseRenderer().render(
+            {"next": None, "results": []},
+            renderer_context={"response": response, "view": ArgumentView()},
+        )
+        self.assertIn(b'"previous":null', rendered)
@@ -0,0 +1,30 @@
+from django.test import TestCase
+
+from ..caches import LruCache
+
+
+class LruCacheTestCase(TestCase):
+
+    def test_get_set(self) -> None:
+        cache: LruCache[str, int] = LruCache(max_size=2)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("a", 0), 0)
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache, {"a": 1})
+
+    def test_least_recently_used_evicted(self) -> None:
+        cache: LruCache[str, int] = LruCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(list(cache), ["a", "c"])
+
+    def test_new_keys_cached_when_full(self) -> None:
+        cache: LruCache[int, int] = LruCache(max_size=10)
+        for i in range(1000):
+            cache.set(i, i)
+        cache.set(-1, -1)
+        self.assertEqual(len(cache), 10)
+        self.assertEqual(cache.get(-1), -1)
@@ -0,0 +1,187 @@
+import sys
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.exceptions import ValidationError as DRFValidationError
+
+from ..api_response_handler import ApiResponseHandler
+from ..errors import ErrorFieldsNormalizer, extract_first_error_message
+
+
+class ExtractFirstErrorMessageTestCase(TestCase):
+
+    def test_string(self) -> None:
+        self.assertEqual(extract_first_error_message("Bad."), "Bad.")
+        self.assertIsNone(extract_first_error_message(""))
+        self.assertIsNone(extract_first_error_message(None))
+
+    def test_first_in_order(self) -> None:
+        errors = {
+            "user": {"profile": {"email": ["", "Invalid email."]}},
+            "password": ["Too short."],
+        }
+        self.assertEqual(extract_first_error_message(errors), "Invalid email.")
+
+    def test_error_detail_returned_as_str(self) -> None:
+        message = extract_first_error_message(
+            [{"name": [ErrorDetail("Required.", code="required")]}]
+        )
+        self.assertEqual(message, "Required.")
+        self.assertIs(type(message), str)
+
+    def test_resumes_parent_after_empty_child(self) -> None:
+        errors = [[], {}, [[], {"a": []}], ["Found."]]
+        self.assertEqual(extract_first_error_message(errors), "Found.")
+
+    def test_deep_nesting_does_not_recurse(self) -> None:
+        errors: object = ["Deep."]
+        for _ in range(sys.getrecursionlimit() * 2):
+            errors = [errors]
+        self.assertIsNone(extract_first_error_message(errors))
+        self.assertEqual(
+            extract_first_error_message(errors, max_depth=sys.maxsize), "Deep."
+        )
+
+    def test_max_depth(self) -> None:
+        errors = [[["Too deep."]], "Shallow."]
+        self.assertEqual(extract_first_error_message(errors, max_depth=2), "Shallow.")
+        self.assertEqual(extract_first_error_message(errors, max_depth=3), "Too deep.")
+
+    def test_max_nodes(self) -> None:
+        errors: list[object] = [{} for _ in range(10)] + ["Late."]
+        self.assertIsNone(extract_first_error_message(errors, max_nodes=10))
+        self.assertEqual(extract_first_error_message(errors, max_nodes=11), "Late.")
+
+    def test_large_bulk_payload(self) -> None:
+        items: list[object] = [{} for _ in range(9_999)] + [
+            {"email": ["Enter a valid email."]}
+        ]
+        handler = ApiResponseHandler()
+        response = handler.response_error(
+            error=DRFValidationError({"items": items}), print_log=False
+        )
+        self.assertEqual(response.data["message"], "Enter a valid email.")  # type: ignore[index]
+
+    @override_settings(DANS_API_TOOLKIT={"ERROR_MESSAGE_MAX_NODES": 10})
+    def test_budget_setting_falls_back_to_default_message(self) -> None:
+        handler = ApiResponseHandler()
+        items: list[object] = [{} for _ in range(20)] + [
+            {"email": ["Enter a valid email."]}
+        ]
+        response = handler.response_error(error_fields={"items": items}, print_log=False)  # type: ignore[dict-item]
+        self.assertEqual(response.data["message"], handler.message_error)  # type: ignore[index]
+
+
+class ErrorFieldsNormalizerTestCase(TestCase):
+
+    def test_flat_fields_unchanged(self) -> None:
+        error_fields = {"name": ["Required."], "email": ["Invalid.", "Too long."]}
+        self.assertEqual(ErrorFieldsNormalizer().normalize(error_fields), error_fields)
+
+    def test_nested_paths(self) -> None:
+        error_fields = {
+            "items": [{}, {"email": ["Invalid."], "address": {"city": ["Required."]}}],
+            "owner": {"name": "Too short."},
+        }
+        self.assertEqual(
+            ErrorFieldsNormalizer().normalize(error_fields),
+            {
+                "items.1.email": ["Invalid."],
+                "items.1.address.city": ["Required."],
+                "owner.name": ["Too short."],
+            },
+        )
+
+    def test_error_details_deduplicated(self) -> None:
+        detail = DRFValidationError(
+            {"tags": [ErrorDetail("Bad.", code="invalid")] * 3 + [""]}
+        ).detail
+        normalized = ErrorFieldsNormalizer().normalize(detail)  # type: ignore[arg-type]
+        self.assertEqual(normalized["tags"], ["Bad."])
+        self.assertIs(type(normalized["tags"][0]), str)
+
+    def test_max_messages(self) -> None:
+        normalized = ErrorFieldsNormalizer(max_messages=2).normalize(
+            {"field": ["a", "b", "c"]}
+        )
+        self.assertEqual(normalized, {"field": ["a", "b"]})
+
+    def test_max_fields_truncates(self) -> None:
+        error_fields = {"items": [{"email": [f"Invalid {i}."]} for i in range(10_000)]}
+        normalized = ErrorFieldsNormalizer(max_fields=3).normalize(error_fields)
+        self.assertEqual(
+            list(normalized),
+            [
+                "items.0.email",
+                "items.1.email",
+                "items.2.email",
+                ErrorFieldsNormalizer.TRUNCATED_KEY,
+            ],
+        )
+        self.assertEqual(
+            normalized[ErrorFieldsNormalizer.TRUNCATED_KEY],
+            ["Error fields truncated, showing the first 3."],
+        )
+
+    def test_repeated_messages_deduplicated(self) -> None:
+        error_fields = {
+            "items": [
+                {"email": ["Invalid."], "name": ["Required."]} for _ in range(500)
+            ],
+            "owner": {"email": ["Invalid.", "Too long."]},
+        }
+        with self.assertLogs("django_dans_api_toolkit.errors", "DEBUG") as logs:
+            normalized = ErrorFieldsNormalizer().normalize(error_fields)
+        self.assertEqual(
+            normalized,
+            {
+                "items.0.email": ["Invalid."],
+                "items.0.name": ["Required."],
+                "owner.email": ["Too long."],
+                ErrorFieldsNormalizer.TRUNCATED_KEY: ["999 repeated messages omitted."],
+            },
+        )
+        self.assertIn("999 repeated messages omitted.", logs.output[0])
+
+    def test_max_nodes_truncates(self) -> None:
+        error_fields = {"items": [{} for _ in range(100)], "name": ["Required."]}
+        normalized = ErrorFieldsNormalizer(max_nodes=50).normalize(error_fields)
+        self.assertEqual(list(normalized), [ErrorFieldsNormalizer.TRUNCATED_KEY])
+
+    def test_max_depth_skips(self) -> None:
+        error_fields = {"a": {"b": {"c": ["Deep."]}}, "d": ["Shallow."]}
+        with self.assertLogs("django_dans_api_toolkit.errors", "DEBUG") as logs:
+            normalized = ErrorFieldsNormalizer(max_depth=2).normalize(error_fields)
+        note = "1 errors nested deeper than 2 levels omitted."
+        self.assertEqual(
+            normalized,
+            {"d": ["Shallow."], ErrorFieldsNormalizer.TRUNCATED_KEY: [note]},
+        )
+        self.assertIn(note, logs.output[0])
+
+    def test_handler_normalizes_error_fields(self) -> None:
+        handler = ApiResponseHandler(
+            error_fields_normalizer=ErrorFieldsNormalizer(max_fields=2)
+        )
+        error_fields = {
+            "non_field_errors": ["Bad upload."],
+            "items": [{"email": [f"Invalid {i}."]} for i in range(5)],
+        }
+        response = handler.response_error(error_fields=error_fields, print_log=False)  # type: ignore[arg-type]
+        data = response.data
+        self.assertEqual(data["message"], "Bad upload.")  # type: ignore[index]
+        self.assertEqual(data["non_field_errors"], ["Bad upload."])  # type: ignore[index]
+        self.assertEqual(
+            list(data["error_fields"]),  # type: ignore[index]
+            ["items.0.email", "items.1.email", ErrorFieldsNormalizer.TRUNCATED_KEY],
+        )
+
+    @override_settings(
+        DANS_API_TOOLKIT={"ERROR_FIELDS_NORMALIZATION": {"MAX_FIELDS": 7}}
+    )
+    def test_normalization_setting(self) -> None:
+        normalizer = ApiResponseHandler().error_fields_normalizer
+        self.assertIsInstance(normalizer, ErrorFieldsNormalizer)
+        self.assertEqual(normalizer.max_fields, 7)  # type: ignore[union-attr]
+
+    def test_normalization_disabled_by_default(self) -> None:
+        self.assertIsNone(ApiResponseHandler().error_fields_normalizer)
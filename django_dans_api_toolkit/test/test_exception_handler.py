@@ -0,0 +1,150 @@
+from typing import Any, Dict, Optional, cast
+import json
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError
+from django.http import Http404
+from django.test import TestCase, override_settings
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from ..exception_handler import (
+    DEFAULT_MESSAGE_INTEGRITY_ERROR,
+    ApiExceptionHandler,
+    exception_handler,
+)
+from ..static_responses import StaticApiResponseData
+
+
+class RaisingView(APIView):
+    exception: Optional[Exception] = None
+
+    def get(self, request: Request) -> Response:
+        assert self.exception is not None
+        raise self.exception
+
+
+class PrivateView(APIView):
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        return Response({})
+
+
+@override_settings(
+    REST_FRAMEWORK={
+        "EXCEPTION_HANDLER": "django_dans_api_toolkit.exception_handler.exception_handler",
+        "DEFAULT_RENDERER_CLASSES": [
+            "django_dans_api_toolkit.api_response_renderer.ApiResponseRenderer"
+        ],
+    }
+)
+class ExceptionHandlerTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+
+    def get(self, exception: Exception) -> Dict[str, Any]:
+        view = RaisingView.as_view(exception=exception)
+        response = cast(Response, view(self.factory.get("/")))
+        response.render()
+        self.response = response
+        return cast(Dict[str, Any], json.loads(response.content))
+
+    def test_validation_error(self) -> None:
+        data = self.get(
+            exceptions.ValidationError(
+                {"non_field_errors": ["Bad upload."], "email": ["Invalid."]}
+            )
+        )
+        self.assertEqual(self.response.status_code, 400)
+        self.assertEqual(
+            data,
+            {
+                "status": 400,
+                "message": "Bad upload.",
+                "results": None,
+                "error_fields": {"email": ["Invalid."]},
+                "non_field_errors": ["Bad upload."],
+            },
+        )
+
+    def test_validation_error_list(self) -> None:
+        data = self.get(exceptions.ValidationError("Not allowed."))
+        self.assertEqual(data["message"], "Not allowed.")
+        self.assertEqual(data["non_field_errors"], ["Not allowed."])
+        self.assertEqual(data["error_fields"], {})
+
+    def test_django_validation_error(self) -> None:
+        data = self.get(DjangoValidationError({"name": ["Required."]}))
+        self.assertEqual(self.response.status_code, 400)
+        self.assertEqual(data["message"], "Required.")
+        self.assertEqual(data["error_fields"], {"name": ["Required."]})
+
+    def test_not_found(self) -> None:
+        data = self.get(Http404())
+        self.assertEqual(self.response.status_code, 404)
+        self.assertEqual(data["message"], "Not found.")
+        self.assertNotIn("detail", data)
+
+        data = self.get(exceptions.NotFound("No item 12."))
+        self.assertEqual(data["message"], "No item 12.")
+
+    def test_throttled(self) -> None:
+        data = self.get(exceptions.Throttled(wait=3))
+        self.assertEqual(self.response.status_code, 429)
+        self.assertEqual(self.response["Retry-After"], "3")
+        self.assertIn("throttled", data["message"])
+
+    def test_not_authenticated(self) -> None:
+        response = cast(Response, PrivateView.as_view()(self.factory.get("/")))
+        response.render()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+        self.assertEqual(
+            json.loads(response.content)["message"],
+            str(exceptions.NotAuthenticated.default_detail),
+        )
+
+    def test_integrity_error_logged(self) -> None:
+        error = IntegrityError("UNIQUE constraint failed: auth_user.email")
+        with self.assertLogs("django_dans_api_toolkit", level="ERROR") as logs:
+            data = self.get(error)
+        self.assertEqual(self.response.status_code, 400)
+        self.assertEqual(data["message"], DEFAULT_MESSAGE_INTEGRITY_ERROR)
+        # the database error is logged, not sent to the client
+        self.assertIn("auth_user.email", "\n".join(logs.output))
+        self.assertNotIn(b"auth_user.email", self.response.content)
+
+    def test_server_error_logged(self) -> None:
+        with self.assertLogs("django_dans_api_toolkit", level="ERROR"):
+            data = self.get(exceptions.APIException())
+        self.assertEqual(self.response.status_code, 500)
+        self.assertEqual(data["message"], str(exceptions.APIException.default_detail))
+
+    def test_other_exceptions_not_handled(self) -> None:
+        self.assertIsNone(exception_handler(KeyError("key"), {}))
+
+
+class StaticEnvelopeTestCase(TestCase):
+
+    def test_default_detail_envelope_reused(self) -> None:
+        handler = ApiExceptionHandler()
+        first = handler(exceptions.NotFound(), {})
+        second = handler(exceptions.NotFound(), {})
+        assert first is not None and second is not None
+        self.assertIsInstance(first.data, StaticApiResponseData)
+        self.assertIs(first.data, second.data)
+        self.assertEqual(first.data["message"], "Not found.")  # type: ignore[index]
+
+    def test_custom_detail_not_static(self) -> None:
+        handler = ApiExceptionHandler()
+        response = handler(exceptions.NotFound("No item 12."), {})
+        assert response is not None
+        self.assertNotIsInstance(response.data, StaticApiResponseData)
+        self.assertEqual(response.data["message"], "No item 12.")  # type: ignore[index]
@@ -0,0 +1,205 @@
+import datetime
+import decimal
+import enum
+import unittest
+import uuid
+from typing import Any
+
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from ..api_response_renderer import ApiResponseRenderer
+from ..json_backends import (
+    OrjsonJsonBackend,
+    StdlibJsonBackend,
+    _load_json_backend,
+    _may_differ,
+    get_json_backend,
+    orjson,
+)
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class Level(enum.IntEnum):
+    HIGH = 2
+
+
+def _sample_envelope() -> dict[str, Any]:
+    return {
+        "status": 200,
+        "message": "Successfully completed request.",
+        "count": 2,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "id": 1,
+                "name": "caf\u00e9 \u2028 \u2029",
+                "price": decimal.Decimal("10.50"),
+                "created": datetime.datetime(2025, 1, 2, 3, 4, 5, 678901),
+                "created_utc": datetime.datetime(
+                    2025, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc
+                ),
+                "day": datetime.date(2025, 1, 2),
+                "time": datetime.time(3, 4, 5),
+                "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                "ratio": 0.1,
+                "tags": ("a", "b"),
+                1: "int key",
+            },
+            {"id": 2, "big": 2**70, "nested": {"deep": [1, 2.5, True, None]}},
+        ],
+        "error_fields": {},
+        "non_field_errors": [],
+    }
+
+
+class StdlibJsonBackendTestCase(TestCase):
+
+    def test_matches_drf_json_renderer(self) -> None:
+        data = _sample_envelope()
+        expected = JSONRenderer().render(data)
+        rendered = StdlibJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        self.assertEqual(rendered, expected)
+
+    def test_matches_drf_json_renderer_with_indent(self) -> None:
+        data = _sample_envelope()
+        expected = JSONRenderer().render(data, "application/json; indent=4")
+        rendered = StdlibJsonBackend().dumps(data, JSONRenderer.encoder_class, indent=4)
+        self.assertEqual(rendered, expected)
+
+
+@unittest.skipUnless(orjson is not None, "orjson is not installed")
+class OrjsonJsonBackendTestCase(TestCase):
+
+    def test_matches_stdlib_backend(self) -> None:
+        data = _sample_envelope()
+        expected = StdlibJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        rendered = OrjsonJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        self.assertEqual(rendered, expected)
+
+    def test_escapes_line_separators(self) -> None:
+        rendered = OrjsonJsonBackend().dumps(
+            {"text": "a\u2028b\u2029c"}, JSONRenderer.encoder_class
+        )
+        self.assertEqual(rendered, b'{"text":"a\\u2028b\\u2029c"}')
+
+    def test_indent_falls_back_to_stdlib(self) -> None:
+        data = _sample_envelope()
+        expected = StdlibJsonBackend().dumps(data, JSONRenderer.encoder_class, indent=2)
+        rendered = OrjsonJsonBackend().dumps(data, JSONRenderer.encoder_class, indent=2)
+        self.assertEqual(rendered, expected)
+
+    def test_unserializable_raises_like_stdlib(self) -> None:
+        with self.assertRaises(TypeError):
+            OrjsonJsonBackend().dumps({"obj": object()}, JSONRenderer.encoder_class)
+
+    def test_exponent_floats_match_stdlib(self) -> None:
+        data = {
+            "values": [1e16, 1e-7, -2.5e20, 1.5e-5, 1e-4, 1e15, 0.0],
+            1e16: "float key",
+        }
+        expected = StdlibJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        rendered = OrjsonJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        self.assertEqual(rendered, expected)
+        self.assertIn(b"1e+16", rendered)
+        self.assertIn(b"1e-07", rendered)
+
+    def test_exponent_floats_from_encoder_default_match_stdlib(self) -> None:
+        # decimals are encoded as floats with COERCE_DECIMAL_TO_STRING = False
+        class FloatDecimalEncoder(JSONEncoder):
+            def default(self, obj: Any) -> Any:
+                if isinstance(obj, decimal.Decimal):
+                    return float(obj)
+                return super().default(obj)
+
+        data = {"price": decimal.Decimal("1E+20")}
+        expected = StdlibJsonBackend().dumps(data, FloatDecimalEncoder)
+        self.assertEqual(OrjsonJsonBackend().dumps(data, FloatDecimalEncoder), expected)
+
+    def test_small_floats_match_stdlib(self) -> None:
+        data = {"values": [9.99e-5, 1e-5, -4.5e-6, 1.00001, 0.0001]}
+        expected = StdlibJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        rendered = OrjsonJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        self.assertEqual(rendered, expected)
+        self.assertIn(b"9.99e-05", rendered)
+
+    def test_strings_like_floats_match_stdlib(self) -> None:
+        data = {
+            "uuid": "0e1f0000-0000-0000-0000-00000000001e",
+            "codes": ["e1, e2", "[0.00001]"],
+            "ratio": 0.5,
+            "value": 1e16,
+        }
+        expected = StdlibJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        rendered = OrjsonJsonBackend().dumps(data, JSONRenderer.encoder_class)
+        self.assertEqual(rendered, expected)
+
+    def test_may_differ(self) -> None:
+        for rendered in (b"[1e16]", b'{"a":1.5e-7}', b"[0,-0.00001]", b"0.00009"):
+            self.assertTrue(_may_differ(rendered), rendered)
+        # e.g. UUIDs, timestamps and stdlib floats don't fall back
+        for rendered in (
+            b'["0e1f0000-0000-0000-0000-00000000001e"]',
+            b'{"at":"2025-01-01T00:00:10.000012","ratio":10.00001,"small":0.0001}',
+        ):
+            self.assertFalse(_may_differ(rendered), rendered)
+
+    def test_non_finite_floats_encoded_as_null(self) -> None:
+        for value in (float("nan"), float("inf"), float("-inf")):
+            self.assertEqual(
+                OrjsonJsonBackend().dumps([value], JSONRenderer.encoder_class),
+                b"[null]",
+            )
+
+    def test_enums_encoded_as_values(self) -> None:
+        self.assertEqual(
+            OrjsonJsonBackend().dumps({"color": Color.RED}, JSONRenderer.encoder_class),
+            b'{"color":"red"}',
+        )
+        data = {"level": Level.HIGH}
+        self.assertEqual(
+            OrjsonJsonBackend().dumps(data, JSONRenderer.encoder_class),
+            StdlibJsonBackend().dumps(data, JSONRenderer.encoder_class),
+        )
+
+
+class GetJsonBackendTestCase(TestCase):
+
+    def test_default_is_stdlib(self) -> None:
+        self.assertIsInstance(get_json_backend(), StdlibJsonBackend)
+        self.assertEqual(get_json_backend().name, "stdlib")
+
+    @override_settings(DANS_API_TOOLKIT={"JSON_ENCODER": "auto"})
+    def test_auto_prefers_orjson_when_available(self) -> None:
+        expected = "orjson" if orjson is not None else "stdlib"
+        self.assertEqual(get_json_backend().name, expected)
+
+    @override_settings(
+        DANS_API_TOOLKIT={
+            "JSON_ENCODER": "django_dans_api_toolkit.json_backends.StdlibJsonBackend"
+        }
+    )
+    def test_dotted_path(self) -> None:
+        self.assertEqual(get_json_backend().name, "stdlib")
+
+    def test_backend_is_cached(self) -> None:
+        self.assertIs(_load_json_backend("stdlib"), _load_json_backend("stdlib"))
+
+    @override_settings(DANS_API_TOOLKIT={"JSON_ENCODER": "auto"})
+    def test_renderer_output_identical_across_backends(self) -> None:
+        response = Response(status=200)
+        data = _sample_envelope()
+        rendered = ApiResponseRenderer().render(
+            dict(data), renderer_context={"response": response}
+        )
+        with override_settings(DANS_API_TOOLKIT={"JSON_ENCODER": "stdlib"}):
+            expected = ApiResponseRenderer().render(
+                dict(data), renderer_context={"response": response}
+            )
+        self.assertEqual(rendered, expected)
@@ -0,0 +1,162 @@
+from typing import List
+import logging
+import threading
+from django.apps import apps
+from django.test import TestCase, override_settings
+
+from ..api_response_handler import DEFAULT_LOGGER, ApiResponseHandler
+from ..log_queue import (
+    BoundedQueueHandler,
+    disable_queue_logging,
+    enable_queue_logging,
+)
+
+
+class BlockingHandler(logging.Handler):
+    """Sink that blocks until released, like a stalled file/socket."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.released = threading.Event()
+        self.released.set()
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # bounded so a failing test can't hang the suite
+        self.released.wait(5)
+        self.messages.append(self.format(record))
+
+
+class LogQueueTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger("django_dans_api_toolkit.test.log_queue")
+        self.logger.propagate = False
+        self.sink = BlockingHandler()
+        self.logger.addHandler(self.sink)
+
+    def tearDown(self) -> None:
+        disable_queue_logging(self.logger)
+        self.logger.removeHandler(self.sink)
+        self.logger.propagate = True
+
+    def test_blocked_sink_does_not_block_requests(self) -> None:
+        enable_queue_logging(self.logger)
+        handler = ApiResponseHandler(logger=self.logger)
+
+        self.sink.released.clear()
+        for i in range(5):
+            handler.response_error(error=ValueError(f"Bad value {i}"), message="Error.")
+        # inline logging would still be stuck on the first record
+        self.assertEqual(self.sink.messages, [])
+
+        self.sink.released.set()
+        # stops the listener once the queue is flushed
+        disable_queue_logging(self.logger)
+        self.assertEqual(
+            [message.split("\n")[0] for message in self.sink.messages],
+            [f"Error. - Bad value {i}" for i in range(5)],
+        )
+        # stacks are formatted before being queued, on the request thread
+        self.assertIn(
+            "in test_blocked_sink_does_not_block_requests", self.sink.messages[0]
+        )
+
+    def test_records_are_formatted_before_queued(self) -> None:
+        queue_handler = enable_queue_logging(self.logger)
+        self.sink.released.clear()
+        items = ["a"]
+        try:
+            raise ValueError("Bad value")
+        except ValueError:
+            self.logger.error("Items %s", items, exc_info=True)
+        items.append("b")
+
+        record = queue_handler.queue.queue[0]  # type: ignore[union-attr]
+        self.assertIsNone(record.args)
+        self.assertIsNone(record.exc_info)
+        self.sink.released.set()
+        disable_queue_logging(self.logger)
+        self.assertTrue(self.sink.messages[0].startswith("Items ['a']\nTraceback"))
+        self.assertIn("ValueError: Bad value", self.sink.messages[0])
+
+    def test_enable_is_idempotent_and_disable_restores_logger(self) -> None:
+        queue_handler = enable_queue_logging(self.logger)
+        self.assertIs(enable_queue_logging(self.logger), queue_handler)
+        self.assertEqual(self.logger.handlers, [queue_handler])
+
+        disable_queue_logging(self.logger)
+        self.assertEqual(self.logger.handlers, [self.sink])
+        self.assertFalse(self.logger.propagate)
+
+    def test_propagated_handlers_are_queued(self) -> None:
+        child = logging.getLogger("django_dans_api_toolkit.test.log_queue.child")
+        enable_queue_logging(child)
+        try:
+            self.assertFalse(child.propagate)
+            child.error("From child")
+        finally:
+            disable_queue_logging(child)
+        self.assertTrue(child.propagate)
+        self.assertEqual(self.sink.messages, ["From child"])
+
+    def test_ancestor_handlers_added_later_are_reached(self) -> None:
+        child = logging.getLogger("django_dans_api_toolkit.test.log_queue.child")
+        self.logger.removeHandler(self.sink)
+        enable_queue_logging(child)
+        try:
+            self.logger.addHandler(self.sink)
+            child.error("From child")
+        finally:
+            disable_queue_logging(child)
+        self.assertEqual(self.sink.messages, ["From child"])
+
+    def test_enable_from_threads(self) -> None:
+        handlers: List[BoundedQueueHandler] = []
+        threads = [
+            threading.Thread(
+                target=lambda: handlers.append(enable_queue_logging(self.logger))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(map(id, handlers))), 1)
+        self.assertEqual(self.logger.handlers, [handlers[0]])
+
+    def test_overflow_is_dropped_and_reported(self) -> None:
+        queue_handler = BoundedQueueHandler(max_size=2)
+        self.logger.removeHandler(self.sink)
+        self.logger.addHandler(queue_handler)
+        try:
+            for i in range(5):
+                self.logger.error("Record %d", i)
+            self.assertEqual(queue_handler.dropped, 3)
+
+            queued = [queue_handler.queue.get_nowait() for _ in range(2)]
+            self.assertEqual(
+                [record.getMessage() for record in queued], ["Record 0", "Record 1"]
+            )
+            self.logger.error("Record 5")
+            overflow = queue_handler.queue.get_nowait()
+            self.assertEqual(overflow.levelno, logging.WARNING)
+            self.assertEqual(
+                overflow.getMessage(), "3 log records dropped, log queue full"
+            )
+            self.assertEqual(queue_handler.queue.get_nowait().getMessage(), "Record 5")
+        finally:
+            self.logger.removeHandler(queue_handler)
+
+    @override_settings(DANS_API_TOOLKIT={"LOG_QUEUE": {"MAX_SIZE": 10}})
+    def test_log_queue_setting(self) -> None:
+        # handlers don't rewire loggers, the app does once at startup
+        ApiResponseHandler(logger=self.logger)
+        self.assertEqual(self.logger.handlers, [self.sink])
+
+        self.addCleanup(disable_queue_logging, DEFAULT_LOGGER)
+        apps.get_app_config("django_dans_api_toolkit").ready()
+        queue_handler = DEFAULT_LOGGER.handlers[0]
+        self.assertIsInstance(queue_handler, BoundedQueueHandler)
+        self.assertEqual(queue_handler.queue.maxsize, 10)  # type: ignore[attr-defined]
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+from django.test import TestCase
+
+from ..log_sampling import LogSampler
+
+
+class LogSamplerTestCase(TestCase):
+
+    def test_first_occurrences_logged_in_full(self) -> None:
+        sampler = LogSampler(max_full=3, summary_interval=60)
+        self.assertEqual(
+            [sampler.sample("sig") for _ in range(3)], [(True, 0), (True, 0), (True, 0)]
+        )
+        self.assertEqual(sampler.sample("sig"), (False, 0))
+
+    def test_signatures_are_independent(self) -> None:
+        sampler = LogSampler(max_full=1, summary_interval=60)
+        self.assertEqual(sampler.sample("a"), (True, 0))
+        self.assertEqual(sampler.sample("b"), (True, 0))
+        self.assertEqual(sampler.sample("a"), (False, 0))
+
+    @patch("django_dans_api_toolkit.log_sampling.time.monotonic")
+    def test_periodic_summary(self, monotonic: object) -> None:
+        sampler = LogSampler(max_full=1, summary_interval=10)
+        monotonic.return_value = 100.0  # type: ignore[attr-defined]
+        self.assertEqual(sampler.sample("sig"), (True, 0))
+        for _ in range(4):
+            self.assertEqual(sampler.sample("sig"), (False, 0))
+        monotonic.return_value = 110.0  # type: ignore[attr-defined]
+        self.assertEqual(sampler.sample("sig"), (False, 5))
+        self.assertEqual(sampler.sample("sig"), (False, 0))
+        monotonic.return_value = 121.0  # type: ignore[attr-defined]
+        self.assertEqual(sampler.sample("sig"), (False, 2))
+
+    def test_max_signatures(self) -> None:
+        sampler = LogSampler(max_full=1, max_signatures=2)
+        sampler.sample("a")
+        sampler.sample("b")
+        sampler.sample("c")
+        # 'a' was dropped, so it counts as new again
+        self.assertEqual(sampler.sample("a"), (True, 0))
+
+    def test_reset(self) -> None:
+        sampler = LogSampler(max_full=1)
+        sampler.sample("sig")
+        sampler.reset("sig")
+        self.assertEqual(sampler.sample("sig"), (True, 0))
+        sampler.sample("other")
+        sampler.reset()
+        self.assertEqual(sampler.sample("other"), (True, 0))
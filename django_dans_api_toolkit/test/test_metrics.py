@@ -0,0 +1,138 @@
+from typing import Dict, List, Tuple
+from django.apps import apps
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework import exceptions
+
+from ..api_response_handler import ApiResponseHandler
+from ..api_response_renderer import ApiResponseRenderer
+from ..exception_handler import exception_handler
+from ..metrics import (
+    METRICS_HOOKS,
+    MetricsCollector,
+    add_metrics_hook,
+    default_collector,
+    metrics_view,
+    remove_metrics_hook,
+)
+from ..static_responses import _STATIC_ERRORS
+
+
+class MetricsHooksTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.events: List[Tuple[str, Dict[str, object]]] = []
+        add_metrics_hook(self.hook)
+
+    def tearDown(self) -> None:
+        remove_metrics_hook(self.hook)
+
+    def hook(self, event: str, fields: Dict[str, object]) -> None:
+        self.events.append((event, fields))
+
+    def test_handler_and_renderer_events(self) -> None:
+        response = ApiResponseHandler().response_success(results={"key": "value"})
+        rendered = ApiResponseRenderer().render(
+            response.data, renderer_context={"response": response}  # type: ignore[arg-type]
+        )
+        self.assertEqual([event for event, _ in self.events], ["format", "render"])
+        format_fields, render_fields = self.events[0][1], self.events[1][1]
+        self.assertEqual(format_fields["status"], 200)
+        self.assertIsInstance(format_fields["duration"], float)
+        self.assertEqual(render_fields["status"], 200)
+        self.assertEqual(render_fields["bytes"], len(rendered))
+
+    def test_error_event(self) -> None:
+        ApiResponseHandler().response_error(
+            error=ValueError("Bad value"), status=409, print_log=False
+        )
+        self.assertIn(
+            ("error", {"status": 409, "error_type": "ValueError"}), self.events
+        )
+
+    def test_static_error_events(self) -> None:
+        _STATIC_ERRORS.clear()
+        collector = MetricsCollector()
+        add_metrics_hook(collector)
+        try:
+            ApiResponseHandler().response_error(status=404)
+            exception_handler(exceptions.NotFound(), {})
+        finally:
+            remove_metrics_hook(collector)
+
+        # building the pre-rendered envelope doesn't emit a render event
+        self.assertEqual(
+            [event for event, _ in self.events], ["error", "format", "error", "format"]
+        )
+        text = collector.render_prometheus()
+        self.assertIn('dans_api_responses_total{status="404"} 2\n', text)
+        self.assertIn('dans_api_errors_total{status="404",error_type="None"} 1\n', text)
+        self.assertIn(
+            'dans_api_errors_total{status="404",error_type="NotFound"} 1\n', text
+        )
+
+    def test_no_hooks_no_events(self) -> None:
+        remove_metrics_hook(self.hook)
+        self.assertEqual(METRICS_HOOKS, [])
+        ApiResponseHandler().response_error(status=404)
+        self.assertEqual(self.events, [])
+
+    def test_add_is_idempotent(self) -> None:
+        add_metrics_hook(self.hook)
+        self.assertEqual(METRICS_HOOKS.count(self.hook), 1)
+
+    @override_settings(DANS_API_TOOLKIT={"METRICS": True})
+    def test_metrics_setting_registers_default_collector(self) -> None:
+        apps.get_app_config("django_dans_api_toolkit").ready()
+        try:
+            self.assertIn(default_collector, METRICS_HOOKS)
+        finally:
+            remove_metrics_hook(default_collector)
+
+
+class MetricsCollectorTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.collector = MetricsCollector()
+
+    def test_prometheus_text(self) -> None:
+        self.collector("format", {"status": 200, "duration": 0.002})
+        self.collector("format", {"status": 200, "duration": 0.02})
+        self.collector("render", {"status": 200, "duration": 0.003, "bytes": 2000})
+        self.collector("error", {"status": 400, "error_type": 'Bad"Error'})
+        text = self.collector.render_prometheus()
+
+        self.assertIn("# TYPE dans_api_responses_total counter\n", text)
+        self.assertIn('dans_api_responses_total{status="200"} 2\n', text)
+        self.assertIn("# TYPE dans_api_response_format_seconds histogram\n", text)
+        # buckets are cumulative
+        self.assertIn('dans_api_response_format_seconds_bucket{le="0.001"} 0\n', text)
+        self.assertIn('dans_api_response_format_seconds_bucket{le="0.0025"} 1\n', text)
+        self.assertIn('dans_api_response_format_seconds_bucket{le="0.025"} 2\n', text)
+        self.assertIn('dans_api_response_format_seconds_bucket{le="+Inf"} 2\n', text)
+        self.assertIn("dans_api_response_format_seconds_count 2\n", text)
+        self.assertIn('dans_api_render_bytes_bucket{status="200",le="4096"} 1\n', text)
+        self.assertIn('dans_api_render_bytes_sum{status="200"} 2000\n', text)
+        self.assertIn(
+            'dans_api_errors_total{status="400",error_type="Bad\\"Error"} 1\n', text
+        )
+
+    def test_values_above_buckets(self) -> None:
+        self.collector.observe("dans_api_render_bytes", 10**9, (1024,))
+        text = self.collector.render_prometheus()
+        self.assertIn('dans_api_render_bytes_bucket{le="1024"} 0\n', text)
+        self.assertIn('dans_api_render_bytes_bucket{le="+Inf"} 1\n', text)
+
+    def test_empty_and_reset(self) -> None:
+        self.assertEqual(self.collector.render_prometheus(), "")
+        self.collector.inc("dans_api_responses_total")
+        self.collector.reset()
+        self.assertEqual(self.collector.render_prometheus(), "")
+
+    def test_metrics_view(self) -> None:
+        self.collector.inc("dans_api_responses_total", (("status", "200"),))
+        response = metrics_view(RequestFactory().get("/metrics"), self.collector)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response["Content-Type"].startswith("text/plain; version=0.0.4")
+        )
+        self.assertIn(b'dans_api_responses_total{status="200"} 1', response.content)
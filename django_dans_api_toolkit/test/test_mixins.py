@@ -0,0 +1,247 @@
+from typing import Any
+from unittest.mock import patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.generics import ListAPIView
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .. import mixins
+from ..mixins import QueryOptimizationMixin, SparseFieldsetMixin
+from ..serializers.query_plan import get_query_plan
+from .serializers.models import (
+    Author,
+    Book,
+    BookSerializer,
+    Publisher,
+    Review,
+    Tag,
+)
+from .utils import ModelTableTestCase
+
+
+class BookListView(ListAPIView):
+    queryset = Book.objects.order_by("id")
+    serializer_class = BookSerializer
+    pagination_class = None
+    authentication_classes = []
+
+
+class OptimizedBookListView(QueryOptimizationMixin, BookListView):
+    pass
+
+
+class PrefetchedBookListView(OptimizedBookListView):
+    queryset = Book.objects.order_by("id").prefetch_related("tags")
+
+
+class UnmaskedBookListView(OptimizedBookListView):
+    def get_serializer(self, *args: Any, **kwargs: Any) -> Any:
+        kwargs.setdefault("masked", False)
+        return super().get_serializer(*args, **kwargs)
+
+
+class RefBookListView(OptimizedBookListView):
+    def get_serializer(self, *args: Any, **kwargs: Any) -> Any:
+        kwargs.setdefault("ref_serializer", True)
+        return super().get_serializer(*args, **kwargs)
+
+
+class UnprunedRefBookListView(RefBookListView):
+    prune_columns = False
+
+
+class SparseBookListView(SparseFieldsetMixin, BookListView):
+    pass
+
+
+class UnmaskedSparseBookListView(SparseBookListView):
+    def get_serializer(self, *args: Any, **kwargs: Any) -> Any:
+        kwargs.setdefault("masked", False)
+        return super().get_serializer(*args, **kwargs)
+
+
+def create_books() -> None:
+    publishers = [Publisher.objects.create(name=f"Publisher {i}") for i in range(2)]
+    authors = [
+        Author.objects.create(name=f"Author {i}", publisher=publishers[i % 2])
+        for i in range(3)
+    ]
+    tags = [Tag.objects.create(name=f"Tag {i}") for i in range(3)]
+    for i in range(6):
+        book = Book.objects.create(
+            title=f"Book {i}", author=authors[i % 3], publisher=publishers[0]
+        )
+        book.tags.set(tags[:2])
+        for reviewer in authors[:2]:
+            Review.objects.create(book=book, reviewer=reviewer, text="Review.")
+
+
+class QueryOptimizationMixinTestCase(ModelTableTestCase):
+    models = [Publisher, Author, Tag, Book, Review]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books()
+
+    def setUp(self) -> None:
+        mixins._QUERY_PLANS.clear()
+
+    def get(self, view: Any) -> Any:
+        response = view.as_view()(APIRequestFactory().get("/books/"))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def get_queryset(self, view_class: Any, method: str) -> Any:
+        request = getattr(APIRequestFactory(), method)("/books/")
+        view = view_class(request=Request(request), format_kwarg=None, kwargs={})
+        return view.get_queryset()
+
+    def test_default_query_count(self) -> None:
+        # books joined with author and the author's publisher + tags
+        with self.assertNumQueries(2):
+            data = self.get(OptimizedBookListView)
+        self.assertEqual(len(data), 6)
+        self.assertEqual(data[0]["author"]["publisher_name"], "Publisher 0")
+        self.assertEqual(data[0]["tags"], ["Tag 0", "Tag 1"])
+
+    def test_nested_many_query_count(self) -> None:
+        # + reviews joined with their reviewer
+        with self.assertNumQueries(3):
+            data = self.get(UnmaskedBookListView)
+        self.assertEqual(
+            [review["reviewer"] for review in data[0]["reviews"]],
+            ["Author 0", "Author 1"],
+        )
+
+    def test_ref_query_count(self) -> None:
+        with self.assertNumQueries(1):
+            data = self.get(RefBookListView)
+        self.assertEqual(set(data[0]), {"id", "title", "publisher"})
+
+    def test_same_data_as_unoptimized(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(BookListView)
+        # N+1s: author, author's publisher and tags per book
+        self.assertEqual(len(queries), 1 + 6 * 3)
+        self.assertEqual(self.get(OptimizedBookListView), data)
+
+    def test_ref_columns_are_pruned(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(RefBookListView)
+        self.assertNotIn('"summary"', queries[0]["sql"])
+        self.assertNotIn('"author_id"', queries[0]["sql"])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(UnprunedRefBookListView), data)
+        self.assertIn('"summary"', queries[0]["sql"])
+
+    def test_prefetched_queryset(self) -> None:
+        # tags are prefetched by the view's queryset, not twice
+        with self.assertNumQueries(2):
+            data = self.get(PrefetchedBookListView)
+        self.assertEqual(data, self.get(OptimizedBookListView))
+
+    def test_columns_only_pruned_for_reads(self) -> None:
+        for method in ("get", "head"):
+            queryset = self.get_queryset(RefBookListView, method)
+            self.assertNotIn('"summary"', str(queryset.query))
+        for method in ("post", "put", "patch", "delete", "options"):
+            queryset = self.get_queryset(RefBookListView, method)
+            self.assertIn('"summary"', str(queryset.query))
+
+        # joins still apply
+        queryset = self.get_queryset(OptimizedBookListView, "patch")
+        self.assertEqual(set(queryset.query.select_related), {"author"})
+
+    def test_plans_are_cached(self) -> None:
+        with patch.object(
+            mixins, "get_query_plan", wraps=get_query_plan
+        ) as mock_get_query_plan:
+            for _ in range(3):
+                self.get(OptimizedBookListView)
+                self.get(RefBookListView)
+        self.assertEqual(mock_get_query_plan.call_count, 2)
+        self.assertEqual(len(mixins._QUERY_PLANS), 2)
+
+
+class SparseFieldsetMixinTestCase(ModelTableTestCase):
+    models = [Publisher, Author, Tag, Book, Review]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books()
+
+    def setUp(self) -> None:
+        mixins._SPARSE_FIELDSETS.clear()
+        mixins._QUERY_PLANS.clear()
+        mixins._FIELDS_QUERY_PLANS.clear()
+
+    def get(self, view: Any, status_code: int = 200, **params: str) -> Any:
+        response = view.as_view()(APIRequestFactory().get("/books/", params))
+        self.assertEqual(response.status_code, status_code, response.data)
+        return response.data
+
+    def test_fields(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            # serializer order, whitespace and empty names ignored
+            data = self.get(SparseBookListView, fields=" title,id,, ")
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"summary"', queries[0]["sql"])
+        self.assertNotIn('"author_id"', queries[0]["sql"])
+        self.assertEqual(list(data[0]), ["id", "title"])
+
+    def test_exclude(self) -> None:
+        # tags only
+        with self.assertNumQueries(2):
+            data = self.get(SparseBookListView, exclude="author,summary")
+        self.assertEqual(list(data[0]), ["id", "title", "publisher", "tags"])
+
+        data = self.get(SparseBookListView, fields="id,title,tags", exclude="tags")
+        self.assertEqual(list(data[0]), ["id", "title"])
+
+    def test_unknown_fields(self) -> None:
+        data = self.get(SparseBookListView, 400, fields="id,reviews,nope")
+        self.assertEqual(
+            [str(error) for error in data["fields"]], ["Unknown fields: reviews, nope."]
+        )
+        self.get(SparseBookListView, 400, exclude="nope")
+        self.assertEqual(mixins._SPARSE_FIELDSETS, {})
+
+        # reviews aren't masked for this view
+        data = self.get(UnmaskedSparseBookListView, fields="id,reviews")
+        self.assertEqual(list(data[0]), ["id", "reviews"])
+
+    def test_plans_are_cached(self) -> None:
+        # same names, in any order or with empty ones
+        for fields in ("id,title", "title,id", "id,title,", " id,,title"):
+            self.get(SparseBookListView, fields=fields)
+        self.assertEqual(len(mixins._SPARSE_FIELDSETS), 1)
+        # sparse fieldsets don't take the place of the view's own variants
+        self.assertEqual(len(mixins._QUERY_PLANS), 0)
+        (plan,) = mixins._FIELDS_QUERY_PLANS.values()
+        self.assertEqual(plan.only, ["id", "title"])
+
+    def test_new_fieldsets_cached_after_many_requests(self) -> None:
+        for i in range(1, 100):
+            self.get(SparseBookListView, fields="id" + "," * i)
+        self.assertEqual(len(mixins._SPARSE_FIELDSETS), 1)
+
+        for fields in ("id,title", "id,summary", "title,summary"):
+            self.get(SparseBookListView, fields=fields)
+        self.assertEqual(len(mixins._SPARSE_FIELDSETS), 4)
+        self.assertEqual(len(mixins._FIELDS_QUERY_PLANS), 4)
+
+    def test_no_params(self) -> None:
+        with self.assertNumQueries(2):
+            data = self.get(SparseBookListView)
+        self.assertEqual(data, self.get(OptimizedBookListView))
+        self.assertEqual(mixins._SPARSE_FIELDSETS, {})
+
+    def test_empty_params_ignored(self) -> None:
+        expected = self.get(OptimizedBookListView)
+        for param, value in (("fields", ""), ("fields", " , "), ("exclude", "")):
+            with self.assertNumQueries(2):
+                data = self.get(SparseBookListView, 200, **{param: value})
+            self.assertEqual(data, expected)
+        self.assertEqual(mixins._SPARSE_FIELDSETS, {})
@@ -0,0 +1,251 @@
+from typing import Any, Dict, Optional, cast
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.test import TestCase, override_settings
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ..api_response_handler import ApiResponseHandler
+from .. import pagination
+from ..pagination import (
+    CachedCountPagination,
+    KeysetPagination,
+    get_pagination_keys,
+    invalidate_cached_counts,
+)
+from .serializers.models import SampleModel
+from .utils import ModelTableTestCase
+
+
+class GetPaginationKeysTestCase(TestCase):
+
+    def test_page_number_pagination(self) -> None:
+        self.assertEqual(
+            get_pagination_keys(PageNumberPagination()), ("count", "next", "previous")
+        )
+
+    def test_limit_offset_pagination(self) -> None:
+        self.assertEqual(
+            get_pagination_keys(LimitOffsetPagination), ("count", "next", "previous")
+        )
+
+    def test_cursor_pagination_has_no_count(self) -> None:
+        self.assertEqual(get_pagination_keys(CursorPagination()), ("next", "previous"))
+
+    def test_paginator_without_schema(self) -> None:
+        self.assertIsNone(get_pagination_keys(BasePagination()))
+
+    def test_no_paginator(self) -> None:
+        self.assertIsNone(get_pagination_keys(None))
+
+    def test_custom_paginator_schema(self) -> None:
+        class CustomPagination(PageNumberPagination):
+            def get_paginated_response_schema(self, schema: dict) -> dict:  # type: ignore[type-arg]
+                return {
+                    "type": "object",
+                    "properties": {"total": {}, "results": schema},
+                }
+
+        self.assertEqual(get_pagination_keys(CustomPagination()), ("total",))
+
+    def test_paginator_class_requiring_arguments(self) -> None:
+        class ArgumentPagination(PageNumberPagination):
+            def __init__(self, page_size: int) -> None:
+                self.page_size = page_size
+
+        self.assertIsNone(get_pagination_keys(ArgumentPagination))
+        self.assertEqual(
+            get_pagination_keys(ArgumentPagination(page_size=10)),
+            ("count", "next", "previous"),
+        )
+        self.assertEqual(
+            get_pagination_keys(ArgumentPagination), ("count", "next", "previous")
+        )
+
+
+class SmallKeysetPagination(KeysetPagination):
+    page_size = 10
+
+
+class CountedKeysetPagination(SmallKeysetPagination):
+    include_count = True
+
+
+class KeysetPaginationTestCase(ModelTableTestCase):
+    models = [SampleModel]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        SampleModel.objects.bulk_create(
+            SampleModel(field1=f"{i}", field2="b", field3="c", field4="d")
+            for i in range(25)
+        )
+
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+
+    def _paginate(
+        self, paginator: KeysetPagination, url: str = "/items/"
+    ) -> dict[str, Any]:
+        request = Request(self.factory.get(url))
+        page = paginator.paginate_queryset(SampleModel.objects.all(), request)
+        data = [item.pk for item in page or []]
+        return cast(Dict[str, Any], paginator.get_paginated_response(data).data)
+
+    def test_walks_all_pages_without_count_query(self) -> None:
+        seen: list[int] = []
+        url: Optional[str] = "/items/"
+        while url:
+            with self.assertNumQueries(1):
+                data = self._paginate(SmallKeysetPagination(), url)
+            self.assertNotIn("count", data)
+            seen.extend(data["results"])
+            url = data["next"]
+        expected = list(
+            SampleModel.objects.order_by("-pk").values_list("pk", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_previous_link(self) -> None:
+        first = self._paginate(SmallKeysetPagination())
+        self.assertIsNone(first["previous"])
+        second = self._paginate(SmallKeysetPagination(), first["next"])
+        back = self._paginate(SmallKeysetPagination(), second["previous"])
+        self.assertEqual(back["results"], first["results"])
+
+    def test_include_count(self) -> None:
+        with self.assertNumQueries(2):
+            data = self._paginate(CountedKeysetPagination())
+        self.assertEqual(list(data.keys()), ["count", "next", "previous", "results"])
+        self.assertEqual(data["count"], 25)
+
+    def test_pagination_keys(self) -> None:
+        self.assertEqual(get_pagination_keys(KeysetPagination), ("next", "previous"))
+        self.assertEqual(
+            get_pagination_keys(CountedKeysetPagination), ("count", "next", "previous")
+        )
+
+    def test_standard_envelope(self) -> None:
+        paginator = SmallKeysetPagination()
+        data = self._paginate(paginator)
+        response = ApiResponseHandler().response_success(
+            results=data, paginator=paginator
+        )
+        self.assertEqual(
+            list(response.data.keys()),  # type: ignore[attr-defined]
+            [
+                "status",
+                "message",
+                "next",
+                "previous",
+                "results",
+                "error_fields",
+                "non_field_errors",
+            ],
+        )
+
+
+class CachedCountPaginationTestCase(ModelTableTestCase):
+    models = [SampleModel]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        SampleModel.objects.bulk_create(
+            SampleModel(
+                field1="a" if i % 2 else "b", field2="b", field3="c", field4="d"
+            )
+            for i in range(15)
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def _paginate(
+        self, queryset: QuerySet[SampleModel], url: str = "/items/"
+    ) -> Dict[str, Any]:
+        paginator = CachedCountPagination()
+        paginator.page_size = 10
+        page = paginator.paginate_queryset(queryset, Request(self.factory.get(url)))
+        data = [item.pk for item in page or []]  # type: ignore[attr-defined]
+        return cast(Dict[str, Any], paginator.get_paginated_response(data).data)
+
+    def test_count_is_cached(self) -> None:
+        queryset = SampleModel.objects.order_by("pk")
+        with self.assertNumQueries(2):
+            data = self._paginate(queryset)
+        self.assertEqual(data["count"], 15)
+        with self.assertNumQueries(1):
+            data = self._paginate(queryset, "/items/?page=2")
+        self.assertEqual(data["count"], 15)
+        self.assertEqual(len(data["results"]), 5)
+
+    def test_count_per_filter(self) -> None:
+        self.assertEqual(
+            self._paginate(SampleModel.objects.order_by("pk"))["count"], 15
+        )
+        filtered = SampleModel.objects.filter(field1="a").order_by("pk")
+        self.assertEqual(self._paginate(filtered)["count"], 7)
+
+    def test_invalidated_on_save_and_delete(self) -> None:
+        queryset = SampleModel.objects.order_by("pk")
+        self.assertEqual(self._paginate(queryset)["count"], 15)
+        instance = SampleModel.objects.create(
+            field1="a", field2="b", field3="c", field4="d"
+        )
+        self.assertEqual(self._paginate(queryset)["count"], 16)
+        instance.delete()
+        self.assertEqual(self._paginate(queryset)["count"], 15)
+
+    def test_manual_invalidation(self) -> None:
+        queryset = SampleModel.objects.order_by("pk")
+        self.assertEqual(self._paginate(queryset)["count"], 15)
+        SampleModel.objects.filter(field1="a").delete()
+        invalidate_cached_counts(SampleModel)
+        self.assertEqual(self._paginate(queryset)["count"], 8)
+
+    def _disconnect_invalidation(self) -> None:
+        """Forget connected signals, as in a process that never paginated SampleModel."""
+        dispatch_uid = (
+            f"{pagination._COUNT_CACHE_PREFIX}:{SampleModel._meta.label_lower}"
+        )
+        post_save.disconnect(sender=SampleModel, dispatch_uid=dispatch_uid)
+        post_delete.disconnect(sender=SampleModel, dispatch_uid=dispatch_uid)
+        pagination._INVALIDATION_CONNECTED.discard(SampleModel)
+
+    def test_write_before_first_count(self) -> None:
+        queryset = SampleModel.objects.order_by("pk")
+        self.assertEqual(self._paginate(queryset)["count"], 15)
+        self.addCleanup(self._disconnect_invalidation)
+
+        # without connecting at startup, the write isn't seen until the timeout
+        self._disconnect_invalidation()
+        SampleModel.objects.create(field1="a", field2="b", field3="c", field4="d")
+        self.assertEqual(self._paginate(queryset)["count"], 15)
+
+        self._disconnect_invalidation()
+        with override_settings(
+            DANS_API_TOOLKIT={"COUNT_CACHE_MODELS": [SampleModel._meta.label]}
+        ):
+            apps.get_app_config("django_dans_api_toolkit").ready()
+        SampleModel.objects.create(field1="a", field2="b", field3="c", field4="d")
+        self.assertEqual(self._paginate(queryset)["count"], 17)
+
+    @override_settings(DANS_API_TOOLKIT={"COUNT_CACHE_TIMEOUT": 0})
+    def test_timeout(self) -> None:
+        queryset = SampleModel.objects.order_by("pk")
+        self._paginate(queryset)
+        with self.assertNumQueries(2):
+            self._paginate(queryset)
+
+    def test_empty_queryset(self) -> None:
+        data = self._paginate(SampleModel.objects.none())
+        self.assertEqual(data["count"], 0)
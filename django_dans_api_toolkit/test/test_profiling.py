@@ -0,0 +1,114 @@
+from typing import Any, Dict
+import os
+import pstats
+import shutil
+import tempfile
+from django.http import HttpRequest
+from django.test import TestCase, override_settings
+from django.urls import path
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    renderer_classes,
+)
+from rest_framework.response import Response
+
+from ..api_response_handler import ApiResponseHandler
+from ..api_response_renderer import ApiResponseRenderer
+from ..profiling import RequestProfiler
+from .serializers.models import SampleModel, SampleSerializer
+
+MIDDLEWARE = ["django_dans_api_toolkit.profiling.ProfilingMiddleware"]
+
+
+@api_view(["GET"])
+@authentication_classes([])
+@renderer_classes([ApiResponseRenderer])
+def serialized_view(request: HttpRequest) -> Response:
+    instances = [
+        SampleModel(id=i, field1="a", field2="b", field3="c", field4="d")
+        for i in range(50)
+    ]
+    return ApiResponseHandler().response_success(
+        results=SampleSerializer(instances, many=True).data
+    )
+
+
+urlpatterns = [path("items/", serialized_view)]
+
+
+@override_settings(ROOT_URLCONF=__name__, MIDDLEWARE=MIDDLEWARE)
+class ProfilingMiddlewareTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.output_dir)
+
+    def profiling_settings(self, **profiling: Any) -> Dict[str, Any]:
+        return {"PROFILING": {"OUTPUT_DIR": self.output_dir, **profiling}}
+
+    def get_items(self, **headers: str) -> None:
+        response = self.client.get("/items/", headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+    def test_report_attributes_layers(self) -> None:
+        with self.settings(DANS_API_TOOLKIT=self.profiling_settings(SAMPLE_RATE=1)):
+            self.get_items()
+        files = os.listdir(self.output_dir)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].endswith(".txt"))
+        self.assertIn("-GET-items-", files[0])
+
+        with open(os.path.join(self.output_dir, files[0])) as file:
+            report = file.read()
+        self.assertTrue(report.startswith("GET /items/ 200 "))
+        layers = report.split("layers (cumulative ms):\n")[1].split("\n\n")[0]
+        self.assertEqual(
+            {line.split()[0] for line in layers.splitlines()},
+            {"handler", "renderer", "serializer"},
+        )
+        self.assertIn("Ordered by: cumulative time", report)
+
+    def test_pstats_format(self) -> None:
+        with self.settings(
+            DANS_API_TOOLKIT=self.profiling_settings(
+                SAMPLE_RATE=1, OUTPUT_FORMAT="pstats"
+            )
+        ):
+            self.get_items()
+        (file,) = os.listdir(self.output_dir)
+        self.assertTrue(file.endswith(".pstats"))
+        stats = pstats.Stats(os.path.join(self.output_dir, file))
+        self.assertTrue(stats.total_calls > 0)  # type: ignore[attr-defined]
+
+    def test_header_forces_profile(self) -> None:
+        with self.settings(
+            DANS_API_TOOLKIT=self.profiling_settings(
+                HEADER="X-Profile", HEADER_VALUE="secret"
+            )
+        ):
+            self.get_items()
+            self.get_items(x_profile="wrong")
+            self.assertEqual(os.listdir(self.output_dir), [])
+            self.get_items(x_profile="secret")
+        self.assertEqual(len(os.listdir(self.output_dir)), 1)
+
+    def test_disabled_by_default(self) -> None:
+        self.get_items()
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+
+class RequestProfilerTestCase(TestCase):
+
+    def test_sample_rate(self) -> None:
+        request = HttpRequest()
+        self.assertFalse(RequestProfiler("profiles").should_profile(request))
+        self.assertTrue(
+            RequestProfiler("profiles", sample_rate=1).should_profile(request)
+        )
+
+    def test_unknown_format(self) -> None:
+        with self.assertRaises(ValueError):
+            RequestProfiler("profiles", output_format="svg")
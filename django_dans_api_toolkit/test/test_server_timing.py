@@ -0,0 +1,118 @@
+from typing import Dict
+import re
+from django.http import HttpRequest
+from django.test import TestCase, override_settings
+from django.urls import path
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    renderer_classes,
+)
+from rest_framework.response import Response
+
+from ..api_response_handler import ApiResponseHandler
+from ..api_response_renderer import ApiResponseRenderer
+from ..metrics import remove_metrics_hook
+from ..server_timing import (
+    _SERVER_TIMINGS,
+    format_server_timing,
+    server_timing_hook,
+)
+from .serializers.models import SampleModel, SampleSerializer
+
+MIDDLEWARE = ["django_dans_api_toolkit.server_timing.ServerTimingMiddleware"]
+
+
+@api_view(["GET"])
+@authentication_classes([])
+@renderer_classes([ApiResponseRenderer])
+def serialized_view(request: HttpRequest) -> Response:
+    instances = [
+        SampleModel(id=i, field1="a", field2="b", field3="c", field4="d")
+        for i in range(3)
+    ]
+    return ApiResponseHandler().response_success(
+        results=SampleSerializer(instances, many=True).data
+    )
+
+
+@api_view(["GET"])
+@authentication_classes([])
+@renderer_classes([ApiResponseRenderer])
+def existing_header_view(request: HttpRequest) -> Response:
+    response = ApiResponseHandler().response_success(results=[])
+    response["Server-Timing"] = "db;dur=1.5"
+    return response
+
+
+async def async_view(request: HttpRequest) -> Response:
+    return await ApiResponseHandler().aresponse_success(results={"key": "value"})
+
+
+urlpatterns = [
+    path("serialized/", serialized_view),
+    path("existing/", existing_header_view),
+    path("async/", async_view),
+]
+
+
+def parse_server_timing(value: str) -> Dict[str, float]:
+    return {
+        stage: float(duration)
+        for stage, duration in re.findall(r"(\w+);dur=([\d.]+)", value)
+    }
+
+
+@override_settings(
+    ROOT_URLCONF=__name__,
+    MIDDLEWARE=MIDDLEWARE,
+    DANS_API_TOOLKIT={"SERVER_TIMING": True},
+)
+class ServerTimingMiddlewareTestCase(TestCase):
+
+    def tearDown(self) -> None:
+        remove_metrics_hook(server_timing_hook)
+
+    def test_header_has_all_stages(self) -> None:
+        response = self.client.get("/serialized/")
+        self.assertEqual(response.status_code, 200)
+        timings = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(list(timings), ["serialize", "envelope", "render"])
+        for duration in timings.values():
+            self.assertGreaterEqual(duration, 0)
+
+    def test_existing_header_is_kept(self) -> None:
+        response = self.client.get("/existing/")
+        value = response["Server-Timing"]
+        self.assertTrue(value.startswith("db;dur=1.5, envelope;dur="))
+        self.assertIn("render", parse_server_timing(value))
+
+    async def test_async_view(self) -> None:
+        response = await self.async_client.get("/async/")
+        self.assertEqual(response.status_code, 200)
+        timings = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(list(timings), ["envelope", "render"])
+
+    @override_settings(DANS_API_TOOLKIT={"SERVER_TIMING": False})
+    def test_disabled_by_setting(self) -> None:
+        response = self.client.get("/serialized/")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Server-Timing", response)
+
+
+class ServerTimingHookTestCase(TestCase):
+
+    def test_ignored_outside_requests(self) -> None:
+        server_timing_hook("render", {"status": 200, "duration": 0.5, "bytes": 2})
+        self.assertIsNone(_SERVER_TIMINGS.get())
+
+    def test_stages_are_summed(self) -> None:
+        token = _SERVER_TIMINGS.set({})
+        try:
+            server_timing_hook("serialize", {"serializer": "A", "duration": 0.001})
+            server_timing_hook("serialize", {"serializer": "A", "duration": 0.002})
+            server_timing_hook("error", {"status": 400, "error_type": None})
+            timings = _SERVER_TIMINGS.get()
+        finally:
+            _SERVER_TIMINGS.reset(token)
+        self.assertEqual(format_server_timing(timings or {}), "serialize;dur=3.000")
@@ -0,0 +1,99 @@
+import json
+import pickle
+from django.test import TestCase, override_settings
+from rest_framework.response import Response
+
+from ..api_response_handler import ApiResponseHandler
+from ..api_response_renderer import ApiResponseRenderer
+from ..static_responses import StaticApiResponseData, get_static_error_data
+
+
+class StaticResponsesTestCase(TestCase):
+
+    def test_matches_regular_envelope(self) -> None:
+        data = get_static_error_data(404, "Not here.")
+        envelope = {
+            "status": 404,
+            "message": "Not here.",
+            "results": None,
+            "error_fields": {},
+            "non_field_errors": [],
+        }
+        self.assertEqual(data, envelope)
+        self.assertEqual(json.loads(data.rendered), envelope)
+
+    def test_cached_per_status_and_message(self) -> None:
+        data = get_static_error_data(404, "Not here.")
+        self.assertIs(get_static_error_data(404, "Not here."), data)
+        self.assertIsNot(get_static_error_data(403, "Not here."), data)
+        self.assertIsNot(get_static_error_data(404, "Gone."), data)
+
+    def test_immutable(self) -> None:
+        data = get_static_error_data(404, "Not here.")
+        with self.assertRaises(TypeError):
+            data["message"] = "Changed."
+        with self.assertRaises(TypeError):
+            data.update(message="Changed.")  # type: ignore[has-type]
+        with self.assertRaises(TypeError):
+            del data["message"]
+        with self.assertRaises(TypeError):
+            data.pop("message")  # type: ignore[has-type]
+        self.assertEqual(data["message"], "Not here.")
+
+    def test_pickle(self) -> None:
+        data = get_static_error_data(404, "Not here.")
+        loaded = pickle.loads(pickle.dumps(data))
+        self.assertIsInstance(loaded, StaticApiResponseData)
+        self.assertEqual(loaded, data)
+        self.assertEqual(loaded.rendered, data.rendered)
+
+    def test_renderer_serves_rendered_bytes(self) -> None:
+        data = get_static_error_data(404, "Not here.")
+        renderer = ApiResponseRenderer()
+        context = {"response": Response(status=404)}
+        self.assertIs(renderer.render(data, renderer_context=context), data.rendered)
+        # indented output is still rendered normally
+        indented = renderer.render(data, "application/json; indent=2", context)
+        self.assertIn(b'\n  "message": "Not here."', indented)
+
+    def test_renderer_settings(self) -> None:
+        data = get_static_error_data(404, "Pas trouvé.")
+        context = {"response": Response(status=404)}
+        self.assertIn("Pas trouvé.".encode(), data.rendered)
+
+        class AsciiRenderer(ApiResponseRenderer):
+            ensure_ascii = True
+
+        rendered = AsciiRenderer().render(data, renderer_context=context)
+        self.assertIn(b"Pas trouv\\u00e9.", rendered)
+        self.assertEqual(json.loads(rendered), data)
+
+        class SpacedRenderer(ApiResponseRenderer):
+            compact = False
+
+        rendered = SpacedRenderer().render(data, renderer_context=context)
+        self.assertIn(b'"status": 404', rendered)
+
+    def test_cached_per_json_backend(self) -> None:
+        data = get_static_error_data(404, "Not here.")
+        with override_settings(DANS_API_TOOLKIT={"JSON_ENCODER": "orjson"}):
+            orjson_data = get_static_error_data(404, "Not here.")
+            self.assertIsNot(orjson_data, data)
+            self.assertEqual(orjson_data, data)
+            self.assertIs(
+                ApiResponseRenderer().render(orjson_data), orjson_data.rendered
+            )
+            # rendered with another backend
+            self.assertIsNot(ApiResponseRenderer().render(data), data.rendered)
+
+    def test_handler_uses_static_envelope(self) -> None:
+        handler = ApiResponseHandler(message_error="Nope.")
+        first = handler.response_error(status=404)
+        second = handler.response_error(status=404)
+        self.assertIsInstance(first.data, StaticApiResponseData)
+        self.assertIs(first.data, second.data)
+        self.assertEqual(first.data["message"], "Nope.")  # type: ignore[index]
+
+        # anything beyond a status builds the envelope as usual
+        response = handler.response_error(message="Custom.", status=404)
+        self.assertNotIsInstance(response.data, StaticApiResponseData)
@@ -0,0 +1,30 @@
+from typing import List, Type
+from django.db import connection
+from django.db.models import Model
+from django.test import TestCase
+
+
+class ModelTableTestCase(TestCase):
+    """
+    TestCase that creates the tables for `models`.
+
+    The toolkit app has no models.py, so `migrate` doesn't create tables
+    for the models used in tests - do it around the test class instead.
+    """
+
+    models: List[Type[Model]] = []
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # NOTE: must happen before TestCase opens its atomic block
+        with connection.schema_editor() as schema_editor:
+            for model in cls.models:
+                schema_editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        with connection.schema_editor() as schema_editor:
+            for model in reversed(cls.models):
+                schema_editor.delete_model(model)